@@ -0,0 +1,201 @@
+# bench_image_editor.py
+"""
+Microbenchmarks do pipeline PIL (ImageEditor), sem chamar APIs externas.
+Uso: python bench_image_editor.py
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from PIL import Image, ImageFont
+
+from config import settings
+from src.processors.image_editor import ImageEditor
+from src.processors.text_layout import TextLayoutEngine
+
+
+def _timeit(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Melhor tempo (ms) entre `repeat` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _editor() -> ImageEditor:
+    # Sem __init__: evita criar PexelsClient (e exigir API key) só para medir helpers
+    return ImageEditor.__new__(ImageEditor)
+
+
+# -----------------------
+# _gradient_rgba
+# -----------------------
+def _gradient_rgba_loop(editor: ImageEditor, w: int, h: int, hex_a: str, hex_b: str, alpha: int) -> Image.Image:
+    """Implementação original (loop por pixel), mantida como referência."""
+    a = editor._hex_to_rgb(hex_a)
+    b = editor._hex_to_rgb(hex_b)
+
+    base = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    px = base.load()
+    for y in range(h):
+        t = y / max(1, h - 1)
+        r = int(a[0] * (1 - t) + b[0] * t)
+        g = int(a[1] * (1 - t) + b[1] * t)
+        bl = int(a[2] * (1 - t) + b[2] * t)
+        for x in range(w):
+            px[x, y] = (r, g, bl, alpha)
+    return base
+
+
+def bench_gradient() -> None:
+    editor = _editor()
+    w, h = settings.POST_SIZE
+    args = (w, h, settings.GRADIENT_A, settings.GRADIENT_B, 70)
+
+    reference = _gradient_rgba_loop(editor, *args)
+    current = editor._gradient_rgba(*args)
+    assert reference.tobytes() == current.tobytes(), "❌ Gradiente difere da implementação original"
+
+    loop_ms = _timeit(lambda: _gradient_rgba_loop(editor, *args), repeat=2)
+    fast_ms = _timeit(lambda: editor._gradient_rgba(*args))
+    print(f"_gradient_rgba {w}x{h}: loop {loop_ms:.1f} ms → atual {fast_ms:.2f} ms ({loop_ms / fast_ms:.0f}x, byte-idêntico)")
+
+
+# -----------------------
+# Overlay do background
+# -----------------------
+def bench_overlay() -> None:
+    editor = _editor()
+    w, h = settings.POST_SIZE
+    photo = Image.new("RGBA", (w, h))
+    photo.putdata([((x * 7) % 256, (x * 3) % 256, (x * 11) % 256, 255) for x in range(w * h)])
+
+    def three_layers() -> Image.Image:
+        base = Image.alpha_composite(photo, Image.new("RGBA", (w, h), (0, 0, 0, 85)))
+        base = Image.alpha_composite(base, editor._gradient_rgba(w, h, settings.GRADIENT_A, settings.GRADIENT_B, alpha=70))
+        return Image.alpha_composite(base, editor._highlight_blob(w, h))
+
+    def fused() -> Image.Image:
+        return Image.alpha_composite(photo, editor._photo_overlay(w, h))
+
+    reference = three_layers()
+    current = fused()
+    diff = max(abs(p - q) for p, q in zip(reference.tobytes(), current.tobytes()))
+    assert diff <= 2, f"❌ Overlay fundido difere demais do original (Δmax={diff})"
+
+    old_ms = _timeit(three_layers, repeat=3)
+    new_ms = _timeit(fused)
+    print(f"overlay {w}x{h}: 3 camadas {old_ms:.1f} ms → fundido {new_ms:.1f} ms ({old_ms / new_ms:.0f}x, Δmax={diff})")
+
+
+# -----------------------
+# _fit_font
+# -----------------------
+def _fit_font_linear(font_path, text: str, max_width: int, start_size: int, min_size: int, max_lines: int) -> int:
+    """Implementação original (desce de 2 em 2, relendo o TTF a cada passo)."""
+
+    def width(t: str, f: ImageFont.FreeTypeFont) -> int:
+        bbox = f.getbbox(t)
+        return bbox[2] - bbox[0]
+
+    def wrap(t: str, f: ImageFont.FreeTypeFont) -> list[str]:
+        lines, current = [], ""
+        for w in t.split():
+            test = (current + " " + w).strip()
+            if width(test, f) <= max_width:
+                current = test
+            else:
+                if current:
+                    lines.append(current)
+                current = w
+        if current:
+            lines.append(current)
+        return lines
+
+    size = start_size
+    while size >= min_size:
+        font = ImageFont.truetype(str(font_path), size=size)
+        lines = wrap(text, font)
+        if len(lines) <= max_lines and all(width(line, font) <= max_width for line in lines):
+            return size
+        size -= 2
+    return min_size
+
+
+def bench_fit_font() -> None:
+    font_path = settings.BRAND_FONTS_DIR / "Inter-VariableFont_opsz,wght.ttf"
+    if not font_path.exists():
+        print(f"fit_font: fonte não encontrada em {font_path} (pulando)")
+        return
+
+    texts = [
+        "EAD Sem Segredos!",
+        "Sua meta de matrículas está em risco fora do horário comercial?",
+        "Como agentes de IA respondem leads em 2 minutos e aumentam a conversão em 340% nas faculdades",
+        "Follow-up automático recupera leads frios que a equipe comercial não consegue atender a tempo",
+    ]
+    cases = [(t, 792, 68, 44, 3) for t in texts] + [(t, 792, 110, 64, 3) for t in texts]
+
+    for text, max_w, start, min_s, lines in cases:
+        expected = _fit_font_linear(font_path, text, max_w, start, min_s, lines)
+        got = TextLayoutEngine().fit_font(font_path, text, max_w, start, min_s, max_lines=lines).size
+        assert expected == got, f"❌ fit_font divergiu para '{text[:30]}...': {expected} vs {got}"
+
+    old_ms = _timeit(lambda: [_fit_font_linear(font_path, *c) for c in cases], repeat=3)
+    cold_ms = _timeit(lambda: [TextLayoutEngine().fit_font(font_path, *c[:4], max_lines=c[4]) for c in cases], repeat=3)
+    engine = TextLayoutEngine()
+    warm_ms = _timeit(lambda: [engine.fit_font(font_path, *c[:4], max_lines=c[4]) for c in cases])
+    print(
+        f"_fit_font ({len(cases)} textos): linear {old_ms:.1f} ms → binária {cold_ms:.1f} ms "
+        f"(cache quente {warm_ms:.2f} ms), mesmos tamanhos"
+    )
+
+
+# -----------------------
+# Decode do background
+# -----------------------
+def bench_background_decode() -> None:
+    editor = _editor()
+    w, h = settings.POST_SIZE
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Foto sintética no tamanho típico do "original" do Pexels
+        src = Path(tmp) / "original.jpg"
+        Image.effect_mandelbrot((4000, 6000), (-2.0, -1.5, 1.0, 1.5), 100).convert("RGB").save(src, quality=90)
+
+        def full_decode() -> Image.Image:
+            return editor._cover_resize(Image.open(src).convert("RGB"), w, h)
+
+        def draft_decode() -> Image.Image:
+            return editor._load_background(src, w, h)
+
+        reference = full_decode()
+        current = draft_decode()
+        assert reference.size == current.size == (w, h), "❌ Tamanho final diferente"
+        diff = sum(abs(p - q) for p, q in zip(reference.tobytes(), current.tobytes())) / (w * h * 3)
+
+        old_ms = _timeit(full_decode, repeat=3)
+        new_ms = _timeit(draft_decode, repeat=3)
+        print(f"background 4000x6000 → {w}x{h}: decode completo {old_ms:.0f} ms → draft {new_ms:.0f} ms ({old_ms / new_ms:.1f}x, Δmédio={diff:.2f})")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️ BENCHMARK - IMAGE EDITOR")
+    print("=" * 60)
+
+    try:
+        bench_gradient()
+        bench_overlay()
+        bench_fit_font()
+        bench_background_decode()
+    except AssertionError as e:
+        print(f"\n{e}")
+        sys.exit(1)
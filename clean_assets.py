@@ -3,8 +3,13 @@
 """
 Limpa artes antigas para começar do zero.
 Remove arquivos de assets/processed/ e assets/raw/backgrounds/
+
+Modo GC (python clean_assets.py --gc): em vez de apagar tudo, aplica o orçamento
+em bytes (BACKGROUNDS_MAX_BYTES / PROCESSED_MAX_BYTES), removendo backgrounds
+quase duplicados, os usados há mais tempo e artes já publicadas.
 """
 
+import argparse
 import shutil
 from pathlib import Path
 
@@ -42,14 +47,39 @@ def clean_temp():
         for f in temp.glob("*"):
             # Preserva sessão do Instagram
             if "instagram" not in f.name.lower():
-                f.unlink()
+                # Subpastas (ex.: render_cache/) saem inteiras
+                if f.is_dir():
+                    shutil.rmtree(f)
+                else:
+                    f.unlink()
                 print(f"   Removido: {f.name}")
     else:
         temp.mkdir(parents=True, exist_ok=True)
     print("✅ Pasta assets/temp/ limpa (sessão Instagram preservada)")
 
 
+def gc_assets():
+    """Aplica o orçamento de disco (mesma limpeza que o scheduler roda periodicamente)."""
+    from config import settings
+    from src.processors.asset_gc import AssetGC
+
+    settings.ensure_directories()
+    report = AssetGC().run(full=True)
+    print(f"✅ Backgrounds: {report.backgrounds_deleted} removidos ({report.backgrounds_freed / 1e6:.1f} MB)")
+    print(f"✅ Artes publicadas: {report.processed_deleted} removidas ({report.processed_freed / 1e6:.1f} MB)")
+    print(f"📦 Em disco: backgrounds {report.backgrounds_bytes / 1e6:.1f} MB | processed {report.processed_bytes / 1e6:.1f} MB")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Limpeza de assets do EduFlow.")
+    parser.add_argument("--gc", action="store_true", help="Só aplica o orçamento em bytes (não apaga tudo)")
+    args = parser.parse_args()
+
+    if args.gc:
+        print("🧹 GC DE ASSETS - EDUFLOW AUTOMATOR")
+        gc_assets()
+        return
+
     print("=" * 50)
     print("🧹 LIMPEZA DE ASSETS - EDUFLOW AUTOMATOR")
     print("=" * 50)
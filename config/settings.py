@@ -21,6 +21,9 @@ BACKGROUNDS_DIR: Path = RAW_DIR / "backgrounds"
 FONTS_DIR: Path = RAW_DIR / "fonts"
 LOGOS_DIR: Path = RAW_DIR / "logos"
 
+# Fontes empacotadas usadas pelos templates HTML (servidas localmente ao Chromium)
+BRAND_FONTS_DIR: Path = ASSETS_DIR / "fonts"
+
 # DB
 DB_DIR: Path = PROJECT_ROOT / "database"
 DB_PATH: Path = DB_DIR / "content_history.db"
@@ -130,6 +133,15 @@ FONT_EXTRABOLD: Path = _FONT["extrabold"]
 # -----------------------------
 GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+# Saída JSON nativa (response_schema) nos métodos estruturados; 0 = só instruções no prompt
+GEMINI_STRUCTURED_OUTPUT: bool = os.getenv("GEMINI_STRUCTURED_OUTPUT", "1") not in ("0", "false", "False")
+# Cache de respostas do Gemini (opt-in): mesmo modelo + parâmetros + prompt = mesma resposta
+GEMINI_CACHE_ENABLED: bool = os.getenv("GEMINI_CACHE_ENABLED", "0") not in ("0", "false", "False")
+# Chamadas criativas (ideias, legendas, copy visual) ignoram o cache; 0 = cacheia tudo (dev/testes)
+GEMINI_CACHE_BYPASS_CREATIVE: bool = os.getenv("GEMINI_CACHE_BYPASS_CREATIVE", "1") not in ("0", "false", "False")
+GEMINI_CACHE_DB: Path = TEMP_DIR / "gemini_cache.db"
+GEMINI_CACHE_TTL_HOURS: float = float(os.getenv("GEMINI_CACHE_TTL_HOURS", "168"))
+GEMINI_CACHE_MAX_BYTES: int = int(os.getenv("GEMINI_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
 
 OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
 
@@ -138,10 +150,88 @@ INSTAGRAM_PASSWORD: str = os.getenv("INSTAGRAM_PASSWORD", "")
 
 # Pexels
 PEXELS_API_KEY: str = os.getenv("PEXELS_API_KEY", "")
+# Opcional: reencoda downloads para no máximo N px no lado maior (0 = desligado)
+PEXELS_MAX_DIMENSION: int = int(os.getenv("PEXELS_MAX_DIMENSION", "0"))
+# Pool HTTP compartilhado (keep-alive) para API + CDN do Pexels
+PEXELS_POOL_SIZE: int = int(os.getenv("PEXELS_POOL_SIZE", "10"))
+PEXELS_HTTP_RETRIES: int = int(os.getenv("PEXELS_HTTP_RETRIES", "2"))
+# Downloads simultâneos (download_many_async: pipeline e pool quente)
+PEXELS_DOWNLOAD_CONCURRENCY: int = int(os.getenv("PEXELS_DOWNLOAD_CONCURRENCY", "4"))
+# Limite da API (token bucket): ritmo base + rajada; a cota real vem dos headers X-Ratelimit-*
+PEXELS_RATE_PER_HOUR: float = float(os.getenv("PEXELS_RATE_PER_HOUR", "200"))
+PEXELS_RATE_BURST: int = int(os.getenv("PEXELS_RATE_BURST", "10"))
+# Espera máxima por uma vaga antes de desistir da requisição
+PEXELS_RATE_MAX_WAIT_SECONDS: float = float(os.getenv("PEXELS_RATE_MAX_WAIT_SECONDS", "120"))
+# Opcional: arquivo de estado para dividir a cota entre processos (vazio = só no processo)
+PEXELS_RATE_STATE_FILE: str = os.getenv("PEXELS_RATE_STATE_FILE", "")
+# Cache de buscas: fresco por TTL, depois servido "stale" enquanto revalida em background
+PEXELS_CACHE_DB: Path = TEMP_DIR / "pexels_cache.db"
+PEXELS_SEARCH_TTL_HOURS: float = float(os.getenv("PEXELS_SEARCH_TTL_HOURS", "24"))
+PEXELS_SEARCH_STALE_HOURS: float = float(os.getenv("PEXELS_SEARCH_STALE_HOURS", "168"))
+# Pool "quente": K fotos já baixadas por query, prontas para uso imediato
+PEXELS_WARM_DIR: Path = BACKGROUNDS_DIR / "warm"
+PEXELS_WARM_PER_QUERY: int = int(os.getenv("PEXELS_WARM_PER_QUERY", "3"))
+# PEXELS_WARM_TARGET (tamanho mínimo das fotos do pool) fica junto do render, abaixo
 
 IG_SESSION_PATH: Path = TEMP_DIR / "instagram_session.json"
 
 
+# -----------------------------
+# Render HTML (Playwright)
+# -----------------------------
+# Páginas "quentes" mantidas abertas no Chromium compartilhado
+RENDER_POOL_SIZE: int = int(os.getenv("RENDER_POOL_SIZE", "2"))
+# Recicla a página após N renders (evita vazamento de memória)
+RENDER_MAX_PAGE_USES: int = int(os.getenv("RENDER_MAX_PAGE_USES", "50"))
+# Recicla o browser inteiro após N renders
+RENDER_MAX_BROWSER_RENDERS: int = int(os.getenv("RENDER_MAX_BROWSER_RENDERS", "500"))
+RENDER_DEVICE_SCALE_FACTOR: int = int(os.getenv("RENDER_DEVICE_SCALE_FACTOR", "2"))
+# Pool quente cobre o render HTML (1080x1080 @ scale factor) e o post PIL (POST_SIZE)
+PEXELS_WARM_TARGET: tuple[int, int] = (
+    max(1080 * RENDER_DEVICE_SCALE_FACTOR, POST_WIDTH),
+    max(1080 * RENDER_DEVICE_SCALE_FACTOR, POST_HEIGHT),
+)
+# Orçamento do cache em memória de data URIs (logo, backgrounds inline)
+DATA_URI_CACHE_MAX_BYTES: int = int(os.getenv("DATA_URI_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Cache de imagens renderizadas (mesmo template + HTML + viewport = mesma imagem)
+RENDER_CACHE_ENABLED: bool = os.getenv("RENDER_CACHE_ENABLED", "1") not in ("0", "false", "False")
+RENDER_CACHE_DIR: Path = TEMP_DIR / "render_cache"
+RENDER_CACHE_MAX_BYTES: int = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+# -----------------------------
+# Backlog de ideias de tópicos (reabastecido em lote, consumido em ordem)
+# -----------------------------
+IDEA_BACKLOG_REFILL_SIZE: int = int(os.getenv("IDEA_BACKLOG_REFILL_SIZE", "30"))
+# Abaixo disso o job do scheduler reabastece o nicho
+IDEA_BACKLOG_MIN_PENDING: int = int(os.getenv("IDEA_BACKLOG_MIN_PENDING", "5"))
+# Um lote de 30 ideias não cabe no limite de saída de um post (1500 tokens)
+IDEA_BACKLOG_MAX_OUTPUT_TOKENS: int = int(os.getenv("IDEA_BACKLOG_MAX_OUTPUT_TOKENS", "8192"))
+
+
+# -----------------------------
+# Quase-duplicatas (MinHash de tópico/legenda vs. content_history), checadas antes do render
+# -----------------------------
+NEAR_DUP_ENABLED: bool = os.getenv("NEAR_DUP_ENABLED", "1") not in ("0", "false", "False")
+# Similaridade (Jaccard estimado, 0-1) a partir da qual o tópico/legenda conta como repetido
+NEAR_DUP_TOPIC_THRESHOLD: float = float(os.getenv("NEAR_DUP_TOPIC_THRESHOLD", "0.5"))
+NEAR_DUP_CAPTION_THRESHOLD: float = float(os.getenv("NEAR_DUP_CAPTION_THRESHOLD", "0.6"))
+# Ideias do backlog descartadas por similaridade antes de desistir do post
+NEAR_DUP_MAX_IDEA_SKIPS: int = int(os.getenv("NEAR_DUP_MAX_IDEA_SKIPS", "3"))
+
+
+# -----------------------------
+# Limpeza automática de assets (GC por orçamento em bytes)
+# -----------------------------
+BACKGROUNDS_MAX_BYTES: int = int(os.getenv("BACKGROUNDS_MAX_BYTES", str(1024 * 1024 * 1024)))
+PROCESSED_MAX_BYTES: int = int(os.getenv("PROCESSED_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+# Máximo de arquivos apagados por execução (mantém cada passada curta)
+ASSET_GC_MAX_DELETIONS: int = int(os.getenv("ASSET_GC_MAX_DELETIONS", "200"))
+ASSET_GC_DB: Path = TEMP_DIR / "asset_gc.db"
+# Distância máxima (bits, de 64) entre hashes perceptuais para duas fotos contarem como iguais
+BACKGROUND_DUP_DISTANCE: int = int(os.getenv("BACKGROUND_DUP_DISTANCE", "6"))
+
+
 # -----------------------------
 # Helpers
 # -----------------------------
@@ -0,0 +1,230 @@
+# database/similarity.py
+"""
+Índice de similaridade (MinHash + LSH) do content_history.
+compute_content_hash só pega texto idêntico, e só depois de todas as chamadas ao
+Gemini e do render. Aqui cada tópico/legenda vira uma assinatura MinHash de
+shingles de caracteres (texto normalizado), com buckets LSH indexados no SQLite:
+achar um post parecido é uma consulta por bucket + comparação das poucas
+assinaturas candidatas, barata o bastante para rodar logo após a ideação.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import time
+import unicodedata
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+from src.exceptions import ContentDuplicateError
+
+logger = logging.getLogger("eduflow.similarity")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_minhash (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_id INTEGER NOT NULL,          -- content_history.id
+    field TEXT NOT NULL,                  -- topic | caption
+    signature BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE(content_id, field)
+);
+
+CREATE TABLE IF NOT EXISTS content_minhash_bands (
+    field TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    minhash_id INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_content_minhash_bands_lookup
+ON content_minhash_bands(field, band, bucket);
+"""
+
+NUM_PERM = 64
+BANDS = 32          # 32 bandas x 2 linhas: Jaccard 0.5 vira candidato com ~100% de chance
+ROWS = NUM_PERM // BANDS
+SHINGLE = 4
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Permutações fixas (a*x + b mod p): as assinaturas gravadas continuam comparáveis entre execuções
+_PERMS = [
+    (1 + (i * 0x9E3779B1 + 0x7F4A7C15) % (_MERSENNE - 1), (i * 0x85EBCA77 + 0xC2B2AE3D) % _MERSENNE)
+    for i in range(NUM_PERM)
+]
+
+_HASHTAG_RE = re.compile(r"#\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Sem acentos, minúsculo, só letras/números separados por um espaço."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def shingles(text: str, size: int = SHINGLE) -> set[str]:
+    text = f" {normalize_text(text)} "
+    if len(text.strip()) == 0:
+        return set()
+    if len(text) <= size:
+        return {text}
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(text: str) -> list[int]:
+    """Assinatura MinHash (NUM_PERM valores de 32 bits); lista vazia para texto vazio."""
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text)]
+    if not hashes:
+        return []
+    return [min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes) for a, b in _PERMS]
+
+
+def jaccard_estimate(a: list[int], b: list[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _band_buckets(signature: list[int]) -> list[int]:
+    # Inteiro de 63 bits: cabe no INTEGER do SQLite
+    return [
+        zlib.crc32(array("I", signature[band * ROWS : (band + 1) * ROWS]).tobytes()) | (band << 32)
+        for band in range(BANDS)
+    ]
+
+
+def caption_body(caption: str) -> str:
+    """Legenda sem hashtags (repetem entre posts do mesmo nicho e inflariam a similaridade)."""
+    return _HASHTAG_RE.sub(" ", caption or "")
+
+
+@dataclass(frozen=True)
+class SimilarMatch:
+    content_id: int
+    topic: str
+    field: str
+    similarity: float
+
+
+class SimilarityIndex:
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        topic_threshold: Optional[float] = None,
+        caption_threshold: Optional[float] = None,
+    ) -> None:
+        self.db_path = Path(db_path or settings.DB_PATH)
+        self.thresholds = {
+            "topic": settings.NEAR_DUP_TOPIC_THRESHOLD if topic_threshold is None else topic_threshold,
+            "caption": settings.NEAR_DUP_CAPTION_THRESHOLD if caption_threshold is None else caption_threshold,
+        }
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    # -----------------------
+    # Indexação
+    # -----------------------
+    def sync(self) -> int:
+        """Indexa as linhas do content_history ainda sem assinatura. Retorna quantas entraram."""
+        with self._connect() as conn:
+            cursor = int(conn.execute("SELECT COALESCE(MAX(content_id), 0) FROM content_minhash").fetchone()[0])
+            try:
+                rows = conn.execute(
+                    "SELECT id, topic, caption FROM content_history WHERE id > ? ORDER BY id", (cursor,)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return 0  # banco ainda não inicializado
+
+            for content_id, topic, caption in rows:
+                self._add(conn, content_id, "topic", topic or "")
+                self._add(conn, content_id, "caption", caption_body(caption or ""))
+            conn.commit()
+
+        if rows:
+            logger.info("🧬 Índice de similaridade: +%d posts", len(rows))
+        return len(rows)
+
+    def _add(self, conn: sqlite3.Connection, content_id: int, field: str, text: str) -> None:
+        signature = minhash(text)
+        if not signature:
+            return
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO content_minhash (content_id, field, signature, created_at) VALUES (?, ?, ?, ?)",
+            (content_id, field, array("I", signature).tobytes(), time.time()),
+        )
+        if not cur.rowcount:
+            return
+        conn.executemany(
+            "INSERT INTO content_minhash_bands (field, band, bucket, minhash_id) VALUES (?, ?, ?, ?)",
+            [(field, band, bucket, cur.lastrowid) for band, bucket in enumerate(_band_buckets(signature))],
+        )
+
+    # -----------------------
+    # Consulta
+    # -----------------------
+    def find_similar(self, text: str, field: str = "topic", threshold: Optional[float] = None) -> Optional[SimilarMatch]:
+        """Post mais parecido com `text` (no campo `field`) acima do limiar, ou None."""
+        threshold = self.thresholds[field] if threshold is None else threshold
+        if field == "caption":
+            text = caption_body(text)
+        signature = minhash(text)
+        if not signature:
+            return None
+
+        self.sync()
+        buckets = _band_buckets(signature)
+        with self._connect() as conn:
+            # Candidatos: quem cai no mesmo bucket em pelo menos uma banda
+            placeholders = " OR ".join(["(band = ? AND bucket = ?)"] * BANDS)
+            params: list[object] = [field]
+            for band, bucket in enumerate(buckets):
+                params.extend((band, bucket))
+            rows = conn.execute(
+                f"""
+                SELECT m.content_id, m.signature, h.topic
+                FROM content_minhash m
+                LEFT JOIN content_history h ON h.id = m.content_id
+                WHERE m.id IN (
+                    SELECT DISTINCT minhash_id FROM content_minhash_bands
+                    WHERE field = ? AND ({placeholders})
+                )
+                """,
+                params,
+            ).fetchall()
+
+        best: Optional[SimilarMatch] = None
+        for content_id, blob, topic in rows:
+            score = jaccard_estimate(signature, list(array("I", blob)))
+            if score >= threshold and (best is None or score > best.similarity):
+                best = SimilarMatch(int(content_id), topic or "", field, round(score, 3))
+        return best
+
+    def ensure_unique(self, topic: Optional[str] = None, caption: Optional[str] = None) -> None:
+        """
+        Raises ContentDuplicateError se o tópico ou a legenda forem quase iguais
+        a algum post já registrado.
+        """
+        for field, text in (("topic", topic), ("caption", caption)):
+            if not text:
+                continue
+            match = self.find_similar(text, field)
+            if match:
+                raise ContentDuplicateError(
+                    f"{field} quase duplicado do post id={match.content_id} "
+                    f"('{match.topic[:60]}', similaridade {match.similarity:.2f})"
+                )
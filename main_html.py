@@ -8,16 +8,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import base64
 import random
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from config import settings
 from config.logging_config import setup_logging
 from database.repository import ContentRecord, ContentRepository, compute_content_hash
+from database.similarity import SimilarityIndex
 from src.exceptions import ContentDuplicateError
 from src.generators.gemini_client import GeminiClient
+from src.generators.idea_backlog import IdeaBacklog, shared_idea_backlog
 from src.generators.pexels_client import PexelsClient
 from src.processors.html_renderer import HtmlRenderer
 
@@ -87,21 +89,6 @@ PEXELS_QUERIES = {
 # HELPERS
 # ============================================================
 
-def image_to_base64(path: Path) -> str | None:
-    """Converte imagem local para Base64."""
-    if not path or not path.exists():
-        return None
-    try:
-        with open(path, "rb") as img:
-            encoded = base64.b64encode(img.read()).decode('utf-8')
-        ext = path.suffix.lower()
-        mime = "image/png" if ext == ".png" else "image/jpeg"
-        return f"data:{mime};base64,{encoded}"
-    except Exception as e:
-        logger.error(f"Erro ao converter imagem: {e}")
-        return None
-
-
 def get_font_size_class(text: str) -> str:
     """Define classe CSS baseada no tamanho do texto."""
     # Remove tags HTML para contar caracteres
@@ -178,19 +165,112 @@ def clean_subheadline(text: str) -> str:
     return text
 
 
+def split_post_bundle(bundle: dict) -> tuple[dict, dict, dict]:
+    """Separa a resposta de generate_post_bundle nos três dicts usados pelo pipeline."""
+    idea = {k: bundle[k] for k in ("topic", "hook", "angle", "category") if k in bundle}
+    visual = {k: bundle[k] for k in ("headline", "subheadline", "pexels_query", "mood") if k in bundle}
+    caption_obj = {"topic": bundle["topic"], "caption": bundle["caption"], "hashtags": bundle["hashtags"]}
+    return idea, visual, caption_obj
+
+
+async def next_idea(backlog: IdeaBacklog, niche: str) -> Optional[dict]:
+    """Próxima ideia da fila do nicho; None se o backlog falhar (a ideia sai da chamada única)."""
+    try:
+        idea = await backlog.take_async(niche)
+        logger.info(f"💡 Ideia do backlog: {idea.get('topic', '')}")
+        return idea
+    except Exception as exc:
+        logger.warning(f"⚠️ Backlog de ideias indisponível ({exc}), gerando ideia junto com o post")
+        return None
+
+
+async def next_unique_idea(
+    backlog: IdeaBacklog, similarity: Optional[SimilarityIndex], niche: str
+) -> Optional[dict]:
+    """
+    next_idea + checagem de quase-duplicata do tópico (antes de qualquer chamada ao Gemini).
+    Raises ContentDuplicateError se NEAR_DUP_MAX_IDEA_SKIPS ideias seguidas forem repetidas.
+    """
+    for _ in range(max(1, settings.NEAR_DUP_MAX_IDEA_SKIPS)):
+        idea = await next_idea(backlog, niche)
+        if idea is None or similarity is None:
+            return idea
+        match = await asyncio.to_thread(similarity.find_similar, idea.get("topic", ""), "topic")
+        if match is None:
+            return idea
+        logger.info(
+            f"♻️ Ideia descartada: parecida com o post id={match.content_id} "
+            f"('{match.topic}', similaridade {match.similarity:.2f})"
+        )
+        if idea.get("backlog_id") is not None:
+            await asyncio.to_thread(backlog.mark_skipped, idea["backlog_id"])
+    raise ContentDuplicateError(f"Só ideias quase duplicadas no backlog de '{niche}'")
+
+
+async def generate_copy_stepwise(
+    llm: GeminiClient, niche: str, idea: Optional[dict] = None
+) -> tuple[dict, dict, dict]:
+    """
+    Caminho em etapas: ideia (se não veio do backlog) → (copy visual ∥ legenda).
+    Copy visual e legenda só dependem do tópico, então rodam juntas.
+    """
+    if idea is None:
+        logger.info("🤖 Gerando ideia de tópico...")
+        idea = (await llm.generate_topic_ideas_async(niche=niche, count=1))[0]
+    topic = idea.get("topic", "").strip() or "IA para instituições de ensino"
+
+    logger.info("🎨✍️ Gerando copy visual e legenda em paralelo...")
+    visual, caption_obj = await asyncio.gather(
+        llm.generate_visual_copy_async(topic=topic),
+        llm.write_post_caption_async(topic=topic),
+    )
+    return idea, visual, caption_obj
+
+
+async def generate_copy(
+    llm: GeminiClient, niche: str, idea: Optional[dict] = None
+) -> tuple[dict, dict, dict]:
+    """
+    Copy visual + legenda (e a ideia, se não veio do backlog) numa única chamada ao Gemini;
+    em etapas se ela falhar.
+    """
+    logger.info("🤖 Gerando copy visual e legenda (chamada única)...")
+    try:
+        bundle_idea, visual, caption_obj = split_post_bundle(
+            await llm.generate_post_bundle_async(niche=niche, idea=idea)
+        )
+        # Ideia do backlog prevalece (o modelo pode reescrever o tópico)
+        return {**bundle_idea, **(idea or {})}, visual, caption_obj
+    except Exception as exc:
+        logger.warning(f"⚠️ Chamada única falhou ({exc}), gerando em etapas")
+        return await generate_copy_stepwise(llm, niche, idea)
+
+
 # ============================================================
 # PIPELINE PRINCIPAL
 # ============================================================
 
-async def generate_post(niche: str, platform: str = "instagram") -> Path:
+async def generate_post(
+    niche: str,
+    platform: str = "instagram",
+    renderer: Optional[HtmlRenderer] = None,
+    backlog: Optional[IdeaBacklog] = None,
+    similarity: Optional[SimilarityIndex] = None,
+) -> Path:
     """
     Pipeline completo de geração de post:
-    1. Gemini → ideia de tópico
-    2. Gemini → copy visual (headline + subheadline)
-    3. Gemini → legenda completa
-    4. Pexels → foto de fundo
-    5. HTML Renderer → imagem final
+    1. Backlog → próxima ideia do nicho (já gerada em lote, sem chamada ao Gemini),
+       pulando tópicos quase iguais a posts anteriores
+    2-3. Gemini → copy visual + legenda (uma chamada; em etapas se ela falhar)
+    4. Pexels → foto de fundo pelo tópico (em paralelo com 2-3 quando a ideia vem do backlog)
+    5. HTML Renderer → imagem final (só depois de checar a legenda contra quase-duplicatas)
     6. SQLite → salvar histórico
+
+    Args:
+        renderer: HtmlRenderer já iniciado (compartilhado entre jobs). Se None,
+            cria um renderer avulso que lança o Chromium só para este post.
+        backlog: Fila de ideias (padrão: a compartilhada do processo)
+        similarity: Índice de quase-duplicatas (padrão: no DB_PATH, se NEAR_DUP_ENABLED)
     """
     logger.info("=" * 60)
     logger.info("🚀 Iniciando geração de post")
@@ -199,21 +279,56 @@ async def generate_post(niche: str, platform: str = "instagram") -> Path:
     repo = ContentRepository()
     llm = GeminiClient()
     pexels = PexelsClient()
-    renderer = HtmlRenderer()
+    renderer = renderer or HtmlRenderer()
+    backlog = backlog or shared_idea_backlog()
+    if similarity is None and settings.NEAR_DUP_ENABLED:
+        similarity = SimilarityIndex()
 
+    idea: Optional[dict] = None
     try:
-        # 1) Gerar ideia de tópico
-        logger.info("🤖 Gerando ideia de tópico...")
-        ideas = llm.generate_topic_ideas(niche=niche, count=1)
-        idea = ideas[0]
+        # Viewport 1080x1080 com device_scale_factor → foto precisa cobrir o tamanho em pixels reais
+        scale = renderer.device_scale_factor
+        bg_target = (1080 * scale, 1080 * scale)
+
+        # 1) Ideia do backlog (sem LLM). Com o tópico em mãos, a foto já segue o tema e é
+        #    buscada em paralelo com os textos → caminho crítico = max(LLM, Pexels)
+        idea = await next_unique_idea(backlog, similarity, niche)
+        bg_task: Optional[asyncio.Task] = None
+        if idea is not None:
+            pexels_query = select_pexels_query(idea.get("topic", ""))
+            logger.info(f"📸 Buscando foto no Pexels em paralelo (query: {pexels_query})")
+            bg_task = asyncio.create_task(pexels.get_background_for_query_async(pexels_query, target_size=bg_target))
+        try:
+            # 2-3) Textos (Gemini)
+            idea, visual, caption_obj = await generate_copy(llm, niche, idea)
+            if similarity is not None:
+                # Ideia gerada na chamada única (sem backlog) ou legenda repetida: para antes do render
+                try:
+                    await asyncio.to_thread(
+                        similarity.ensure_unique, idea.get("topic", ""), caption_obj.get("caption", "")
+                    )
+                except ContentDuplicateError:
+                    if idea.get("backlog_id") is not None:
+                        await asyncio.to_thread(backlog.mark_skipped, idea["backlog_id"])
+                    raise
+
+            # 4) Foto: sem ideia do backlog, usa a query que o modelo sugeriu para o tópico
+            if bg_task is None:
+                pexels_query = (visual.get("pexels_query") or "").strip() or select_pexels_query(
+                    idea.get("topic", "")
+                )
+                logger.info(f"📸 Buscando foto no Pexels (query: {pexels_query})")
+                bg_path = await pexels.get_background_for_query_async(pexels_query, target_size=bg_target)
+            else:
+                bg_path = await bg_task
+        finally:
+            if bg_task is not None:
+                bg_task.cancel()  # no-op se já terminou
+
         topic = idea.get("topic", "").strip() or "IA para instituições de ensino"
         hook = idea.get("hook", "")
         logger.info(f"✅ Tópico: {topic}")
 
-        # 2) Gerar copy visual
-        logger.info("🎨 Gerando copy visual...")
-        visual = llm.generate_visual_copy(topic=topic)
-        
         headline_raw = visual.get("headline", "CONVERTA\nMAIS\nLEADS")
         headline = format_headline(headline_raw)
         
@@ -223,9 +338,6 @@ async def generate_post(niche: str, platform: str = "instagram") -> Path:
         
         logger.info(f"✅ Headline: {headline_raw}")
 
-        # 3) Gerar legenda completa
-        logger.info("✍️ Gerando legenda...")
-        caption_obj = llm.write_post_caption(topic=topic)
         caption = (caption_obj.get("caption") or "").strip()
         hashtags = caption_obj.get("hashtags") or []
 
@@ -235,13 +347,6 @@ async def generate_post(niche: str, platform: str = "instagram") -> Path:
         else:
             full_caption = caption
 
-        # 4) Buscar foto no Pexels
-        logger.info("📸 Buscando foto no Pexels...")
-        pexels_query = select_pexels_query(topic)
-        logger.info(f"   Query: {pexels_query}")
-        
-        bg_path = pexels.get_background_for_query(pexels_query)
-        
         if bg_path and bg_path.exists():
             bg_url = f"file://{bg_path.resolve()}"
             logger.info(f"✅ Foto encontrada: {bg_path.name}")
@@ -254,7 +359,8 @@ async def generate_post(niche: str, platform: str = "instagram") -> Path:
         logo_path = Path("assets/brand/lodo_sem_fundo.png")
         if not logo_path.exists():
             logo_path = settings.LOGO_PATH
-        logo_b64 = image_to_base64(logo_path)
+        # file:// é servido do disco pelo HtmlRenderer (sem base64 no HTML)
+        logo_src = f"file://{logo_path.resolve()}" if logo_path.exists() else None
 
         badge_text = random.choice(BADGES)
         cta_text = random.choice(CTAS)
@@ -267,7 +373,7 @@ async def generate_post(niche: str, platform: str = "instagram") -> Path:
 
         template_data = {
             "imagem_fundo": bg_url,
-            "logo_path": logo_b64,
+            "logo_path": logo_src,
             "headline": headline,
             "subheadline": subheadline,
             "badge_text": badge_text,
@@ -322,6 +428,9 @@ async def generate_post(niche: str, platform: str = "instagram") -> Path:
         raise
     except Exception as exc:
         logger.exception(f"❌ Erro no pipeline: {exc}")
+        if idea is not None and idea.get("backlog_id") is not None:
+            # Falha não diz nada sobre a ideia: volta para a fila em vez de se perder como 'used'
+            await asyncio.to_thread(backlog.release, idea["backlog_id"])
         raise
 
 
@@ -329,7 +438,7 @@ async def generate_post(niche: str, platform: str = "instagram") -> Path:
 # PUBLICAÇÃO NO INSTAGRAM
 # ============================================================
 
-async def generate_and_publish(niche: str) -> bool:
+async def generate_and_publish(niche: str, renderer: Optional[HtmlRenderer] = None) -> bool:
     """
     Gera um post e publica no Instagram.
     Retorna True se publicou com sucesso.
@@ -340,7 +449,7 @@ async def generate_and_publish(niche: str) -> bool:
     
     try:
         # Gerar post
-        post_path = await generate_post(niche=niche, platform="instagram")
+        post_path = await generate_post(niche=niche, platform="instagram", renderer=renderer)
         
         # Buscar legenda do banco
         # (simplificado - pega do último registro)
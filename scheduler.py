@@ -11,12 +11,21 @@ import logging
 import random
 import time
 from datetime import datetime
+from typing import Any, Coroutine, Optional
 
 import schedule
 
 from config import settings
 from config.logging_config import setup_logging
 from main_html import generate_and_publish
+from src.generators.background_warmer import BackgroundWarmer
+from src.generators.gemini_cache import shared_response_cache
+from src.generators.idea_backlog import shared_idea_backlog
+from src.generators.pexels_client import http_stats
+from src.generators.pexels_ratelimit import shared_rate_limiter
+from src.processors.asset_cache import data_uri_cache
+from src.processors.asset_gc import AssetGC
+from src.processors.html_renderer import HtmlRenderer
 
 logger = logging.getLogger("eduflow.scheduler")
 
@@ -28,6 +37,15 @@ logger = logging.getLogger("eduflow.scheduler")
 # Intervalo entre posts (em minutos para teste)
 POST_INTERVAL_MINUTES = 5
 
+# Intervalo para completar o pool quente de backgrounds do Pexels
+WARM_INTERVAL_MINUTES = 30
+
+# Intervalo para reabastecer o backlog de ideias (nichos abaixo do mínimo)
+IDEAS_INTERVAL_MINUTES = 30
+
+# Intervalo da limpeza incremental de backgrounds/artes (orçamento em bytes)
+GC_INTERVAL_MINUTES = 60
+
 # Nichos para variar o conteúdo
 NICHOS = [
     "conversão de leads em matrículas para faculdades",
@@ -43,6 +61,50 @@ NICHOS = [
 ]
 
 
+# ============================================================
+# RECURSOS COMPARTILHADOS ENTRE JOBS
+# ============================================================
+
+# Event loop único: objetos do Playwright ficam presos ao loop que os criou,
+# então o Chromium persistente só pode ser reaproveitado se todos os jobs
+# rodarem no mesmo loop (asyncio.run criaria um loop novo a cada job).
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_RENDERER: Optional[HtmlRenderer] = None
+_WARMER: Optional[BackgroundWarmer] = None
+
+
+def _run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Executa uma corrotina no event loop compartilhado do scheduler."""
+    global _LOOP
+    if _LOOP is None or _LOOP.is_closed():
+        _LOOP = asyncio.new_event_loop()
+    return _LOOP.run_until_complete(coro)
+
+
+def get_renderer() -> HtmlRenderer:
+    """Retorna o HtmlRenderer persistente (inicia o Chromium na primeira chamada)."""
+    global _RENDERER
+    if _RENDERER is None:
+        _RENDERER = HtmlRenderer()
+    if not _RENDERER.is_running:
+        _run_async(_RENDERER.start())
+    return _RENDERER
+
+
+def shutdown() -> None:
+    """Fecha o Chromium persistente e o event loop."""
+    global _RENDERER, _LOOP
+    if _RENDERER is not None and _LOOP is not None and not _LOOP.is_closed():
+        try:
+            _run_async(_RENDERER.close())
+        except Exception as exc:
+            logger.warning(f"⚠️ Erro ao fechar renderer: {exc}")
+    _RENDERER = None
+    if _LOOP is not None and not _LOOP.is_closed():
+        _LOOP.close()
+    _LOOP = None
+
+
 # ============================================================
 # JOB PRINCIPAL
 # ============================================================
@@ -61,7 +123,7 @@ def job_generate_and_publish():
     max_attempts = 3
     for attempt in range(1, max_attempts + 1):
         try:
-            success = asyncio.run(generate_and_publish(niche=niche))
+            success = _run_async(generate_and_publish(niche=niche, renderer=get_renderer()))
             
             if success:
                 logger.info("✅ Post publicado com sucesso!")
@@ -79,10 +141,50 @@ def job_generate_and_publish():
     logger.error("❌ Todas as tentativas falharam")
 
 
+def job_warm_backgrounds():
+    """Completa o pool quente de backgrounds em background (não bloqueia o scheduler)."""
+    global _WARMER
+    if _WARMER is None:
+        _WARMER = BackgroundWarmer()
+    if not _WARMER.refill_in_background():
+        logger.info("🔥 Refill do pool quente ainda em andamento, pulando")
+
+
+def job_refill_ideas():
+    """Reabastece em lote o backlog de ideias dos nichos (em background, antes dos posts)."""
+    if not shared_idea_backlog().refill_in_background(NICHOS):
+        logger.info("💡 Refill do backlog de ideias ainda em andamento, pulando")
+
+
+def job_asset_gc():
+    """Aplica o orçamento de disco em backgrounds e artes já publicadas."""
+    try:
+        report = AssetGC().run()
+        logger.info(
+            f"🧹 Disco - backgrounds {report.backgrounds_bytes / 1e6:.0f} MB | "
+            f"processed {report.processed_bytes / 1e6:.0f} MB"
+        )
+    except Exception as e:
+        logger.exception(f"❌ Falha na limpeza de assets: {e}")
+
+
 def job_health_check():
     """Log de health check a cada hora."""
     logger.info(f"💓 Health check - Sistema rodando - {datetime.now().strftime('%H:%M')}")
 
+    if _RENDERER is not None and _RENDERER.is_running:
+        healthy = _run_async(_RENDERER.health_check())
+        logger.info(f"🖥️ Renderer {'OK' if healthy else 'com problema'} - {_RENDERER.stats}")
+
+    if _RENDERER is not None and _RENDERER.inline_assets:
+        # Só o modo inline (data URI) usa o cache; o padrão serve os arquivos por rota
+        logger.info(f"🗂️ Cache data URI - {data_uri_cache.stats()}")
+    logger.info(f"🌐 Conexões Pexels - {http_stats()}")
+    logger.info(f"🚦 Cota Pexels - {shared_rate_limiter().stats()}")
+    logger.info(f"💡 Backlog de ideias - {shared_idea_backlog().stats()}")
+    if settings.GEMINI_CACHE_ENABLED:
+        logger.info(f"🧠 Cache Gemini - {shared_response_cache().stats()}")
+
 
 # ============================================================
 # SCHEDULER
@@ -99,6 +201,17 @@ def run_scheduler():
     # Agenda posts a cada 2 horas
     schedule.every(POST_INTERVAL_MINUTES).minutes.do(job_generate_and_publish)
     
+    # Pool quente de backgrounds (primeiro refill já dispara agora)
+    schedule.every(WARM_INTERVAL_MINUTES).minutes.do(job_warm_backgrounds)
+    job_warm_backgrounds()
+
+    # Backlog de ideias (primeiro refill já dispara agora)
+    schedule.every(IDEAS_INTERVAL_MINUTES).minutes.do(job_refill_ideas)
+    job_refill_ideas()
+
+    # Limpeza incremental de disco
+    schedule.every(GC_INTERVAL_MINUTES).minutes.do(job_asset_gc)
+
     # Health check a cada hora
     schedule.every(1).hours.do(job_health_check)
     
@@ -108,9 +221,12 @@ def run_scheduler():
     
     # Loop infinito
     logger.info(f"⏳ Próximo post em {POST_INTERVAL_MINUTES} minutos...")
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Checa a cada minuto
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(60)  # Checa a cada minuto
+    finally:
+        shutdown()
 
 
 # ============================================================
@@ -120,7 +236,10 @@ def run_scheduler():
 def run_once():
     """Executa apenas uma vez (para teste)."""
     logger.info("🧪 Modo de teste - executando uma vez")
-    job_generate_and_publish()
+    try:
+        job_generate_and_publish()
+    finally:
+        shutdown()
 
 
 # ============================================================
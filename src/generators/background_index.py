@@ -0,0 +1,425 @@
+# src/generators/background_index.py
+"""
+Índice (SQLite) dos backgrounds em cache em assets/raw/backgrounds.
+Uma linha por arquivo: id da foto, query de origem, dimensões, fotógrafo, bytes,
+último uso e contagem de usos. Mantido pelo PexelsClient a cada download/uso;
+a escolha de background vira uma consulta indexada que prefere a foto usada há
+mais tempo (evita repetir a mesma foto em posts seguidos).
+
+Cada linha também guarda um hash perceptual (dHash 64 bits, de uma miniatura):
+fotos quase idênticas (mesma cena em queries diferentes) ficam a poucos bits de
+distância, então a escolha pula repetições visuais e dedupe() remove redundâncias.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from config import settings
+
+logger = logging.getLogger("eduflow.background_index")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backgrounds (
+    path TEXT PRIMARY KEY,
+    photo_id INTEGER,
+    query TEXT,
+    width INTEGER NOT NULL DEFAULT 0,
+    height INTEGER NOT NULL DEFAULT 0,
+    photographer TEXT,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    downloaded_at REAL NOT NULL,
+    last_used REAL NOT NULL DEFAULT 0,   -- 0 = nunca usada
+    use_count INTEGER NOT NULL DEFAULT 0,
+    phash TEXT                           -- dHash em hex (16 dígitos)
+);
+
+CREATE INDEX IF NOT EXISTS idx_backgrounds_last_used ON backgrounds(last_used);
+CREATE INDEX IF NOT EXISTS idx_backgrounds_query_last_used ON backgrounds(query, last_used);
+
+-- Fotos do Pexels descartadas por serem quase iguais a um arquivo já em cache:
+-- o próximo pedido da mesma foto usa o arquivo existente em vez de baixar de novo
+CREATE TABLE IF NOT EXISTS aliases (
+    photo_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_aliases_path ON aliases(path);
+"""
+
+# Extensões aceitas (fotos colocadas à mão também entram no índice via sync)
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png", "*.webp")
+
+_PHOTO_ID_RE = re.compile(r"pexels_(\d+)")
+
+# Quantas fotos usadas por último entram na checagem de repetição visual
+_RECENT_FOR_DEDUPE = 10
+
+
+def dhash(img: Image.Image, size: int = 8) -> str:
+    """
+    Difference hash: miniatura (size+1 x size) em tons de cinza, 1 bit por par de
+    pixels vizinhos (esquerda > direita). Resistente a recompressão e redimensionamento.
+    """
+    # draft: JPEGs grandes decodificam direto em escala 1/8 (a miniatura não precisa de mais)
+    img.draft("L", (size * 8, size * 8))
+    small = img.convert("L").resize((size + 1, size), Image.Resampling.BILINEAR)
+    px = small.tobytes()
+    value = 0
+    for row in range(size):
+        base = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (px[base + col] > px[base + col + 1])
+    return f"{value:0{size * size // 4}x}"
+
+
+def hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+class BackgroundIndex:
+    def __init__(
+        self,
+        root: Path,
+        db_path: Optional[Path] = None,
+        max_distance: Optional[int] = None,
+    ) -> None:
+        self.root = Path(root)
+        self.db_path = Path(db_path or self.root / "index.db")
+        # Distância de Hamming (em 64 bits) até a qual duas fotos contam como a mesma
+        self.max_distance = settings.BACKGROUND_DUP_DISTANCE if max_distance is None else max_distance
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(backgrounds)")}
+            if "phash" not in columns:
+                # Índices criados antes do hash perceptual (preenchido depois pelo sync)
+                conn.execute("ALTER TABLE backgrounds ADD COLUMN phash TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    # -----------------------
+    # Escrita
+    # -----------------------
+    def record(
+        self,
+        path: Path,
+        query: Optional[str] = None,
+        photo_id: Optional[int] = None,
+        photographer: Optional[str] = None,
+        used: bool = False,
+    ) -> None:
+        """
+        Registra (ou atualiza) um arquivo. Dimensões e bytes vêm do próprio arquivo;
+        uso anterior é preservado. `used=True` também conta um uso agora.
+        """
+        path = Path(path)
+        try:
+            size = path.stat().st_size
+            with Image.open(path) as img:
+                width, height = img.size
+                phash = dhash(img)
+        except Exception as exc:
+            logger.warning("Background ilegível, fora do índice: %s (%s)", path.name, exc)
+            return
+
+        if photo_id is None:
+            match = _PHOTO_ID_RE.search(path.stem)
+            photo_id = int(match.group(1)) if match else None
+
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO backgrounds
+                    (path, photo_id, query, width, height, photographer, bytes, downloaded_at, last_used, use_count, phash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        photo_id = COALESCE(excluded.photo_id, photo_id),
+                        query = COALESCE(excluded.query, query),
+                        width = excluded.width,
+                        height = excluded.height,
+                        photographer = COALESCE(excluded.photographer, photographer),
+                        bytes = excluded.bytes,
+                        last_used = MAX(last_used, excluded.last_used),
+                        use_count = use_count + excluded.use_count,
+                        phash = excluded.phash
+                    """,
+                    (
+                        str(path),
+                        photo_id,
+                        query,
+                        width,
+                        height,
+                        photographer,
+                        size,
+                        now,
+                        now if used else 0,
+                        1 if used else 0,
+                        phash,
+                    ),
+                )
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao gravar índice de backgrounds: %s", exc)
+
+    def mark_used(self, path: Path) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE backgrounds SET last_used = ?, use_count = use_count + 1 WHERE path = ?",
+                    (time.time(), str(path)),
+                )
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao atualizar uso do background: %s", exc)
+
+    def remove(self, path: Path) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM backgrounds WHERE path = ?", (str(path),))
+                conn.execute("DELETE FROM aliases WHERE path = ?", (str(path),))
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao remover background do índice: %s", exc)
+
+    def add_alias(self, photo_id: int, path: Path) -> None:
+        """Registra que a foto `photo_id` é quase igual ao arquivo `path` (já em cache)."""
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO aliases (photo_id, path) VALUES (?, ?)", (photo_id, str(path)))
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao gravar alias de background: %s", exc)
+
+    # -----------------------
+    # Leitura
+    # -----------------------
+    def alias_for(self, photo_id: int) -> Optional[Path]:
+        """Arquivo que substitui a foto `photo_id` (quase duplicata), se ainda existir."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT path FROM aliases WHERE photo_id = ?", (photo_id,)).fetchone()
+                if row and not Path(row[0]).exists():
+                    conn.execute("DELETE FROM aliases WHERE photo_id = ?", (photo_id,))
+                    conn.commit()
+                    row = None
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao consultar alias de background: %s", exc)
+            return None
+        return Path(row[0]) if row else None
+
+    def count(self) -> int:
+        try:
+            with self._connect() as conn:
+                return int(conn.execute("SELECT COUNT(*) FROM backgrounds").fetchone()[0])
+        except sqlite3.Error:
+            return 0
+
+    def total_bytes(self) -> int:
+        try:
+            with self._connect() as conn:
+                return int(conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM backgrounds").fetchone()[0])
+        except sqlite3.Error:
+            return 0
+
+    def least_recently_used(self, limit: int) -> list[tuple[Path, int]]:
+        """(caminho, bytes) das fotos usadas há mais tempo (nunca usadas primeiro)."""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT path, bytes FROM backgrounds ORDER BY last_used, downloaded_at LIMIT ?",
+                    (limit,),
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao consultar índice de backgrounds: %s", exc)
+            return []
+        return [(Path(raw), int(size)) for raw, size in rows]
+
+    def recent_hashes(self, limit: int = _RECENT_FOR_DEDUPE) -> list[str]:
+        """Hashes das fotos usadas por último."""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT phash FROM backgrounds
+                    WHERE last_used > 0 AND phash IS NOT NULL
+                    ORDER BY last_used DESC LIMIT ?
+                    """,
+                    (limit,),
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [row[0] for row in rows]
+
+    def looks_recent(self, path: Path, recent: Optional[list[str]] = None) -> bool:
+        """True se `path` é quase igual a uma das fotos usadas por último (`recent`: recent_hashes())."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT phash FROM backgrounds WHERE path = ?", (str(path),)).fetchone()
+        except sqlite3.Error:
+            return False
+        if not row or not row[0]:
+            return False
+        recent = self.recent_hashes() if recent is None else recent
+        return any(hamming(row[0], r) <= self.max_distance for r in recent)
+
+    def pick(self, query: Optional[str] = None, window: int = 5, mark_used: bool = True) -> Optional[Path]:
+        """
+        Escolhe entre as `window` fotos usadas há mais tempo (sorteio entre elas,
+        para não ficar determinístico). Com `query`, só fotos daquela busca.
+        Fotos quase idênticas às usadas por último são puladas (se sobrar alguma).
+        Linhas cujo arquivo sumiu são removidas no caminho.
+        """
+        sql = "SELECT path, phash FROM backgrounds"
+        params: tuple = ()
+        if query:
+            sql += " WHERE query = ?"
+            params = (query,)
+        sql += " ORDER BY last_used LIMIT ?"
+
+        recent = self.recent_hashes()
+
+        for _ in range(3):
+            try:
+                with self._connect() as conn:
+                    # Busca folga extra: parte dos candidatos pode ser repetição visual
+                    rows = conn.execute(sql, (*params, window * 4)).fetchall()
+            except sqlite3.Error as exc:
+                logger.warning("Erro ao consultar índice de backgrounds: %s", exc)
+                return None
+            if not rows:
+                return None
+
+            existing: list[tuple[Path, Optional[str]]] = []
+            for raw, phash in rows:
+                p = Path(raw)
+                if p.exists():
+                    existing.append((p, phash))
+                else:
+                    self.remove(p)
+            if existing:
+                fresh = [
+                    p for p, phash in existing
+                    if not phash or all(hamming(phash, r) > self.max_distance for r in recent)
+                ]
+                chosen = random.choice((fresh or [p for p, _ in existing])[:window])
+                if mark_used:
+                    self.mark_used(chosen)
+                return chosen
+        return None
+
+    # -----------------------
+    # Quase-duplicatas
+    # -----------------------
+    def find_duplicate(self, path: Path) -> Optional[Path]:
+        """Outra foto do índice visualmente igual a `path` (a mais próxima), ou None."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT phash FROM backgrounds WHERE path = ?", (str(path),)).fetchone()
+                if not row or not row[0]:
+                    return None
+                others = conn.execute(
+                    "SELECT path, phash FROM backgrounds WHERE phash IS NOT NULL AND path != ?",
+                    (str(path),),
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao consultar índice de backgrounds: %s", exc)
+            return None
+
+        best: Optional[tuple[int, str]] = None
+        for raw, phash in others:
+            dist = hamming(row[0], phash)
+            if dist <= self.max_distance and (best is None or dist < best[0]):
+                best = (dist, raw)
+        if best and Path(best[1]).exists():
+            return Path(best[1])
+        return None
+
+    def dedupe(self) -> list[Path]:
+        """
+        Remove arquivos redundantes: em cada grupo de quase-duplicatas fica a foto de
+        maior resolução (empate: a mais usada). Retorna os caminhos apagados.
+        """
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT path, phash, photo_id FROM backgrounds WHERE phash IS NOT NULL
+                    ORDER BY width * height DESC, use_count DESC, last_used DESC
+                    """
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao ler índice de backgrounds: %s", exc)
+            return []
+
+        kept: list[tuple[str, str]] = []
+        removed: list[Path] = []
+        for raw, phash, photo_id in rows:
+            keeper = next((k_path for k_hash, k_path in kept if hamming(phash, k_hash) <= self.max_distance), None)
+            if keeper is not None:
+                path = Path(raw)
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as exc:
+                    logger.warning("Não consegui apagar duplicata %s: %s", path.name, exc)
+                    continue
+                self.remove(path)
+                if photo_id is not None:
+                    self.add_alias(int(photo_id), Path(keeper))
+                removed.append(path)
+            else:
+                kept.append((phash, raw))
+
+        if removed:
+            logger.info("🗂️ %d backgrounds quase duplicados removidos", len(removed))
+        return removed
+
+    # -----------------------
+    # Reconciliação com o disco
+    # -----------------------
+    def sync(self) -> tuple[int, int]:
+        """
+        Varre a pasta uma vez: indexa arquivos que não estão no índice e apaga
+        linhas de arquivos que não existem mais. Retorna (adicionados, removidos).
+        """
+        on_disk: set[str] = set()
+        if self.root.exists():
+            for pattern in IMAGE_PATTERNS:
+                on_disk.update(str(p) for p in self.root.glob(pattern))
+
+        try:
+            with self._connect() as conn:
+                indexed = {row[0] for row in conn.execute("SELECT path FROM backgrounds")}
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao ler índice de backgrounds: %s", exc)
+            return 0, 0
+
+        try:
+            with self._connect() as conn:
+                unhashed = {row[0] for row in conn.execute("SELECT path FROM backgrounds WHERE phash IS NULL")}
+        except sqlite3.Error:
+            unhashed = set()
+
+        # Novos no disco + linhas antigas ainda sem hash perceptual
+        for raw in (on_disk - indexed) | (unhashed & on_disk):
+            self.record(Path(raw))
+        for raw in indexed - on_disk:
+            self.remove(Path(raw))
+
+        added, removed = len(on_disk - indexed), len(indexed - on_disk)
+        if added or removed:
+            logger.info("🗂️ Índice de backgrounds sincronizado: +%d / -%d", added, removed)
+        return added, removed
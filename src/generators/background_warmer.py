@@ -0,0 +1,181 @@
+# src/generators/background_warmer.py
+"""
+Pré-aquecimento de backgrounds do Pexels.
+Mantém K fotos baixadas (já no tamanho certo) por query em assets/raw/backgrounds/warm/,
+para que a geração de post pegue uma foto na hora, sem busca + download no caminho crítico.
+
+Uso (CLI):
+    python -m src.generators.background_warmer            # completa todos os pools
+    python -m src.generators.background_warmer --per-query 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from config import settings
+from src.generators.pexels_client import PexelsClient, PexelsPhoto
+
+logger = logging.getLogger("eduflow.background_warmer")
+
+
+def default_queries() -> list[str]:
+    """Todas as queries usadas pelo pipeline HTML (main_html) e pelo ImageEditor."""
+    # Import tardio: main_html e image_editor importam o PexelsClient
+    from main_html import PEXELS_QUERIES
+    from src.processors.image_editor import SMART_QUERY_FALLBACK, SMART_QUERY_RULES
+
+    queries: list[str] = []
+    for bucket in PEXELS_QUERIES.values():
+        queries.extend(bucket)
+    queries.extend(query for _, query in SMART_QUERY_RULES)
+    queries.append(SMART_QUERY_FALLBACK)
+    return list(dict.fromkeys(queries))  # sem duplicatas, ordem preservada
+
+
+class BackgroundWarmer:
+    def __init__(
+        self,
+        client: Optional[PexelsClient] = None,
+        per_query: Optional[int] = None,
+        workers: Optional[int] = None,
+        target_size: Optional[tuple[int, int]] = None,
+    ) -> None:
+        self.client = client or PexelsClient()
+        self.per_query = max(1, per_query or settings.PEXELS_WARM_PER_QUERY)
+        # Mesmo limite de downloads simultâneos do resto do cliente (PEXELS_DOWNLOAD_CONCURRENCY)
+        self.workers = max(1, workers or settings.PEXELS_DOWNLOAD_CONCURRENCY)
+        self.target_size = target_size or settings.PEXELS_WARM_TARGET
+
+        self._running = threading.Lock()
+
+    def missing(self, query: str) -> int:
+        """Quantas fotos faltam no pool (só contam as que cobrem o alvo, as únicas que saem dele)."""
+        return max(0, self.per_query - len(self.client.warm_backgrounds(query, self.target_size)))
+
+    def prune(self, query: str) -> int:
+        """Apaga do pool fotos que não cobrem o alvo (nunca seriam retiradas). Retorna quantas."""
+        usable = set(self.client.warm_backgrounds(query, self.target_size))
+        removed = 0
+        for f in self.client.warm_backgrounds(query):
+            if f not in usable:
+                f.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            logger.info("🔥 Pool quente '%s': %d fotos menores que o alvo removidas", query, removed)
+        return removed
+
+    def refill_all(self, queries: Optional[Iterable[str]] = None) -> dict[str, int]:
+        """
+        Completa o pool de cada query. As buscas usam o cache de buscas; os downloads
+        rodam em paralelo (limitados por `workers`). Retorna {query: fotos baixadas}.
+        """
+        if not self.client.api_key:
+            logger.warning("PEXELS_API_KEY vazio. Pool quente não será preenchido.")
+            return {}
+
+        jobs: list[tuple[str, PexelsPhoto, Path]] = []
+        planned: set[int] = set()  # a mesma foto pode aparecer em várias queries
+        for query in queries or default_queries():
+            self.prune(query)
+            need = self.missing(query)
+            if need:
+                jobs.extend((query, photo, dest) for photo, dest in self._plan(query, need, planned))
+
+        if not jobs:
+            logger.info("🔥 Pool quente completo (nada a baixar)")
+            return {}
+
+        items: list[tuple[str, Path]] = []
+        queries_of: list[str] = []
+        for query, photo, dest in jobs:
+            url = self.client._pick_best_src(photo.src, photo=photo, target=self.target_size)
+            if url:
+                items.append((url, dest))
+                queries_of.append(query)
+
+        logger.info("🔥 Pool quente: baixando %d fotos (%d simultâneos)", len(items), self.workers)
+        # Roda na thread do refill (ou na CLI), fora do event loop do pipeline
+        results = asyncio.run(self.client.download_many_async(items, concurrency=self.workers))
+
+        filled: dict[str, int] = {}
+        for query, path in zip(queries_of, results):
+            if path is not None:
+                filled[query] = filled.get(query, 0) + 1
+        logger.info(
+            "🔥 Pool quente: %d/%d fotos baixadas | cota=%s",
+            sum(filled.values()),
+            len(jobs),
+            self.client.rate_limiter.stats(),
+        )
+        return filled
+
+    def refill_in_background(self, queries: Optional[Iterable[str]] = None) -> bool:
+        """
+        Dispara refill_all numa thread daemon (para o scheduler não bloquear).
+        Retorna False se já existe um refill em andamento.
+        """
+        if not self._running.acquire(blocking=False):
+            return False
+
+        def _worker() -> None:
+            try:
+                self.refill_all(queries)
+            except Exception as exc:
+                logger.exception("Falha no refill do pool quente: %s", exc)
+            finally:
+                self._running.release()
+
+        threading.Thread(target=_worker, name="pexels-warmer", daemon=True).start()
+        return True
+
+    def _plan(self, query: str, need: int, planned: set[int]) -> list[tuple[PexelsPhoto, Path]]:
+        """Escolhe `need` fotos ainda não baixadas (nem no pool nem no cache normal)."""
+        try:
+            photos = self.client.search_photos(query=query, per_page=20, orientation="portrait")
+        except Exception as exc:
+            logger.warning("Pool quente: falha ao buscar '%s': %s", query, exc)
+            return []
+
+        pool_dir = self.client.warm_pool_dir(query)
+        # Só fotos cujo original cobre o alvo: as menores nunca sairiam do pool
+        tw, th = self.target_size
+        good = [p for p in photos if p.width >= tw and p.height >= th]
+
+        plan: list[tuple[PexelsPhoto, Path]] = []
+        for photo in good:
+            name = self.client._cache_path(photo.id).name
+            if photo.id in planned or (pool_dir / name).exists() or (self.client.download_dir / name).exists():
+                continue
+            planned.add(photo.id)
+            plan.append((photo, pool_dir / name))
+            if len(plan) >= need:
+                break
+        return plan
+
+
+def main() -> None:
+    from config.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Pré-baixa backgrounds do Pexels por query.")
+    parser.add_argument("--per-query", type=int, default=None, help="Fotos prontas por query")
+    parser.add_argument("--workers", type=int, default=None, help="Downloads simultâneos")
+    parser.add_argument("--query", action="append", help="Query específica (pode repetir)")
+    args = parser.parse_args()
+
+    setup_logging(level="INFO")
+    settings.ensure_directories()
+
+    warmer = BackgroundWarmer(per_query=args.per_query, workers=args.workers)
+    filled = warmer.refill_all(args.query)
+    for query, count in filled.items():
+        logger.info("  +%d  %s", count, query)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# src/generators/gemini_cache.py
+"""
+Cache persistente (SQLite) de respostas do Gemini.
+Chave: sha256 de (modelo, temperatura, max_output_tokens, prompt) → prompts idênticos
+com os mesmos parâmetros não voltam à API enquanto a entrada estiver no TTL.
+Tamanho limitado em bytes (LRU por último acesso). Opt-in: GEMINI_CACHE_ENABLED=1.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger("eduflow.gemini_cache")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS gemini_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_gemini_responses_accessed_at ON gemini_responses(accessed_at);
+"""
+
+
+class GeminiResponseCache:
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.db_path = Path(db_path or settings.GEMINI_CACHE_DB)
+        self.ttl_seconds = settings.GEMINI_CACHE_TTL_HOURS * 3600 if ttl_seconds is None else ttl_seconds
+        self.max_bytes = settings.GEMINI_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def make_key(model: str, temperature: float, max_output_tokens: int, prompt: str, extra: str = "") -> str:
+        """`extra` separa chamadas com o mesmo prompt mas formato de resposta diferente."""
+        payload = "\x1f".join([model, f"{temperature:.4f}", str(max_output_tokens), extra, prompt])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # -----------------------
+    # Leitura / escrita
+    # -----------------------
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM gemini_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - float(row[1]) < self.ttl_seconds:
+                    conn.execute("UPDATE gemini_responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                else:
+                    row = None
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao ler cache do Gemini: %s", exc)
+            row = None
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO gemini_responses (key, model, response, bytes, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, model, response, size, now, now),
+                )
+                self._evict(conn, now)
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao gravar cache do Gemini: %s", exc)
+
+    def delete(self, key: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM gemini_responses WHERE key = ?", (key,))
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao apagar entrada do cache do Gemini: %s", exc)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Remove vencidas e, se ainda passar do orçamento, as acessadas há mais tempo."""
+        conn.execute("DELETE FROM gemini_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = int(conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM gemini_responses").fetchone()[0])
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, bytes FROM gemini_responses ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM gemini_responses WHERE key = ?", (key,))
+            total -= int(size)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Instância única por processo (o GeminiClient é criado a cada post)
+_CACHE: Optional[GeminiResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def shared_response_cache() -> GeminiResponseCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = GeminiResponseCache()
+        return _CACHE
@@ -6,11 +6,12 @@ Prompts focados em captação de alunos para instituições de ensino.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, TypeVar
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -18,9 +19,24 @@ from google import genai
 from google.genai import types
 
 from config import settings
+from src.generators.gemini_cache import GeminiResponseCache, shared_response_cache
+from src.generators.gemini_schemas import (
+    PostBundle,
+    PostCaption,
+    TopicIdea,
+    VideoScript,
+    VisualCopy,
+    array_schema,
+    response_schema,
+    schema_fingerprint,
+    to_dict,
+    validate_into,
+)
 
 logger = logging.getLogger("eduflow.gemini")
 
+T = TypeVar("T")
+
 
 # ============================================================
 # PROMPTS EMBUTIDOS (baseados nos arquivos de prompts/)
@@ -75,7 +91,12 @@ class GeminiConfig:
 
 
 class GeminiClient:
-    def __init__(self, config: Optional[GeminiConfig] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[GeminiConfig] = None,
+        response_cache: Optional[GeminiResponseCache] = None,
+        use_cache: Optional[bool] = None,
+    ) -> None:
         api_key = (config.api_key if config else settings.GEMINI_API_KEY).strip()
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY não configurada no .env")
@@ -83,6 +104,10 @@ class GeminiClient:
         self.config = config or GeminiConfig(api_key=api_key)
         self.client = genai.Client(api_key=self.config.api_key)
 
+        # Cache de respostas (opt-in: GEMINI_CACHE_ENABLED=1 ou use_cache=True)
+        enabled = settings.GEMINI_CACHE_ENABLED if use_cache is None else use_cache
+        self.response_cache = (response_cache or shared_response_cache()) if enabled else None
+
     def _read_prompt_file(self, path: Path) -> str:
         """Lê arquivo de prompt se existir, senão retorna string vazia."""
         try:
@@ -92,16 +117,148 @@ class GeminiClient:
             logger.warning("Não foi possível ler prompt %s: %s", path, exc)
         return ""
 
+    def _generate_text(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        creative: bool = False,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """
+        Chamada base ao Gemini, passando pelo cache de respostas quando ativo.
+        `creative=True` marca chamadas que devem variar a cada post (ideias, legendas):
+        com GEMINI_CACHE_BYPASS_CREATIVE (padrão) elas sempre vão à API.
+        `schema` pede saída JSON nativa nesse formato (GEMINI_STRUCTURED_OUTPUT).
+        """
+        temperature = temperature or self.config.temperature
+        cache = self._cache_for(creative)
+        if cache is None:
+            return self._call_model(prompt, temperature, schema)
+
+        key = self._cache_key(prompt, temperature, schema)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("Gemini cache hit (%s...)", key[:12])
+            return cached
+
+        text = self._call_model(prompt, temperature, schema)
+        cache.put(key, self.config.model_name, text)
+        return text
+
+    def _generate_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        creative: bool = False,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        """_generate_text + parse; resposta cacheada que não parseia é descartada do cache."""
+        raw = self._generate_text(prompt, temperature=temperature, creative=creative, schema=schema)
+        try:
+            return self._safe_json_loads(raw)
+        except RuntimeError:
+            self._forget(prompt, temperature, creative, schema)
+            raise
+
+    def _generate_structured(
+        self,
+        prompt: str,
+        cls: type[T],
+        what: str,
+        temperature: Optional[float] = None,
+        creative: bool = False,
+    ) -> T:
+        """
+        Resposta JSON validada no dataclass `cls`. Se algum campo vier ausente/vazio/
+        com tipo errado, pede de novo SÓ esses campos (uma vez) em vez de refazer tudo.
+        """
+        schema = response_schema(cls)
+        parsed = self._generate_json(prompt, temperature=temperature, creative=creative, schema=schema)
+        obj, invalid = validate_into(cls, parsed)
+        if obj is not None:
+            return obj
+
+        # Não deixa a resposta incompleta no cache (próxima chamada pediria o reparo de novo)
+        self._forget(prompt, temperature, creative, schema)
+        return self._repair_fields(prompt, cls, parsed, invalid, what, temperature, creative)
+
+    def _repair_fields(
+        self,
+        prompt: str,
+        cls: type[T],
+        parsed: Any,
+        invalid: list[str],
+        what: str,
+        temperature: Optional[float],
+        creative: bool,
+    ) -> T:
+        logger.warning("Gemini: %s com campos inválidos %s, pedindo só esses campos", what, invalid)
+        previous = parsed if isinstance(parsed, dict) else {}
+        repair_prompt = f"""{prompt}
+
+## CORREÇÃO
+Sua resposta anterior foi:
+{json.dumps(previous, ensure_ascii=False)}
+
+Os campos {", ".join(invalid)} vieram ausentes, vazios ou em formato errado.
+Responda SOMENTE um JSON com esses campos corrigidos (os demais já estão ok).
+"""
+        fixed = self._generate_json(
+            repair_prompt,
+            temperature=temperature,
+            creative=True,  # reparo depende da resposta anterior: nunca reaproveitar
+            schema=response_schema(cls, only=invalid),
+        )
+        merged = {**previous, **(fixed if isinstance(fixed, dict) else {})}
+        obj, still_invalid = validate_into(cls, merged)
+        if obj is None:
+            raise RuntimeError(f"Gemini retornou {what} inválido: {', '.join(still_invalid)}")
+        return obj
+
+    def _forget(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        creative: bool,
+        schema: Optional[dict[str, Any]],
+    ) -> None:
+        cache = self._cache_for(creative, count_bypass=False)
+        if cache is not None:
+            cache.delete(self._cache_key(prompt, temperature or self.config.temperature, schema))
+
+    def _cache_for(self, creative: bool, count_bypass: bool = True) -> Optional[GeminiResponseCache]:
+        if self.response_cache is None:
+            return None
+        if creative and settings.GEMINI_CACHE_BYPASS_CREATIVE:
+            if count_bypass:
+                self.response_cache.record_bypass()
+            return None
+        return self.response_cache
+
+    def _cache_key(self, prompt: str, temperature: float, schema: Optional[dict[str, Any]] = None) -> str:
+        return GeminiResponseCache.make_key(
+            self.config.model_name,
+            temperature,
+            self.config.max_output_tokens,
+            prompt,
+            extra=schema_fingerprint(schema) if settings.GEMINI_STRUCTURED_OUTPUT else "",
+        )
+
     @retry(wait=wait_exponential(min=1, max=12), stop=stop_after_attempt(3))
-    def _generate_text(self, prompt: str, temperature: Optional[float] = None) -> str:
-        """Chamada base ao Gemini com retry."""
+    def _call_model(self, prompt: str, temperature: float, schema: Optional[dict[str, Any]] = None) -> str:
+        """Chamada à API do Gemini com retry."""
+        structured: dict[str, Any] = {}
+        if schema and settings.GEMINI_STRUCTURED_OUTPUT:
+            # Saída JSON nativa: o modelo é restrito ao schema (sem cercas ``` nem texto solto)
+            structured = {"response_mime_type": "application/json", "response_schema": schema}
         try:
             resp = self.client.models.generate_content(
                 model=self.config.model_name,
                 contents=prompt,
                 config=types.GenerateContentConfig(
-                    temperature=temperature or self.config.temperature,
+                    temperature=temperature,
                     max_output_tokens=self.config.max_output_tokens,
+                    **structured,
                 ),
             )
             text = (resp.text or "").strip()
@@ -115,17 +272,25 @@ class GeminiClient:
     # ============================================================
     # GERAÇÃO DE IDEIAS DE TÓPICOS
     # ============================================================
-    def generate_topic_ideas(self, niche: str, count: int = 6) -> list[dict[str, Any]]:
+    def generate_topic_ideas(
+        self, niche: str, count: int = 6, avoid: Optional[list[str]] = None
+    ) -> list[dict[str, Any]]:
         """
         Gera ideias de conteúdo focadas no nicho da EduFlow IA.
         
         Args:
             niche: Contexto adicional ou sub-nicho específico
             count: Quantidade de ideias para gerar
+            avoid: Tópicos já usados/enfileirados que não devem se repetir
             
         Returns:
             Lista de dicts com: topic, angle, hook, target, category, emotion
         """
+        avoid_block = ""
+        if avoid:
+            listed = "\n".join(f"- {t}" for t in avoid)
+            avoid_block = f"\n## JÁ USADOS (não repita nem reformule estes tópicos):\n{listed}\n"
+
         prompt = f"""
 {SYSTEM_CONTEXT}
 
@@ -145,7 +310,7 @@ As ideias devem:
 - Bastidores: como funciona um agente de IA
 - Comparativo: Antes vs Depois de usar IA
 - Objeções: responder dúvidas como "IA substitui pessoas?"
-
+{avoid_block}
 ## FORMATO (JSON array):
 [
   {{
@@ -160,12 +325,101 @@ As ideias devem:
 
 Responda SOMENTE o JSON, sem explicações.
 """
-        raw = self._generate_text(prompt)
-        parsed = self._safe_json_loads(raw)
+        parsed = self._generate_json(prompt, creative=True, schema=array_schema(response_schema(TopicIdea)))
 
         if not isinstance(parsed, list):
             raise RuntimeError("Gemini não retornou lista JSON para ideias.")
-        return parsed[:count]
+
+        ideas: list[TopicIdea] = []
+        for item in parsed[:count]:
+            idea, invalid = validate_into(TopicIdea, item)
+            if idea is None and not ideas and isinstance(item, dict):
+                # Nenhuma ideia válida ainda: corrige só os campos que faltaram desta
+                idea = self._repair_fields(prompt, TopicIdea, item, invalid, "ideia", None, True)
+            if idea is not None:
+                ideas.append(idea)
+
+        if not ideas:
+            raise RuntimeError("Gemini não retornou nenhuma ideia válida.")
+        return [to_dict(i) for i in ideas]
+
+    # ============================================================
+    # POST COMPLETO (IDEIA + COPY VISUAL + LEGENDA) EM UMA CHAMADA
+    # ============================================================
+    def generate_post_bundle(self, niche: str, idea: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """
+        Gera tudo que um post precisa numa única chamada (SYSTEM_CONTEXT enviado uma vez),
+        no lugar de generate_topic_ideas + generate_visual_copy + write_post_caption.
+
+        Args:
+            niche: Contexto adicional ou sub-nicho específico
+            idea: Ideia já escolhida (ex.: do backlog); o post é escrito sobre ela
+
+        Returns:
+            Dict validado com: topic, hook, headline, subheadline, pexels_query,
+            caption, hashtags (+ angle, category, mood quando vierem)
+
+        Raises:
+            RuntimeError: resposta fora do schema (campo ausente, vazio ou de tipo errado)
+        """
+        if idea:
+            idea_block = f"""## 1) IDEIA (já definida, mantenha topic e hook)
+- Tópico: {idea.get("topic", "")}
+- Gancho: {idea.get("hook", "")}
+- Ângulo: {idea.get("angle", "")}
+- Categoria: {idea.get("category", "")}
+"""
+        else:
+            idea_block = """## 1) IDEIA
+- Eduque o mercado sobre IA na educação (sem ser técnico)
+- Gere identificação com as dores do gestor educacional
+- Categorias (escolha uma): Dor → Solução, Mito vs Realidade, Dados & Tendências,
+  Bastidores, Comparativo, Objeções
+"""
+
+        prompt = f"""
+{SYSTEM_CONTEXT}
+
+## SUA MISSÃO
+Crie UM post completo de Instagram sobre: {niche}
+
+{idea_block}
+## 2) TEXTOS NA IMAGEM
+HEADLINE:
+- TUDO EM CAIXA ALTA, 3 a 6 palavras
+- Dividido em 2-4 linhas (use \\n para quebrar)
+- Exemplos: "LEAD\\nÀS 23H?\\nRESPONDA\\nEM 2 MIN", "+340%\\nMAIS\\nMATRÍCULAS"
+SUBHEADLINE:
+- Frase única, máximo 12 palavras, SEM ponto final
+PEXELS_QUERY:
+- Termo em INGLÊS: pessoa + contexto profissional/educacional + "copy space left"
+
+## 3) LEGENDA
+- Primeira linha: gancho que faz clicar em "mais"
+- Corpo: parágrafos curtos, pelo menos 1 dado concreto, máximo 150 palavras
+- Termine com CTA claro ("Link na bio", "Comenta QUERO", "Salva pra mostrar pro time")
+- Tom de consultor experiente, nunca vendedor
+- 8 a 12 hashtags (sem #), ex: educacao, ensinosuperior, captacaodealunos, matriculas,
+  iaeducacao, automacao, edtech, inovacaonaeducacao
+
+## FORMATO (JSON):
+{{
+  "topic": "Título curto e direto (max 80 chars)",
+  "angle": "Ângulo específico do tema",
+  "category": "Uma das categorias acima",
+  "hook": "Frase de abertura que prende atenção",
+  "headline": "TEXTO\\nEM\\nLINHAS",
+  "subheadline": "Frase de apoio sem ponto final",
+  "pexels_query": "specific context person copy space left",
+  "mood": "confiança | urgência | resultado | problema",
+  "caption": "Legenda completa com \\n\\n entre parágrafos",
+  "hashtags": ["educacao", "captacaodealunos", "..."]
+}}
+
+Responda SOMENTE o JSON.
+"""
+        bundle = self._generate_structured(prompt, PostBundle, "post bundle", temperature=0.8, creative=True)
+        return to_dict(bundle)
 
     # ============================================================
     # ROTEIRO DE VÍDEO (REELS/TIKTOK)
@@ -217,12 +471,8 @@ TÓPICO: {topic}
 
 Responda SOMENTE o JSON.
 """
-        raw = self._generate_text(prompt)
-        parsed = self._safe_json_loads(raw)
-
-        if not isinstance(parsed, dict):
-            raise RuntimeError("Gemini não retornou dict JSON para roteiro.")
-        return parsed
+        script = self._generate_structured(prompt, VideoScript, "roteiro")
+        return to_dict(script)
 
     # ============================================================
     # LEGENDA DE POST
@@ -277,12 +527,8 @@ Geral: edtech, inovacaonaeducacao, tecnologiaeducacional
 
 Responda SOMENTE o JSON.
 """
-        raw = self._generate_text(prompt)
-        parsed = self._safe_json_loads(raw)
-
-        if not isinstance(parsed, dict):
-            raise RuntimeError("Gemini não retornou dict JSON para legenda.")
-        return parsed
+        caption = self._generate_structured(prompt, PostCaption, "legenda", creative=True)
+        return to_dict(caption)
 
     # ============================================================
     # VISUAL COPY (TEXTO DO POST)
@@ -338,12 +584,8 @@ Exemplos:
 
 Responda SOMENTE o JSON.
 """
-        raw = self._generate_text(prompt, temperature=0.8)
-        parsed = self._safe_json_loads(raw)
-
-        if not isinstance(parsed, dict):
-            raise RuntimeError("Gemini não retornou dict JSON para visual copy.")
-        return parsed
+        visual = self._generate_structured(prompt, VisualCopy, "visual copy", temperature=0.8, creative=True)
+        return to_dict(visual)
 
     # ============================================================
     # BULLETS PARA CARROSSEL
@@ -377,12 +619,14 @@ REGRAS:
 
 Responda SOMENTE o JSON.
 """
-        raw = self._generate_text(prompt)
-        parsed = self._safe_json_loads(raw)
+        parsed = self._generate_json(prompt, schema=array_schema({"type": "STRING"}))
 
         if not isinstance(parsed, list):
             raise RuntimeError("Gemini não retornou lista para bullets.")
-        return [str(b) for b in parsed[:count]]
+        bullets = [str(b).strip() for b in parsed if str(b).strip()]
+        if not bullets:
+            raise RuntimeError("Gemini retornou bullets vazios.")
+        return bullets[:count]
 
     # ============================================================
     # LEGENDA DE CARROSSEL
@@ -430,9 +674,30 @@ Responda APENAS a legenda pronta (texto puro, não JSON).
 Separe parágrafos com linha em branco.
 Hashtags na última linha.
 """
-        caption = self._generate_text(prompt)
+        caption = self._generate_text(prompt, creative=True)
         return caption.strip()
 
+    # ============================================================
+    # API ASYNC (para o pipeline async do main_html)
+    # ============================================================
+    # Mesmas chamadas (prompts, retry e validação idênticos), executadas em threads via
+    # asyncio.to_thread: não bloqueiam o event loop e podem rodar juntas com asyncio.gather.
+    async def generate_post_bundle_async(
+        self, niche: str, idea: Optional[dict[str, Any]] = None
+    ) -> dict[str, Any]:
+        return await asyncio.to_thread(self.generate_post_bundle, niche, idea)
+
+    async def generate_topic_ideas_async(
+        self, niche: str, count: int = 6, avoid: Optional[list[str]] = None
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.generate_topic_ideas, niche, count, avoid)
+
+    async def generate_visual_copy_async(self, topic: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.generate_visual_copy, topic)
+
+    async def write_post_caption_async(self, topic: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.write_post_caption, topic)
+
     # ============================================================
     # HELPER: PARSE JSON
     # ============================================================
@@ -0,0 +1,150 @@
+# src/generators/gemini_schemas.py
+"""
+Formatos tipados das respostas estruturadas do GeminiClient.
+Cada dataclass gera o response_schema enviado ao Gemini (saída JSON nativa) e
+valida a resposta: campos sem default são obrigatórios e não podem vir vazios.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import MISSING, asdict, dataclass, field, fields
+from typing import Any, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Tipos (anotações em string, por causa do `from __future__ import annotations`) → schema Gemini
+_SCHEMA_TYPES: dict[str, dict[str, Any]] = {
+    "str": {"type": "STRING"},
+    "int": {"type": "INTEGER"},
+    "list[str]": {"type": "ARRAY", "items": {"type": "STRING"}},
+}
+
+
+@dataclass(frozen=True)
+class TopicIdea:
+    topic: str
+    hook: str
+    angle: str = ""
+    target: str = ""
+    category: str = ""
+    emotion: str = ""
+
+
+@dataclass(frozen=True)
+class VisualCopy:
+    headline: str
+    subheadline: str
+    pexels_query: str = ""
+    mood: str = ""
+
+
+@dataclass(frozen=True)
+class PostCaption:
+    caption: str
+    hashtags: list[str]
+    topic: str = ""
+    title: str = ""
+    suggested_cta_type: str = ""
+
+
+@dataclass(frozen=True)
+class VideoScript:
+    hook: str
+    beats: list[str]
+    cta: str
+    topic: str = ""
+    duration_sec: int = 0
+    visual_suggestion: str = ""
+    text_overlay: str = ""
+
+
+@dataclass(frozen=True)
+class PostBundle:
+    topic: str
+    hook: str
+    headline: str
+    subheadline: str
+    pexels_query: str
+    caption: str
+    hashtags: list[str]
+    angle: str = ""
+    category: str = ""
+    mood: str = ""
+    # Campos inesperados que o modelo mandou (preservados no metadata)
+    extra: dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+def response_schema(cls: type, only: Optional[list[str]] = None) -> dict[str, Any]:
+    """Schema OBJECT do dataclass (ou só dos campos em `only`), todos os campos pedidos."""
+    props = {f.name: _SCHEMA_TYPES[str(f.type)] for f in fields(cls) if str(f.type) in _SCHEMA_TYPES}
+    if only is not None:
+        props = {name: spec for name, spec in props.items() if name in only}
+    return {"type": "OBJECT", "properties": props, "required": list(props)}
+
+
+def array_schema(item_schema: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "ARRAY", "items": item_schema}
+
+
+def schema_fingerprint(schema: Optional[dict[str, Any]]) -> str:
+    return json.dumps(schema, sort_keys=True) if schema else ""
+
+
+def validate_into(cls: type[T], data: Any) -> tuple[Optional[T], list[str]]:
+    """
+    Converte `data` no dataclass. Retorna (objeto, []) ou (None, campos inválidos).
+    Strings são aparadas; listas viram list[str] sem itens vazios; int aceita "30".
+    """
+    if not isinstance(data, dict):
+        data = {}
+
+    values: dict[str, Any] = {}
+    invalid: list[str] = []
+    known: set[str] = set()
+
+    for f in fields(cls):
+        known.add(f.name)
+        kind = str(f.type)
+        if kind not in _SCHEMA_TYPES:
+            continue
+        required = f.default is MISSING and f.default_factory is MISSING
+        raw = data.get(f.name)
+        value = _coerce(kind, raw)
+
+        if value is None or (required and value in ("", [], 0)):
+            if required:
+                invalid.append(f.name)
+            continue
+        values[f.name] = value
+
+    if invalid:
+        return None, invalid
+
+    if "extra" in known:
+        values["extra"] = {k: v for k, v in data.items() if k not in known}
+    return cls(**values), []
+
+
+def to_dict(obj: Any) -> dict[str, Any]:
+    """Dataclass → dict no formato antigo dos métodos (campos extras achatados)."""
+    data = asdict(obj)
+    extra = data.pop("extra", None) or {}
+    return {**extra, **data}
+
+
+def _coerce(kind: str, raw: Any) -> Any:
+    if raw is None:
+        return None
+    if kind == "str":
+        return raw.strip() if isinstance(raw, str) else None
+    if kind == "int":
+        try:
+            return int(raw)
+        except (TypeError, ValueError):
+            return None
+    if kind == "list[str]":
+        if not isinstance(raw, list):
+            return None
+        return [str(v).strip() for v in raw if str(v).strip()]
+    return None
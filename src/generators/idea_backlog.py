@@ -0,0 +1,289 @@
+# src/generators/idea_backlog.py
+"""
+Fila persistente (SQLite, no mesmo banco do content_history) de ideias de tópicos.
+Em vez de uma chamada ao Gemini por post só para a ideia, cada nicho é reabastecido
+em lote (IDEA_BACKLOG_REFILL_SIZE ideias numa chamada) e o pipeline consome em ordem
+de chegada (FIFO). Ideias cujo tópico já existe no content_history ou na própria fila
+são descartadas na entrada e, se o tópico for usado depois, puladas na saída.
+
+Uso (CLI):
+    python -m src.generators.idea_backlog              # reabastece nichos abaixo do mínimo
+    python -m src.generators.idea_backlog --stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from config import settings
+from database.similarity import normalize_text
+from src.generators.gemini_client import GeminiClient, GeminiConfig
+
+logger = logging.getLogger("eduflow.idea_backlog")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idea_backlog (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    niche TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    topic_key TEXT NOT NULL UNIQUE,       -- tópico normalizado (dedupe)
+    idea_json TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending', -- pending|used|skipped
+    created_at REAL NOT NULL,
+    consumed_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_idea_backlog_niche_status ON idea_backlog(niche, status, id);
+"""
+
+# Quantos tópicos já usados vão no prompt de refill (para o modelo não repetir)
+_AVOID_IN_PROMPT = 40
+
+
+def topic_key(text: str) -> str:
+    """Tópico normalizado (mesma normalização do índice de similaridade)."""
+    return normalize_text(text)
+
+
+class IdeaBacklog:
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        llm: Optional[GeminiClient] = None,
+        refill_size: Optional[int] = None,
+        min_pending: Optional[int] = None,
+    ) -> None:
+        self.db_path = Path(db_path or settings.DB_PATH)
+        self.refill_size = max(1, refill_size or settings.IDEA_BACKLOG_REFILL_SIZE)
+        self.min_pending = max(1, min_pending or settings.IDEA_BACKLOG_MIN_PENDING)
+        self._llm = llm
+
+        self._running = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @property
+    def llm(self) -> GeminiClient:
+        # Criado só no primeiro refill; lote de ideias precisa de mais tokens de saída que um post
+        if self._llm is None:
+            self._llm = GeminiClient(
+                GeminiConfig(
+                    api_key=settings.GEMINI_API_KEY,
+                    model_name=settings.GEMINI_MODEL,
+                    max_output_tokens=settings.IDEA_BACKLOG_MAX_OUTPUT_TOKENS,
+                )
+            )
+        return self._llm
+
+    # -----------------------
+    # Consulta
+    # -----------------------
+    def pending(self, niche: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM idea_backlog WHERE niche = ? AND status = 'pending'", (niche,)
+            ).fetchone()
+        return int(row[0])
+
+    def stats(self) -> dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM idea_backlog GROUP BY status").fetchall()
+        counts = {"pending": 0, "used": 0, "skipped": 0}
+        counts.update({status: int(n) for status, n in rows})
+        return counts
+
+    def _used_keys(self, conn: sqlite3.Connection) -> set[str]:
+        """Tópicos já gerados (content_history); vazio se o banco ainda não foi inicializado."""
+        try:
+            rows = conn.execute("SELECT topic FROM content_history").fetchall()
+        except sqlite3.OperationalError:
+            return set()
+        return {topic_key(r[0]) for r in rows}
+
+    def _recent_topics(self, conn: sqlite3.Connection, niche: str) -> list[str]:
+        rows = conn.execute(
+            "SELECT topic FROM idea_backlog WHERE niche = ? ORDER BY id DESC LIMIT ?",
+            (niche, _AVOID_IN_PROMPT),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    # -----------------------
+    # Reabastecimento
+    # -----------------------
+    def refill(self, niche: str, count: Optional[int] = None) -> int:
+        """Gera `count` ideias numa chamada ao Gemini e enfileira as inéditas. Retorna quantas entraram."""
+        count = count or self.refill_size
+        with self._connect() as conn:
+            avoid = self._recent_topics(conn, niche)
+
+        logger.info("💡 Gerando %d ideias para o backlog (%s)...", count, niche)
+        ideas = self.llm.generate_topic_ideas(niche=niche, count=count, avoid=avoid)
+        return self.add(niche, ideas)
+
+    def add(self, niche: str, ideas: Iterable[dict[str, Any]]) -> int:
+        """Enfileira ideias, descartando tópicos já usados ou já na fila."""
+        now = time.time()
+        added = 0
+        with self._connect() as conn:
+            used = self._used_keys(conn)
+            for idea in ideas:
+                topic = str(idea.get("topic") or "").strip()
+                key = topic_key(topic)
+                if not key or key in used:
+                    continue
+                cur = conn.execute(
+                    """
+                    INSERT OR IGNORE INTO idea_backlog (niche, topic, topic_key, idea_json, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (niche, topic, key, json.dumps(idea, ensure_ascii=False), now),
+                )
+                added += cur.rowcount
+            conn.commit()
+
+        logger.info("💡 Backlog '%s': +%d ideias", niche, added)
+        return added
+
+    def refill_low(self, niches: Iterable[str]) -> dict[str, int]:
+        """Reabastece os nichos com menos de `min_pending` ideias na fila."""
+        filled: dict[str, int] = {}
+        for niche in niches:
+            if self.pending(niche) >= self.min_pending:
+                continue
+            try:
+                filled[niche] = self.refill(niche)
+            except Exception as exc:
+                logger.warning("⚠️ Falha ao reabastecer ideias de '%s': %s", niche, exc)
+        return filled
+
+    def refill_in_background(self, niches: Iterable[str]) -> bool:
+        """
+        Dispara refill_low numa thread daemon (para o scheduler não bloquear).
+        Retorna False se já existe um refill em andamento.
+        """
+        if not self._running.acquire(blocking=False):
+            return False
+        niches = list(niches)
+
+        def _worker() -> None:
+            try:
+                self.refill_low(niches)
+            except Exception as exc:
+                logger.exception("Falha no refill do backlog de ideias: %s", exc)
+            finally:
+                self._running.release()
+
+        threading.Thread(target=_worker, name="idea-backlog", daemon=True).start()
+        return True
+
+    # -----------------------
+    # Consumo
+    # -----------------------
+    def pop(self, niche: str) -> Optional[dict[str, Any]]:
+        """
+        Retira a ideia mais antiga do nicho (pula as que viraram post nesse meio-tempo).
+        A ideia volta com "backlog_id", para mark_skipped se o pipeline a rejeitar
+        ou release se ele falhar antes de gerar o post.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            # IMMEDIATE: dois processos não pegam a mesma ideia
+            conn.execute("BEGIN IMMEDIATE")
+            used = self._used_keys(conn)
+            rows = conn.execute(
+                "SELECT id, topic_key, idea_json FROM idea_backlog WHERE niche = ? AND status = 'pending' ORDER BY id",
+                (niche,),
+            ).fetchall()
+
+            idea: Optional[dict[str, Any]] = None
+            for idea_id, key, idea_json in rows:
+                if key in used:
+                    conn.execute(
+                        "UPDATE idea_backlog SET status = 'skipped', consumed_at = ? WHERE id = ?", (now, idea_id)
+                    )
+                    continue
+                conn.execute("UPDATE idea_backlog SET status = 'used', consumed_at = ? WHERE id = ?", (now, idea_id))
+                idea = {**json.loads(idea_json), "backlog_id": idea_id}
+                break
+            conn.commit()
+        return idea
+
+    def mark_skipped(self, idea_id: int) -> None:
+        """Ideia retirada mas descartada pelo pipeline (ex.: quase duplicada): não conta como usada."""
+        with self._connect() as conn:
+            conn.execute("UPDATE idea_backlog SET status = 'skipped' WHERE id = ? AND status = 'used'", (idea_id,))
+            conn.commit()
+
+    def release(self, idea_id: int) -> None:
+        """Devolve à fila uma ideia retirada cujo post falhou (LLM, Pexels, render, banco)."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE idea_backlog SET status = 'pending', consumed_at = NULL WHERE id = ? AND status = 'used'",
+                (idea_id,),
+            )
+            conn.commit()
+
+    def take(self, niche: str) -> dict[str, Any]:
+        """pop; com a fila vazia, reabastece na hora (uma chamada) e tenta de novo."""
+        idea = self.pop(niche)
+        if idea is None:
+            self.refill(niche)
+            idea = self.pop(niche)
+        if idea is None:
+            raise RuntimeError(f"Backlog de ideias vazio para '{niche}'")
+        return idea
+
+    async def take_async(self, niche: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.take, niche)
+
+
+# Instância única por processo (o scheduler e o pipeline compartilham a fila)
+_BACKLOG: Optional[IdeaBacklog] = None
+_BACKLOG_LOCK = threading.Lock()
+
+
+def shared_idea_backlog() -> IdeaBacklog:
+    global _BACKLOG
+    with _BACKLOG_LOCK:
+        if _BACKLOG is None:
+            _BACKLOG = IdeaBacklog()
+        return _BACKLOG
+
+
+def main() -> None:
+    from config.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Backlog de ideias de tópicos")
+    parser.add_argument("--stats", action="store_true", help="Só mostra a contagem da fila")
+    args = parser.parse_args()
+
+    setup_logging(level="INFO")
+    settings.ensure_directories()
+
+    # Import tardio: scheduler importa main_html (Playwright etc.)
+    from scheduler import NICHOS
+
+    backlog = IdeaBacklog()
+    if not args.stats:
+        backlog.refill_low(NICHOS)
+    for niche in NICHOS:
+        print(f"{backlog.pending(niche):4d}  {niche}")
+    print(backlog.stats())
+
+
+if __name__ == "__main__":
+    main()
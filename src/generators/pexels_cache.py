@@ -0,0 +1,161 @@
+# src/generators/pexels_cache.py
+"""
+Cache persistente (SQLite) das buscas no Pexels.
+Chave: (query, orientation, per_page, page). Entradas frescas são servidas direto;
+entradas vencidas mas dentro da janela "stale" são servidas na hora e revalidadas
+em background (stale-while-revalidate).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from config import settings
+
+logger = logging.getLogger("eduflow.pexels_cache")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pexels_search_cache (
+    query TEXT NOT NULL,
+    orientation TEXT NOT NULL,
+    per_page INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    photos_json TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (query, orientation, per_page, page)
+);
+"""
+
+SearchKey = tuple[str, str, int, int]
+
+
+class PexelsSearchCache:
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: Optional[float] = None,
+        stale_seconds: Optional[float] = None,
+    ) -> None:
+        self.db_path = Path(db_path or settings.PEXELS_CACHE_DB)
+        self.ttl_seconds = settings.PEXELS_SEARCH_TTL_HOURS * 3600 if ttl_seconds is None else ttl_seconds
+        self.stale_seconds = settings.PEXELS_SEARCH_STALE_HOURS * 3600 if stale_seconds is None else stale_seconds
+
+        self._revalidating: set[SearchKey] = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def make_key(query: str, orientation: str, per_page: int, page: int) -> SearchKey:
+        return (query.strip().lower(), orientation, int(per_page), int(page))
+
+    # -----------------------
+    # Leitura / escrita
+    # -----------------------
+    def get(self, key: SearchKey) -> Optional[tuple[list[dict[str, Any]], float]]:
+        """Retorna (photos, idade em segundos) ou None."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT photos_json, fetched_at FROM pexels_search_cache
+                    WHERE query = ? AND orientation = ? AND per_page = ? AND page = ?
+                    """,
+                    key,
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao ler cache de busca: %s", exc)
+            return None
+
+        if not row:
+            return None
+        try:
+            photos = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        return photos, time.time() - float(row[1])
+
+    def put(self, key: SearchKey, photos: list[dict[str, Any]]) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO pexels_search_cache
+                    (query, orientation, per_page, page, photos_json, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (*key, json.dumps(photos, ensure_ascii=False), time.time()),
+                )
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Erro ao gravar cache de busca: %s", exc)
+
+    # -----------------------
+    # Stale-while-revalidate
+    # -----------------------
+    def get_or_fetch(self, key: SearchKey, fetch: Callable[[], list[dict[str, Any]]]) -> list[dict[str, Any]]:
+        """
+        - fresco (idade < TTL): devolve do cache
+        - vencido mas < TTL + janela stale: devolve do cache e revalida em background
+        - ausente/velho demais: busca na API (se falhar e houver cópia velha, usa a cópia)
+        """
+        cached = self.get(key)
+
+        if cached is not None:
+            photos, age = cached
+            if age < self.ttl_seconds:
+                self.hits += 1
+                return photos
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._revalidate_async(key, fetch)
+                return photos
+
+        self.misses += 1
+        try:
+            photos = fetch()
+        except Exception:
+            if cached is not None:
+                logger.warning("Pexels indisponível, usando busca em cache vencida: %s", key[0])
+                return cached[0]
+            raise
+
+        self.put(key, photos)
+        return photos
+
+    def _revalidate_async(self, key: SearchKey, fetch: Callable[[], list[dict[str, Any]]]) -> None:
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def _worker() -> None:
+            try:
+                self.put(key, fetch())
+                logger.info("Pexels: busca revalidada em background (%s)", key[0])
+            except Exception as exc:
+                logger.warning("Falha ao revalidar busca '%s': %s", key[0], exc)
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=_worker, name="pexels-revalidate", daemon=True).start()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
@@ -1,25 +1,97 @@
 # src/generators/pexels_client.py
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+import os
 import random
+import re
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
+from urllib.parse import urlencode
 
 import requests
+from PIL import Image
 from requests import Response
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from urllib3.util.retry import Retry
 
 from config import settings
+from src.generators.background_index import BackgroundIndex
+from src.generators.pexels_cache import PexelsSearchCache
+from src.generators.pexels_ratelimit import PexelsRateLimiter, shared_rate_limiter
 
 logger = logging.getLogger("eduflow.pexels")
 
+# Downloads por busca antes de aceitar uma foto repetida (cada quase-duplicata baixada custa banda)
+_MAX_DOWNLOADS = 3
+
 
 class PexelsError(RuntimeError):
     pass
 
 
+# Sessão HTTP única por processo: todas as buscas e downloads reaproveitam conexões TLS
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session(pool_size: int, retries: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def shared_session() -> requests.Session:
+    """Sessão compartilhada (criada na primeira chamada)."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _build_session(settings.PEXELS_POOL_SIZE, settings.PEXELS_HTTP_RETRIES)
+        return _SESSION
+
+
+def http_stats(session: Optional[requests.Session] = None) -> dict[str, int]:
+    """
+    Contadores de reaproveitamento de conexão (somados entre os pools do urllib3).
+    reused = requisições que não precisaram abrir conexão TCP/TLS nova.
+    """
+    session = session or _SESSION
+    requests_total = 0
+    connections = 0
+    if session is not None:
+        # O mesmo adapter é montado em http:// e https:// → conta uma vez só
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                requests_total += getattr(pool, "num_requests", 0)
+                connections += getattr(pool, "num_connections", 0)
+    return {
+        "requests": requests_total,
+        "connections": connections,
+        "reused": max(0, requests_total - connections),
+    }
+
+
 @dataclass(frozen=True)
 class PexelsPhoto:
     id: int
@@ -33,26 +105,64 @@ class PexelsPhoto:
 class PexelsClient:
     BASE_URL = "https://api.pexels.com/v1"
 
-    def __init__(self, api_key: Optional[str] = None, download_dir: Optional[Path] = None) -> None:
+    # Caixa (w, h) de cada rendition fixa do Pexels e se ela é recortada (fit=crop)
+    RENDITIONS: dict[str, tuple[int, int, bool]] = {
+        "large2x": (1880, 1300, False),
+        "large": (940, 650, False),
+        "portrait": (800, 1200, True),
+        "landscape": (1200, 627, True),
+    }
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        download_dir: Optional[Path] = None,
+        max_dimension: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+        search_cache: Optional[PexelsSearchCache] = None,
+        use_search_cache: bool = True,
+        rate_limiter: Optional[PexelsRateLimiter] = None,
+        background_index: Optional[BackgroundIndex] = None,
+    ) -> None:
         settings.ensure_directories()
         self.api_key = (api_key or settings.PEXELS_API_KEY or "").strip()
         self.download_dir = download_dir or settings.BACKGROUNDS_DIR
+        self.max_dimension = settings.PEXELS_MAX_DIMENSION if max_dimension is None else max_dimension
+        self.session = session or shared_session()
+        self.search_cache = (search_cache or PexelsSearchCache()) if use_search_cache else None
+        self.rate_limiter = rate_limiter or shared_rate_limiter()
+        self.warm_dir = settings.PEXELS_WARM_DIR
+        self.background_index = background_index or BackgroundIndex(self.download_dir)
 
         if not self.api_key:
             logger.warning("PEXELS_API_KEY vazio. PexelsClient não conseguirá baixar imagens.")
 
-    def get_background_for_query(self, query: str) -> Optional[Path]:
+    def get_background_for_query(self, query: str, target_size: Optional[tuple[int, int]] = None) -> Optional[Path]:
         """
         Busca no Pexels uma foto vertical e faz cache em assets/raw/backgrounds.
         Retorna o caminho do arquivo baixado (ou existente no cache).
+
+        Args:
+            query: Termo de busca
+            target_size: Tamanho final em pixels (w, h) onde a foto será usada em modo
+                "cover". Baixa a menor versão que ainda cobre esse tamanho
+                (padrão: settings.POST_SIZE).
         """
-        if not self.api_key:
-            return None
+        target = target_size or settings.POST_SIZE
 
         query = (query or "").strip()
         if not query:
             query = "education students laptop"
 
+        # Pool quente (BackgroundWarmer): foto já baixada, sem busca nem download
+        warm = self.take_warm_background(query, target)
+        if warm:
+            self.background_index.record(warm, query=query, used=True)
+            return warm
+
+        if not self.api_key:
+            return None
+
         try:
             photos = self.search_photos(query=query, per_page=20, orientation="portrait")
         except Exception as e:
@@ -63,39 +173,193 @@ class PexelsClient:
             logger.warning("Pexels: nenhuma foto encontrada para query='%s'", query)
             return None
 
-        chosen = self._choose_best(photos)
-        if not chosen:
-            return None
+        # Candidatos em ordem de preferência: foto que repete uma cena usada há pouco
+        # (mesmo arquivo, alias ou quase duplicata baixada) passa a vez para a próxima
+        recent = self.background_index.recent_hashes()
+        fallback: Optional[Path] = None
+        downloads = 0
+        for photo in self._candidates(photos):
+            try:
+                path, downloaded = self._resolve_photo(photo, query, target, can_download=downloads < _MAX_DOWNLOADS)
+            except Exception as e:
+                logger.exception("Falha ao baixar imagem Pexels: %s", e)
+                break
+            downloads += downloaded
+            if path is None:
+                continue
+            if self.background_index.looks_recent(path, recent):
+                logger.info("Pexels: id=%s repete %s (usada há pouco), tentando a próxima", photo.id, path.name)
+                fallback = fallback or path
+                continue
+            return self._use(path)
 
-        cached = self._cache_path(chosen.id)
-        if cached.exists():
-            logger.info("Pexels cache hit: %s", cached)
-            return cached
+        if fallback:
+            logger.info("Pexels: nenhuma candidata sem repetição, usando %s", fallback.name)
+            return self._use(fallback)
+        return None
+
+    def _use(self, path: Path) -> Path:
+        self.background_index.mark_used(path)
+        return path
 
-        url = self._pick_best_src(chosen.src)
+    def _resolve_photo(
+        self, photo: PexelsPhoto, query: str, target: tuple[int, int], can_download: bool
+    ) -> tuple[Optional[Path], bool]:
+        """
+        Arquivo local para `photo` (cache, alias ou download) e se houve download.
+        Download quase igual a um arquivo existente vira alias dele (a cópia não é guardada).
+        """
+        cached = self._cache_path(photo.id)
+        if cached.exists() and self._covers(cached, target, native=(photo.width, photo.height)):
+            logger.info("Pexels cache hit: %s", cached)
+            self.background_index.record(cached, query=query, photo_id=photo.id, photographer=photo.photographer)
+            return cached, False
+
+        # Foto já descartada antes por ser quase igual a outro arquivo: não baixa de novo
+        alias = self.background_index.alias_for(photo.id)
+        if alias and self._covers(alias, target):
+            logger.info("Pexels: id=%s é quase igual a %s (alias)", photo.id, alias.name)
+            return alias, False
+
+        if not can_download:
+            return None, False
+        url = self._pick_best_src(photo.src, photo=photo, target=target)
         if not url:
-            logger.warning("Pexels: foto sem src válido (id=%s)", chosen.id)
-            return None
+            logger.warning("Pexels: foto sem src válido (id=%s)", photo.id)
+            return None, False
 
-        try:
-            self._download_file(url=url, dest=cached)
-            logger.info("Pexels background salvo: %s (id=%s)", cached, chosen.id)
-            return cached
-        except Exception as e:
-            logger.exception("Falha ao baixar imagem Pexels: %s", e)
-            return None
+        self._download_file(url=url, dest=cached)
+        self._normalize_file(cached)
+        self.background_index.record(cached, query=query, photo_id=photo.id, photographer=photo.photographer)
 
-    def search_photos(self, query: str, per_page: int = 15, orientation: str = "portrait") -> list[PexelsPhoto]:
-        data = self._get(
-            "/search",
-            params={
-                "query": query,
-                "per_page": max(1, min(per_page, 80)),
-                "orientation": orientation,
-            },
-        )
+        # Mesma cena já em cache (outra query/outro id): não guarda a cópia
+        dup = self.background_index.find_duplicate(cached)
+        if dup and self._covers(dup, target):
+            logger.info("Pexels: id=%s é quase igual a %s, descartando o download", photo.id, dup.name)
+            cached.unlink(missing_ok=True)
+            self.background_index.remove(cached)
+            self.background_index.add_alias(photo.id, dup)
+            return dup, True
+
+        logger.info("Pexels background salvo: %s (id=%s) | http=%s", cached, photo.id, http_stats(self.session))
+        return cached, True
+
+    # -----------------------
+    # API async (para o pipeline async do main_html)
+    # -----------------------
+    # As chamadas HTTP continuam na sessão compartilhada (keep-alive, retries, métricas),
+    # mas rodam em threads via asyncio.to_thread para não bloquear o event loop.
+    async def get_background_for_query_async(
+        self,
+        query: str,
+        target_size: Optional[tuple[int, int]] = None,
+    ) -> Optional[Path]:
+        return await asyncio.to_thread(self.get_background_for_query, query, target_size)
+
+    async def search_photos_async(
+        self,
+        query: str,
+        per_page: int = 15,
+        orientation: str = "portrait",
+        page: int = 1,
+    ) -> list[PexelsPhoto]:
+        return await asyncio.to_thread(self.search_photos, query, per_page, orientation, page)
+
+    async def download_many_async(
+        self,
+        items: Sequence[tuple[str, Path]],
+        concurrency: Optional[int] = None,
+    ) -> list[Optional[Path]]:
+        """
+        Baixa (e normaliza para max_dimension) vários arquivos em paralelo, no máximo
+        `concurrency` ao mesmo tempo (padrão: PEXELS_DOWNLOAD_CONCURRENCY).
+        Cada item é (url, destino); o resultado vem na mesma ordem, com None para falhas.
+        """
+        limit = asyncio.Semaphore(max(1, concurrency or settings.PEXELS_DOWNLOAD_CONCURRENCY))
+
+        def _fetch(url: str, dest: Path) -> None:
+            self._download_file(url, dest)
+            self._normalize_file(dest)
+
+        async def _one(url: str, dest: Path) -> Optional[Path]:
+            async with limit:
+                try:
+                    await asyncio.to_thread(_fetch, url, dest)
+                    return dest
+                except Exception as e:
+                    logger.warning("Falha ao baixar %s: %s", url, e)
+                    return None
+
+        return list(await asyncio.gather(*(_one(url, Path(dest)) for url, dest in items)))
+
+    # -----------------------
+    # Pool quente (ver src/generators/background_warmer.py)
+    # -----------------------
+    def warm_pool_dir(self, query: str) -> Path:
+        slug = re.sub(r"[^a-z0-9]+", "_", query.strip().lower()).strip("_")[:80] or "default"
+        return self.warm_dir / slug
+
+    def warm_backgrounds(self, query: str, target: Optional[tuple[int, int]] = None) -> list[Path]:
+        """
+        Fotos prontas no pool da query (mais antigas primeiro).
+        Com `target`, só as que cobrem esse tamanho (as que take_warm_background aceita).
+        """
+        pool = self.warm_pool_dir(query)
+        if not pool.exists():
+            return []
+        files = []
+        for f in pool.glob("pexels_*.jpg"):
+            try:
+                files.append((f.stat().st_mtime, f))
+            except OSError:
+                continue
+        return [f for _, f in sorted(files) if target is None or self._covers(f, target)]
+
+    def take_warm_background(self, query: str, target: tuple[int, int]) -> Optional[Path]:
+        """
+        Retira uma foto do pool quente e move para o cache normal (pexels_{id}.jpg).
+        Retorna None se o pool estiver vazio (o chamador segue o caminho busca + download).
+        """
+        for f in self.warm_backgrounds(query, target):
+            dest = self.download_dir / f.name
+            try:
+                f.replace(dest)
+            except OSError:
+                # Outro processo/thread pegou a mesma foto
+                continue
+            logger.info("Pexels pool quente: %s (query='%s')", dest.name, query)
+            return dest
+
+        # Pool com fotos, mas nenhuma do tamanho pedido: PEXELS_WARM_TARGET menor que o render?
+        if any(self.warm_pool_dir(query).glob("pexels_*.jpg")):
+            logger.warning(
+                "Pexels pool quente: nenhuma foto de '%s' cobre %dx%d (PEXELS_WARM_TARGET=%dx%d)",
+                query,
+                *target,
+                *settings.PEXELS_WARM_TARGET,
+            )
+        return None
+
+    def search_photos(
+        self,
+        query: str,
+        per_page: int = 15,
+        orientation: str = "portrait",
+        page: int = 1,
+    ) -> list[PexelsPhoto]:
+        params = {
+            "query": query,
+            "per_page": max(1, min(per_page, 80)),
+            "orientation": orientation,
+            "page": max(1, page),
+        }
+
+        if self.search_cache is not None:
+            key = PexelsSearchCache.make_key(query, orientation, params["per_page"], params["page"])
+            photos_raw = self.search_cache.get_or_fetch(key, lambda: self._fetch_search(params))
+        else:
+            photos_raw = self._fetch_search(params)
 
-        photos_raw = data.get("photos", []) if isinstance(data, dict) else []
         photos: list[PexelsPhoto] = []
 
         for p in photos_raw:
@@ -118,10 +382,29 @@ class PexelsClient:
     # -----------------------
     # Internals
     # -----------------------
+    def _fetch_search(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        data = self._get("/search", params=params)
+        photos_raw = data.get("photos", []) if isinstance(data, dict) else []
+        return [p for p in photos_raw if isinstance(p, dict)]
+
     def _cache_path(self, photo_id: int) -> Path:
         return self.download_dir / f"pexels_{photo_id}.jpg"
 
-    def _pick_best_src(self, src: dict[str, str]) -> Optional[str]:
+    def _pick_best_src(
+        self,
+        src: dict[str, str],
+        photo: Optional[PexelsPhoto] = None,
+        target: Optional[tuple[int, int]] = None,
+    ) -> Optional[str]:
+        """
+        Com `photo` e `target`: menor versão que ainda cobre target (modo cover).
+        Sem eles: maior qualidade disponível (comportamento original).
+        """
+        if photo and target and photo.width > 0 and photo.height > 0:
+            url = self._pick_sized_src(src, photo, target)
+            if url:
+                return url
+
         # prioridade de qualidade
         for key in ("original", "large2x", "large", "portrait"):
             if key in src and src[key]:
@@ -132,21 +415,84 @@ class PexelsClient:
                 return v
         return None
 
-    def _choose_best(self, photos: list[PexelsPhoto]) -> Optional[PexelsPhoto]:
+    def _pick_sized_src(self, src: dict[str, str], photo: PexelsPhoto, target: tuple[int, int]) -> Optional[str]:
+        tw, th = target
+
+        # 1) Renditions fixas que já cobrem o alvo (menor área primeiro)
+        candidates: list[tuple[float, str]] = []
+        for key, (box_w, box_h, crop) in self.RENDITIONS.items():
+            if not src.get(key):
+                continue
+            if crop:
+                rw, rh = box_w, box_h
+            else:
+                scale = min(box_w / photo.width, box_h / photo.height, 1.0)
+                rw, rh = photo.width * scale, photo.height * scale
+            if rw >= tw and rh >= th:
+                candidates.append((rw * rh, src[key]))
+        if candidates:
+            return min(candidates)[1]
+
+        # 2) Original redimensionado pelo CDN do Pexels (mesmos parâmetros das renditions),
+        #    só na largura → mantém a proporção e cobre o alvo
+        original = src.get("original")
+        if not original:
+            return None
+        scale = max(tw / photo.width, th / photo.height)
+        if scale >= 1:
+            return original
+        params = urlencode({"auto": "compress", "cs": "tinysrgb", "w": math.ceil(photo.width * scale)})
+        sep = "&" if "?" in original else "?"
+        return f"{original}{sep}{params}"
+
+    def _covers(self, path: Path, target: tuple[int, int], native: Optional[tuple[int, int]] = None) -> bool:
         """
-        Pexels retorna ordenado por relevância.
-        Primeira foto = melhor match com a query.
+        True se a imagem em cache é grande o bastante para o alvo (lê só o header).
+        `native`: tamanho original da foto no Pexels. Se ele não cobre o alvo, o arquivo no
+        tamanho original já é o máximo possível (senão a foto seria baixada de novo a cada uso).
         """
-        if not photos:
-            return None
+        try:
+            with Image.open(path) as img:
+                w, h = img.size
+        except Exception:
+            return False
+        tw, th = target
+        if native and native[0] > 0 and native[1] > 0:
+            tw, th = min(tw, native[0]), min(th, native[1])
+        # Arquivos normalizados para max_dimension contam como suficientes
+        if self.max_dimension and max(w, h) >= self.max_dimension:
+            return True
+        return w >= tw and h >= th
+
+    def _normalize_file(self, path: Path) -> None:
+        """Reencoda o arquivo baixado para no máximo `max_dimension` px (lado maior)."""
+        if not self.max_dimension:
+            return
+        try:
+            with Image.open(path) as img:
+                w, h = img.size
+                if max(w, h) <= self.max_dimension:
+                    return
+                scale = self.max_dimension / max(w, h)
+                size = (max(1, round(w * scale)), max(1, round(h * scale)))
+                img.draft("RGB", size)
+                resized = img.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+
+            tmp = path.with_suffix(".tmp")
+            resized.save(tmp, format="JPEG", quality=92, optimize=True, progressive=True)
+            tmp.replace(path)
+            logger.info("Pexels: %s normalizado para %dx%d", path.name, *size)
+        except Exception as e:
+            logger.warning("Falha ao normalizar %s: %s", path, e)
 
-        # Filtra por tamanho adequado
+    def _candidates(self, photos: list[PexelsPhoto]) -> list[PexelsPhoto]:
+        """
+        Pexels retorna ordenado por relevância.
+        Fotos de tamanho adequado primeiro (na ordem de relevância), depois as demais.
+        """
         good = [p for p in photos if p.width >= 1200 and p.height >= 1600]
-        if good:
-            return good[0]  # ✅ PRIMEIRA (mais relevante)
+        return good + [p for p in photos if p not in good]
 
-        # Fallback: primeira mesmo assim
-        return photos[0]
     @retry(
         reraise=True,
         stop=stop_after_attempt(3),
@@ -160,7 +506,12 @@ class PexelsClient:
         url = f"{self.BASE_URL}{path}"
         headers = {"Authorization": self.api_key}
 
-        resp = requests.get(url, headers=headers, params=params, timeout=30)
+        # Espera a vez no limitador (compartilhado por todos os workers) antes de gastar cota
+        self.rate_limiter.acquire()
+        resp = self.session.get(url, headers=headers, params=params, timeout=30)
+        self.rate_limiter.update(resp.headers)
+        if resp.status_code == 429:
+            self.rate_limiter.penalize(resp.headers.get("Retry-After"))
         self._raise_for_status(resp)
 
         data = resp.json()
@@ -178,14 +529,18 @@ class PexelsClient:
         dest.parent.mkdir(parents=True, exist_ok=True)
 
         headers = {"Authorization": self.api_key}
-        with requests.get(url, headers=headers, stream=True, timeout=60) as r:
+        with self.session.get(url, headers=headers, stream=True, timeout=60) as r:
             self._raise_for_status(r)
-            tmp = dest.with_suffix(".tmp")
-            with open(tmp, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 256):
-                    if chunk:
-                        f.write(chunk)
-            tmp.replace(dest)
+            # tmp único por thread: downloads paralelos nunca escrevem no mesmo arquivo
+            tmp = dest.with_name(f"{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=1024 * 256):
+                        if chunk:
+                            f.write(chunk)
+                tmp.replace(dest)
+            finally:
+                tmp.unlink(missing_ok=True)
 
     def _raise_for_status(self, resp: Response) -> None:
         if resp.status_code == 429:
@@ -0,0 +1,236 @@
+# src/generators/pexels_ratelimit.py
+"""
+Limitador de requisições da API do Pexels (token bucket).
+- Ritmo base: PEXELS_RATE_PER_HOUR com rajadas de até PEXELS_RATE_BURST.
+- Lê X-Ratelimit-Limit/Remaining/Reset das respostas: quando a cota restante fica
+  menor que uma hora de ritmo base, espalha o que sobrou até o reset; cota zerada
+  bloqueia até o reset.
+- Um 429 bloqueia todos os workers pelo Retry-After (ou até o reset).
+- Opcional: estado compartilhado entre processos num arquivo JSON (com flock).
+
+Só as chamadas à API contam na cota; downloads do CDN (images.pexels.com) não passam aqui.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, Mapping, Optional
+
+from config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: estado só dentro do processo
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("eduflow.pexels_ratelimit")
+
+
+class RateLimitExceeded(RuntimeError):
+    """A próxima vaga está mais longe que o tempo máximo de espera."""
+
+
+@dataclass
+class _BucketState:
+    tokens: float
+    # Momento a partir do qual os tokens voltam a encher (no futuro = bloqueado)
+    updated: float
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None
+
+
+class PexelsRateLimiter:
+    def __init__(
+        self,
+        rate_per_hour: Optional[float] = None,
+        burst: Optional[int] = None,
+        state_file: Optional[Path] = None,
+        max_wait: Optional[float] = None,
+    ) -> None:
+        per_hour = settings.PEXELS_RATE_PER_HOUR if rate_per_hour is None else rate_per_hour
+        self.rate_per_hour = max(1e-6, float(per_hour))
+        self.base_rate = self.rate_per_hour / 3600.0
+        self.capacity = float(max(1, burst or settings.PEXELS_RATE_BURST))
+        self.max_wait = settings.PEXELS_RATE_MAX_WAIT_SECONDS if max_wait is None else max_wait
+
+        if state_file is None and settings.PEXELS_RATE_STATE_FILE:
+            state_file = Path(settings.PEXELS_RATE_STATE_FILE)
+        self.state_file = state_file if (state_file and fcntl is not None) else None
+        if state_file and fcntl is None:
+            logger.warning("fcntl indisponível: limite do Pexels compartilhado só dentro do processo")
+
+        self._state = _BucketState(tokens=self.capacity, updated=time.time())
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self.throttled = 0
+
+    # -----------------------
+    # API pública
+    # -----------------------
+    def acquire(self) -> float:
+        """
+        Reserva uma vaga e dorme até ela chegar. Retorna os segundos esperados.
+        Levanta RateLimitExceeded (sem consumir a vaga) se a espera passar de max_wait.
+        """
+        with self._locked_state() as st:
+            now = time.time()
+            wait = self._reserve(st, now)
+            exceeded = wait > self.max_wait
+            if exceeded:
+                # Devolve a reserva (o estado é gravado mesmo assim)
+                st.tokens += 1
+                if st.remaining is not None:
+                    st.remaining += 1
+            else:
+                self.requests += 1
+                if wait > 0:
+                    self.waits += 1
+                    self.waited_seconds += wait
+
+        if exceeded:
+            raise RateLimitExceeded(f"Cota do Pexels: próxima vaga em {wait:.0f}s")
+        if wait > 0:
+            logger.info("⏳ Pexels: aguardando %.1fs pelo limite de requisições", wait)
+            time.sleep(wait)
+        return wait
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Atualiza a cota a partir dos headers X-Ratelimit-* de uma resposta."""
+        limit = _int_header(headers, "X-Ratelimit-Limit")
+        remaining = _int_header(headers, "X-Ratelimit-Remaining")
+        reset_at = _int_header(headers, "X-Ratelimit-Reset")
+        if limit is None and remaining is None and reset_at is None:
+            return
+
+        with self._locked_state() as st:
+            if limit is not None:
+                st.limit = limit
+            if remaining is not None:
+                st.remaining = remaining
+            if reset_at is not None:
+                st.reset_at = float(reset_at)
+
+            now = time.time()
+            if st.remaining is not None and st.remaining <= 0 and st.reset_at and st.reset_at > now:
+                self._block(st, st.reset_at)
+
+    def penalize(self, retry_after: Optional[str] = None) -> None:
+        """Recebeu 429: bloqueia todos os workers até Retry-After (ou o reset da cota)."""
+        now = time.time()
+        with self._locked_state() as st:
+            self.throttled += 1
+            try:
+                until = now + float(retry_after) if retry_after else 0.0
+            except ValueError:
+                until = 0.0
+            if not until:
+                until = st.reset_at if st.reset_at and st.reset_at > now else now + 60
+            self._block(st, until)
+        logger.warning("🚦 Pexels 429: requisições pausadas por %.0fs", until - now)
+
+    def stats(self) -> dict[str, object]:
+        """Cota restante e contadores de espera (para logs/health check)."""
+        with self._locked_state() as st:
+            now = time.time()
+            return {
+                "limit": st.limit,
+                "remaining": st.remaining,
+                "reset_in": round(st.reset_at - now) if st.reset_at else None,
+                "tokens": round(st.tokens, 2),
+                "requests": self.requests,
+                "waits": self.waits,
+                "waited_seconds": round(self.waited_seconds, 1),
+                "throttled": self.throttled,
+            }
+
+    # -----------------------
+    # Internals
+    # -----------------------
+    def _rate(self, st: _BucketState, now: float) -> float:
+        """Ritmo base; com menos de uma hora de cota, divide o restante até o reset."""
+        if st.remaining is None or not st.reset_at or st.reset_at <= now:
+            return self.base_rate
+        if st.remaining >= self.rate_per_hour:
+            return self.base_rate
+        return min(self.base_rate, max(st.remaining, 1) / (st.reset_at - now))
+
+    def _reserve(self, st: _BucketState, now: float) -> float:
+        rate = self._rate(st, now)
+        if now > st.updated:
+            st.tokens = min(self.capacity, st.tokens + (now - st.updated) * rate)
+            st.updated = now
+
+        st.tokens -= 1
+        if st.remaining is not None:
+            st.remaining = max(0, st.remaining - 1)
+
+        wait = max(0.0, st.updated - now)
+        if st.tokens < 0:
+            wait += -st.tokens / rate
+        return wait
+
+    @staticmethod
+    def _block(st: _BucketState, until: float) -> None:
+        st.tokens = min(st.tokens, 0.0)
+        st.updated = max(st.updated, until)
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[_BucketState]:
+        with self._lock:
+            if self.state_file is None:
+                yield self._state
+                return
+
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), "r+", encoding="utf-8") as f:
+                    raw = f.read()
+                    if raw.strip():
+                        try:
+                            self._state = _BucketState(**json.loads(raw))
+                        except (ValueError, TypeError):
+                            logger.warning("Estado de rate limit inválido, recomeçando: %s", self.state_file)
+
+                    yield self._state
+
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(asdict(self._state), f)
+            finally:
+                os.close(fd)  # libera o flock
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# Instância única por processo (todas as instâncias de PexelsClient dividem a cota)
+_LIMITER: Optional[PexelsRateLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def shared_rate_limiter() -> PexelsRateLimiter:
+    global _LIMITER
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            _LIMITER = PexelsRateLimiter()
+        return _LIMITER
@@ -0,0 +1,108 @@
+# src/processors/asset_cache.py
+"""
+Cache em memória de data URIs (base64) para assets locais.
+Chave: (caminho, mtime, tamanho) → o mesmo arquivo só é codificado uma vez por processo.
+Usado pelo HtmlRenderer com inline_assets=True (o modo padrão serve file:// por rota).
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import mimetypes
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from config import settings
+
+logger = logging.getLogger("eduflow.asset_cache")
+
+
+CacheKey = tuple[str, int, int]
+
+
+class DataUriCache:
+    """
+    LRU com orçamento em bytes (tamanho das strings data URI).
+    Thread-safe: pode ser usado pelo pipeline async e pelos helpers síncronos.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[CacheKey, str] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: Path) -> str:
+        """
+        Retorna o data URI do arquivo (codifica e guarda em caso de miss).
+        Propaga OSError se o arquivo não puder ser lido.
+        """
+        resolved = Path(path).resolve()
+        st = resolved.stat()
+        key: CacheKey = (str(resolved), st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        mime, _ = mimetypes.guess_type(resolved.name)
+        b64 = base64.b64encode(resolved.read_bytes()).decode("utf-8")
+        data_uri = f"data:{mime or 'application/octet-stream'};base64,{b64}"
+
+        self._store(key, data_uri)
+        return data_uri
+
+    def _store(self, key: CacheKey, data_uri: str) -> None:
+        size = len(data_uri)
+        if size > self.max_bytes:
+            # Maior que o orçamento inteiro: não vale a pena guardar
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+
+            # Versões antigas do mesmo arquivo (mtime/tamanho diferentes) nunca mais serão usadas
+            stale = [k for k in self._entries if k[0] == key[0]]
+            for k in stale:
+                self._bytes -= len(self._entries.pop(k))
+
+            self._entries[key] = data_uri
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Contadores para monitoramento (logs/health check)."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Instância compartilhada pelo processo (html_renderer + main_html)
+data_uri_cache = DataUriCache(max_bytes=settings.DATA_URI_CACHE_MAX_BYTES)
@@ -0,0 +1,258 @@
+# src/processors/asset_gc.py
+"""
+Coleta de lixo com orçamento em bytes para assets/raw/backgrounds e assets/processed.
+- Backgrounds: o total e a ordem LRU vêm do BackgroundIndex (sem varrer a pasta).
+- Processed: um registro próprio (SQLite) é alimentado incrementalmente a partir de
+  content_history (cursor por id); só artes com status 'published' são apagadas,
+  das mais antigas para as mais novas.
+Cada execução faz no máximo `max_deletions` remoções, então pode rodar no scheduler.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+from src.generators.background_index import BackgroundIndex
+
+logger = logging.getLogger("eduflow.asset_gc")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed_assets (
+    path TEXT PRIMARY KEY,
+    content_hash TEXT,
+    bytes INTEGER NOT NULL,
+    created_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_processed_assets_created_at ON processed_assets(created_at);
+
+CREATE TABLE IF NOT EXISTS gc_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_BATCH = 100
+
+
+@dataclass
+class GCReport:
+    backgrounds_deleted: int = 0
+    backgrounds_freed: int = 0
+    backgrounds_bytes: int = 0
+    processed_deleted: int = 0
+    processed_freed: int = 0
+    processed_bytes: int = 0
+
+
+class AssetGC:
+    def __init__(
+        self,
+        backgrounds_max_bytes: Optional[int] = None,
+        processed_max_bytes: Optional[int] = None,
+        max_deletions: Optional[int] = None,
+        index: Optional[BackgroundIndex] = None,
+        processed_dir: Optional[Path] = None,
+        content_db: Optional[Path] = None,
+        db_path: Optional[Path] = None,
+    ) -> None:
+        self.backgrounds_max_bytes = (
+            settings.BACKGROUNDS_MAX_BYTES if backgrounds_max_bytes is None else backgrounds_max_bytes
+        )
+        self.processed_max_bytes = settings.PROCESSED_MAX_BYTES if processed_max_bytes is None else processed_max_bytes
+        self.max_deletions = max(1, max_deletions or settings.ASSET_GC_MAX_DELETIONS)
+        self.index = index or BackgroundIndex(settings.BACKGROUNDS_DIR)
+        self.processed_dir = Path(processed_dir or settings.PROCESSED_DIR).resolve()
+        self.content_db = Path(content_db or settings.DB_PATH)
+        self.db_path = Path(db_path or settings.ASSET_GC_DB)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    # -----------------------
+    # Execução
+    # -----------------------
+    def run(self, full: bool = False) -> GCReport:
+        """
+        Uma passada incremental. `full=True` (CLI) antes reconcilia o índice de
+        backgrounds e o registro de processed com o disco e remove backgrounds
+        quase duplicados.
+        """
+        if full:
+            self.index.sync()
+            self.index.dedupe()
+            self._drop_missing_processed()
+
+        report = GCReport()
+        budget = self.max_deletions
+
+        deleted, freed = self._collect_backgrounds(budget)
+        report.backgrounds_deleted, report.backgrounds_freed = deleted, freed
+        budget -= deleted
+
+        self._ingest_processed()
+        if budget > 0:
+            report.processed_deleted, report.processed_freed = self._collect_processed(budget)
+
+        report.backgrounds_bytes = self.index.total_bytes()
+        report.processed_bytes = self._processed_bytes()
+
+        if report.backgrounds_deleted or report.processed_deleted:
+            logger.info(
+                "🧹 GC: %d backgrounds (%.1f MB) + %d artes publicadas (%.1f MB) removidos",
+                report.backgrounds_deleted,
+                report.backgrounds_freed / 1e6,
+                report.processed_deleted,
+                report.processed_freed / 1e6,
+            )
+        return report
+
+    # -----------------------
+    # Backgrounds
+    # -----------------------
+    def _collect_backgrounds(self, budget: int) -> tuple[int, int]:
+        total = self.index.total_bytes()
+        deleted = freed = 0
+
+        while total > self.backgrounds_max_bytes and deleted < budget:
+            batch = self.index.least_recently_used(min(_BATCH, budget - deleted))
+            if not batch:
+                break
+            for path, size in batch:
+                if total <= self.backgrounds_max_bytes or deleted >= budget:
+                    break
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as exc:
+                    logger.warning("GC: não consegui apagar %s: %s", path.name, exc)
+                    continue
+                self.index.remove(path)
+                total -= size
+                freed += size
+                deleted += 1
+        return deleted, freed
+
+    # -----------------------
+    # Processed (artes geradas)
+    # -----------------------
+    def _ingest_processed(self) -> None:
+        """Registra as artes novas de content_history (id > cursor)."""
+        cursor = self._get_state("content_history_last_id")
+        try:
+            with sqlite3.connect(self.content_db, timeout=10) as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, asset_path, content_hash, created_at FROM content_history
+                    WHERE id > ? ORDER BY id
+                    """,
+                    (cursor,),
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("GC: content_history indisponível: %s", exc)
+            return
+        if not rows:
+            return
+
+        entries = []
+        for _, asset_path, content_hash, created_at in rows:
+            if not asset_path:
+                continue
+            path = Path(asset_path).resolve()
+            if path.parent != self.processed_dir:
+                continue
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            entries.append((str(path), content_hash, size, created_at))
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO processed_assets (path, content_hash, bytes, created_at) VALUES (?, ?, ?, ?)",
+                entries,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO gc_state (key, value) VALUES ('content_history_last_id', ?)",
+                (int(rows[-1][0]),),
+            )
+            conn.commit()
+
+    def _collect_processed(self, budget: int) -> tuple[int, int]:
+        total = self._processed_bytes()
+        deleted = freed = 0
+        offset = 0  # artes ainda não publicadas ficam para trás e são puladas
+
+        while total > self.processed_max_bytes and deleted < budget:
+            with self._connect() as conn:
+                batch = conn.execute(
+                    "SELECT path, content_hash, bytes FROM processed_assets ORDER BY created_at LIMIT ? OFFSET ?",
+                    (_BATCH, offset),
+                ).fetchall()
+            if not batch:
+                logger.warning("GC: assets/processed acima do orçamento, mas sem artes publicadas para remover")
+                break
+
+            published = self._published_hashes([h for _, h, _ in batch if h])
+            for raw, content_hash, size in batch:
+                if total <= self.processed_max_bytes or deleted >= budget:
+                    break
+                if content_hash not in published:
+                    offset += 1
+                    continue
+                try:
+                    Path(raw).unlink(missing_ok=True)
+                except OSError as exc:
+                    logger.warning("GC: não consegui apagar %s: %s", raw, exc)
+                    offset += 1
+                    continue
+                self._forget_processed(raw)
+                total -= size
+                freed += size
+                deleted += 1
+        return deleted, freed
+
+    def _published_hashes(self, hashes: list[str]) -> set[str]:
+        if not hashes:
+            return set()
+        marks = ",".join("?" * len(hashes))
+        try:
+            with sqlite3.connect(self.content_db, timeout=10) as conn:
+                rows = conn.execute(
+                    f"SELECT content_hash FROM content_history WHERE status = 'published' AND content_hash IN ({marks})",
+                    hashes,
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("GC: content_history indisponível: %s", exc)
+            return set()
+        return {row[0] for row in rows}
+
+    def _drop_missing_processed(self) -> None:
+        with self._connect() as conn:
+            paths = [row[0] for row in conn.execute("SELECT path FROM processed_assets")]
+        for raw in paths:
+            if not Path(raw).exists():
+                self._forget_processed(raw)
+
+    def _forget_processed(self, raw: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM processed_assets WHERE path = ?", (raw,))
+            conn.commit()
+
+    def _processed_bytes(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM processed_assets").fetchone()[0])
+
+    def _get_state(self, key: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM gc_state WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else 0
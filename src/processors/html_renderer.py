@@ -1,17 +1,25 @@
 # src/processors/html_renderer.py
 from __future__ import annotations
 
-import base64
+import asyncio
+import hashlib
 import logging
 import mimetypes
+import os
 import re
+import shutil
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Optional, Sequence, Union
+from urllib.parse import parse_qs, unquote, urlsplit
 
 from jinja2 import Environment, FileSystemLoader
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route, async_playwright
 
 from config import settings
+from src.processors.asset_cache import data_uri_cache
 
 logger = logging.getLogger("eduflow.html_renderer")
 
@@ -19,17 +27,47 @@ logger = logging.getLogger("eduflow.html_renderer")
 # Regex para encontrar src="file://..."
 _FILE_SRC_RE = re.compile(r'src="file://([^"]+)"')
 
+# Origem fictícia interceptada pelo Playwright para servir assets locais
+_ASSET_ORIGIN = "https://assets.eduflow.local"
 
-def _file_to_data_uri(file_path: Path) -> str:
-    """Converte arquivo local em data URI base64"""
-    mime, _ = mimetypes.guess_type(str(file_path))
-    if not mime:
-        mime = "application/octet-stream"
+# Arquivos registrados mantidos para a rota (LRU). Cada render usa poucos (fundo + logo),
+# então o limite cobre com folga os renders simultâneos do pool de páginas
+_MAX_ROUTED_FILES = 256
+
+# Espera determinística: resolve quando todas as fontes usadas terminaram de carregar
+_FONTS_READY_JS = "() => document.fonts.ready.then(() => document.fonts.size)"
+
+
+def _build_font_face_css(fonts: dict[str, Path]) -> str:
+    """
+    Gera @font-face para as fontes Inter empacotadas (variable fonts cobrem 100-900).
+    Substitui o CSS do Google Fonts, então os templates não precisam mudar.
+    """
+    rules = []
+    for name in sorted(fonts):
+        style = "italic" if "italic" in name.lower() else "normal"
+        rules.append(
+            "@font-face {\n"
+            "  font-family: 'Inter';\n"
+            f"  font-style: {style};\n"
+            "  font-weight: 100 900;\n"
+            "  font-display: block;\n"
+            f"  src: url('{_ASSET_ORIGIN}/fonts/{name}') format('truetype');\n"
+            "}"
+        )
+    return "\n".join(rules)
+
+
+def _requested_font_families(url: str) -> set[str]:
+    """Famílias pedidas numa URL do Google Fonts ("family=Oswald:wght@700&family=Inter" → {Oswald, Inter})."""
+    families = parse_qs(urlsplit(url).query).get("family", [])
+    return {f.split(":", 1)[0].replace("+", " ").strip() for f in families if f.strip()}
 
+
+def _file_to_data_uri(file_path: Path) -> str:
+    """Converte arquivo local em data URI base64 (via cache compartilhado)"""
     try:
-        data = file_path.read_bytes()
-        b64 = base64.b64encode(data).decode("utf-8")
-        return f"data:{mime};base64,{b64}"
+        return data_uri_cache.get(file_path)
     except Exception as e:
         logger.error(f"Erro ao ler arquivo para base64: {file_path} - {e}")
         return ""
@@ -57,13 +95,66 @@ def _inline_file_src(html: str) -> str:
     return _FILE_SRC_RE.sub(repl, html)
 
 
+@dataclass(frozen=True)
+class RenderJob:
+    """Um post/slide a ser renderizado em lote (ver HtmlRenderer.render_many)."""
+
+    template_name: str
+    data: dict[str, Any]
+    output_path: Path | str
+    size: tuple[int, int] = (1080, 1080)
+    quality: int = 95
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """Resultado de um job do lote: `output_path` em caso de sucesso, `error` em caso de falha."""
+
+    job: RenderJob
+    output_path: Optional[Path] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _PooledPage:
+    """Página "quente" do pool (cada uma com seu próprio contexto)."""
+
+    context: BrowserContext
+    page: Page
+    generation: int
+    uses: int = 0
+    crashed: bool = False
+
+
 class HtmlRenderer:
     """
     Renderiza posts usando HTML/CSS via Playwright.
-    Converte file:// para base64 automaticamente para evitar erros de CORS/Path.
+    Reescreve src="file://..." para uma origem interceptada pelo Playwright, que
+    serve o arquivo direto do disco (evita erros de CORS/Path sem inflar o HTML).
+    Com `inline_assets=True`, volta a embutir os arquivos como data URI base64.
+
+    Dois modos de uso:
+    - Avulso: `await renderer.render_post(...)` lança e fecha o Chromium a cada post.
+    - Persistente: `async with HtmlRenderer() as renderer:` mantém um único Chromium
+      e um pool limitado de páginas reaproveitadas entre renders (ideal para o scheduler).
     """
 
-    def __init__(self, templates_dir: Path | str = None) -> None:
+    def __init__(
+        self,
+        templates_dir: Path | str = None,
+        pool_size: Optional[int] = None,
+        max_page_uses: Optional[int] = None,
+        max_browser_renders: Optional[int] = None,
+        device_scale_factor: Optional[int] = None,
+        inline_assets: bool = False,
+        cache_dir: Path | str | None = None,
+        cache_max_bytes: Optional[int] = None,
+        use_cache: Optional[bool] = None,
+    ) -> None:
         if templates_dir is None:
             # Garante que pega do settings ou usa padrão relativo
             root = getattr(settings, "PROJECT_ROOT", Path.cwd())
@@ -76,8 +167,251 @@ class HtmlRenderer:
             self.templates_dir.mkdir(parents=True, exist_ok=True)
 
         self.env = Environment(loader=FileSystemLoader(str(self.templates_dir)))
+
+        # Fontes locais (Google Fonts é interceptado e servido do disco)
+        fonts_dir = settings.BRAND_FONTS_DIR
+        self._fonts: dict[str, Path] = {p.name: p for p in fonts_dir.glob("Inter*.ttf")} if fonts_dir.exists() else {}
+        self._font_css = _build_font_face_css(self._fonts)
+        self._bundled_families: set[str] = {"Inter"} if self._fonts else set()
+        self._unbundled_warned: set[str] = set()
+        if not self._fonts:
+            logger.warning("⚠️ Fontes Inter não encontradas em %s (fallback: fontes do sistema)", fonts_dir)
+
+        # Arquivos locais registrados para servir via _ASSET_ORIGIN/files/<chave>
+        self.inline_assets = inline_assets
+        self._files: OrderedDict[str, Path] = OrderedDict()
+
+        # Cache de resultados (retries/A-B custam uma cópia de arquivo, não um screenshot)
+        self.use_cache = settings.RENDER_CACHE_ENABLED if use_cache is None else use_cache
+        self.cache_dir = Path(cache_dir) if cache_dir else settings.RENDER_CACHE_DIR
+        self.cache_max_bytes = settings.RENDER_CACHE_MAX_BYTES if cache_max_bytes is None else cache_max_bytes
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Pool de páginas (modo persistente)
+        self.pool_size = max(1, pool_size or settings.RENDER_POOL_SIZE)
+        self.max_page_uses = max(1, max_page_uses or settings.RENDER_MAX_PAGE_USES)
+        self.max_browser_renders = max(1, max_browser_renders or settings.RENDER_MAX_BROWSER_RENDERS)
+        self.device_scale_factor = device_scale_factor or settings.RENDER_DEVICE_SCALE_FACTOR
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._generation = 0
+        self._browser_renders = 0
+        self._idle: list[_PooledPage] = []
+        self._in_use = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+
         logger.info("✅ HtmlRenderer inicializado (templates: %s)", self.templates_dir)
 
+    # -----------------------
+    # Ciclo de vida (modo persistente)
+    # -----------------------
+    @property
+    def is_running(self) -> bool:
+        return self._playwright is not None
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Métricas simples do pool (para logs/health check)."""
+        return {
+            "generation": self._generation,
+            "browser_renders": self._browser_renders,
+            "idle_pages": len(self._idle),
+            "pages_in_use": self._in_use,
+            "pool_size": self.pool_size,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    async def __aenter__(self) -> HtmlRenderer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Inicia o Playwright e o Chromium compartilhado (idempotente)."""
+        if self.is_running:
+            return
+
+        self._slots = asyncio.Semaphore(self.pool_size)
+        self._lock = asyncio.Lock()
+        self._playwright = await async_playwright().start()
+        await self._launch_browser()
+        logger.info("🚀 Chromium persistente iniciado (pool=%d páginas)", self.pool_size)
+
+    async def close(self) -> None:
+        """Fecha páginas, browser e Playwright."""
+        if not self.is_running:
+            return
+
+        await self._close_browser()
+        try:
+            await self._playwright.stop()
+        except Exception as e:
+            logger.warning(f"Erro ao parar Playwright: {e}")
+        self._playwright = None
+        self._slots = None
+        self._lock = None
+        logger.info("🛑 Chromium persistente encerrado")
+
+    async def health_check(self) -> bool:
+        """
+        Verifica se o browser está vivo; recicla se caiu ou se atingiu o limite de renders.
+        Retorna True se o renderer está pronto para uso.
+        """
+        if not self.is_running:
+            return False
+
+        async with self._lock:
+            await self._ensure_browser()
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _launch_browser(self) -> None:
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._generation += 1
+        self._browser_renders = 0
+
+    async def _close_browser(self) -> None:
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._discard_page(pooled)
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar browser: {e}")
+            self._browser = None
+
+    async def _ensure_browser(self) -> None:
+        """Recicla o browser se caiu, ou se estourou o limite de renders e está ocioso."""
+        crashed = self._browser is None or not self._browser.is_connected()
+        exhausted = self._browser_renders >= self.max_browser_renders and self._in_use == 0
+
+        if crashed:
+            logger.warning("⚠️ Chromium desconectado. Reiniciando browser...")
+        elif exhausted:
+            logger.info("♻️ Reciclando Chromium após %d renders", self._browser_renders)
+        else:
+            return
+
+        await self._close_browser()
+        await self._launch_browser()
+
+    async def _new_pooled_page(self) -> _PooledPage:
+        context = await self._browser.new_context(device_scale_factor=self.device_scale_factor)
+        await context.route("https://fonts.googleapis.com/**", self._serve_font_css)
+        await context.route(f"{_ASSET_ORIGIN}/**", self._serve_local_asset)
+        page = await context.new_page()
+        pooled = _PooledPage(context=context, page=page, generation=self._generation)
+
+        def _on_crash(_: Page) -> None:
+            pooled.crashed = True
+
+        page.on("crash", _on_crash)
+        return pooled
+
+    async def _discard_page(self, pooled: _PooledPage) -> None:
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    def _is_reusable(self, pooled: _PooledPage) -> bool:
+        return (
+            not pooled.crashed
+            and not pooled.page.is_closed()
+            and pooled.generation == self._generation
+            and pooled.uses < self.max_page_uses
+            and self._browser is not None
+            and self._browser.is_connected()
+        )
+
+    # -----------------------
+    # Interceptação de rede (assets locais)
+    # -----------------------
+    async def _serve_font_css(self, route: Route) -> None:
+        """
+        Responde o CSS do Google Fonts com @font-face apontando para as fontes locais,
+        se todas as famílias pedidas estiverem empacotadas. Senão a requisição segue
+        para a rede (fonts.gstatic.com incluso), para o template não cair na fonte do sistema.
+        """
+        missing = _requested_font_families(route.request.url) - self._bundled_families
+        if not missing:
+            await route.fulfill(status=200, content_type="text/css; charset=utf-8", body=self._font_css)
+            return
+
+        new = missing - self._unbundled_warned
+        if new:
+            self._unbundled_warned |= new
+            logger.warning(
+                "⚠️ Fontes não empacotadas em %s: %s (baixando do Google Fonts)",
+                settings.BRAND_FONTS_DIR,
+                ", ".join(sorted(new)),
+            )
+        await route.continue_()
+
+    async def _serve_local_asset(self, route: Route) -> None:
+        """Serve arquivos de _ASSET_ORIGIN direto do disco (somente os registrados)."""
+        path = unquote(route.request.url[len(_ASSET_ORIGIN):].split("?", 1)[0])
+        local: Optional[Path] = None
+        if path.startswith("/fonts/"):
+            local = self._fonts.get(path[len("/fonts/"):])
+        elif path.startswith("/files/"):
+            local = self._files.get(path[len("/files/"):])
+
+        if local is not None and local.exists():
+            mime, _ = mimetypes.guess_type(local.name)
+            # Chave inclui mtime/tamanho, então o cache do browser pode guardar para sempre
+            await route.fulfill(
+                path=str(local),
+                content_type=mime or "application/octet-stream",
+                headers={"Cache-Control": "max-age=31536000, immutable"},
+            )
+            return
+
+        logger.warning("⚠️ Asset local não registrado: %s", route.request.url)
+        await route.fulfill(status=404, body="")
+
+    @asynccontextmanager
+    async def _acquire_page(self, width: int, height: int) -> AsyncIterator[Page]:
+        """Empresta uma página do pool (bloqueia se todas estiverem em uso)."""
+        async with self._slots:
+            async with self._lock:
+                await self._ensure_browser()
+                pooled = None
+                while self._idle:
+                    candidate = self._idle.pop()
+                    if self._is_reusable(candidate):
+                        pooled = candidate
+                        break
+                    await self._discard_page(candidate)
+                if pooled is None:
+                    pooled = await self._new_pooled_page()
+                self._in_use += 1
+
+            ok = False
+            try:
+                await pooled.page.set_viewport_size({"width": width, "height": height})
+                yield pooled.page
+                ok = True
+            finally:
+                pooled.uses += 1
+                async with self._lock:
+                    self._in_use -= 1
+                    self._browser_renders += 1
+                    if ok and self._is_reusable(pooled):
+                        self._idle.append(pooled)
+                    else:
+                        await self._discard_page(pooled)
+
+    # -----------------------
+    # Render
+    # -----------------------
     async def render_post(
         self,
         template_name: str,
@@ -89,7 +423,10 @@ class HtmlRenderer:
     ) -> Path:
         """
         Renderiza template HTML em imagem JPG.
-        
+
+        Se o renderer não foi iniciado (`start()` / `async with`), lança um
+        Chromium só para este post e fecha ao final.
+
         Args:
             template_name: Nome do arquivo .html em src/templates
             data: Dicionário com variáveis para o Jinja2
@@ -101,7 +438,163 @@ class HtmlRenderer:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 1) Renderizar template (Jinja2)
+        # 1) Renderizar template (Jinja2) + converter file://
+        html_content = self._render_template(template_name, data)
+
+        # 2) Mesmo template + HTML + viewport já renderizado? Só copia.
+        cache_key = self._cache_key(template_name, html_content, width, height, quality)
+        if self._restore_from_cache(cache_key, output_path):
+            logger.info(f"♻️ Render em cache: {output_path.name}")
+            return output_path
+
+        # 3) Renderizar no Navegador (Playwright)
+        logger.info("🎨 Renderizando pixels...")
+        if self.is_running:
+            await self._screenshot_html(html_content, output_path, width, height, quality)
+        else:
+            async with self:
+                await self._screenshot_html(html_content, output_path, width, height, quality)
+
+        self._store_in_cache(cache_key, output_path)
+
+        size_kb = output_path.stat().st_size / 1024
+        logger.info(f"✅ Imagem salva: {output_path.name} ({size_kb:.1f} KB)")
+        
+        return output_path
+
+    async def render_many(
+        self,
+        jobs: Sequence[Union[RenderJob, tuple]],
+        concurrency: Optional[int] = None,
+    ) -> list[RenderResult]:
+        """
+        Renderiza vários posts/slides numa única sessão do Chromium.
+
+        Os jobs rodam em paralelo, limitados por `concurrency` (padrão: tamanho
+        do pool de páginas). Uma falha não derruba o lote: o erro fica no
+        `RenderResult` correspondente. Os resultados voltam na mesma ordem dos jobs.
+
+        Args:
+            jobs: RenderJob ou tuplas (template_name, data, output_path, (width, height))
+            concurrency: Máximo de renders simultâneos
+        """
+        normalized = [self._to_job(j) for j in jobs]
+        if not normalized:
+            return []
+
+        if not self.is_running:
+            async with self:
+                return await self.render_many(normalized, concurrency=concurrency)
+
+        workers = max(1, min(concurrency or self.pool_size, self.pool_size))
+        limit = asyncio.Semaphore(workers)
+        logger.info("📚 Renderizando lote de %d posts (concorrência=%d)", len(normalized), workers)
+
+        async def _run(job: RenderJob) -> RenderResult:
+            async with limit:
+                try:
+                    width, height = job.size
+                    path = await self.render_post(
+                        template_name=job.template_name,
+                        data=job.data,
+                        output_path=job.output_path,
+                        width=width,
+                        height=height,
+                        quality=job.quality,
+                    )
+                    return RenderResult(job=job, output_path=path)
+                except Exception as e:
+                    logger.error(f"❌ Falha no job {job.output_path}: {e}")
+                    return RenderResult(job=job, error=e)
+
+        results = await asyncio.gather(*(_run(job) for job in normalized))
+
+        failed = sum(1 for r in results if not r.ok)
+        logger.info("✅ Lote concluído: %d ok, %d com erro", len(results) - failed, failed)
+        return list(results)
+
+    # -----------------------
+    # Cache de resultados
+    # -----------------------
+    def _cache_key(self, template_name: str, html_content: str, width: int, height: int, quality: int) -> str:
+        """Hash estável de (fonte do template, HTML final, viewport, scale factor, qualidade)."""
+        try:
+            template_source, _, _ = self.env.loader.get_source(self.env, template_name)
+        except Exception:
+            template_source = ""
+
+        h = hashlib.sha256()
+        for part in (template_source, html_content, self._font_css, f"{width}x{height}@{self.device_scale_factor}q{quality}"):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _restore_from_cache(self, key: str, output_path: Path) -> bool:
+        if not self.use_cache:
+            return False
+
+        cached = self.cache_dir / f"{key}.jpg"
+        if not cached.exists():
+            self.cache_misses += 1
+            return False
+
+        try:
+            shutil.copyfile(cached, output_path)
+            os.utime(cached)  # mtime = último uso (ordem do LRU)
+        except OSError as e:
+            logger.warning(f"⚠️ Falha ao ler cache de render: {e}")
+            self.cache_misses += 1
+            return False
+
+        self.cache_hits += 1
+        return True
+
+    def _store_in_cache(self, key: str, output_path: Path) -> None:
+        if not self.use_cache:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+            shutil.copyfile(output_path, tmp)
+            tmp.replace(self.cache_dir / f"{key}.jpg")
+            self._evict_cache()
+        except OSError as e:
+            logger.warning(f"⚠️ Falha ao gravar cache de render: {e}")
+
+    def _evict_cache(self) -> None:
+        """Remove os renders menos usados até caber em cache_max_bytes."""
+        entries = []
+        total = 0
+        for f in self.cache_dir.glob("*.jpg"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, f))
+            total += st.st_size
+
+        if total <= self.cache_max_bytes:
+            return
+
+        entries.sort()
+        for _, size, f in entries:
+            if total <= self.cache_max_bytes:
+                break
+            try:
+                f.unlink()
+                total -= size
+            except OSError:
+                continue
+        logger.info("🧹 Cache de render reduzido para %.1f MB", total / (1024 * 1024))
+
+    def _to_job(self, job: Union[RenderJob, tuple]) -> RenderJob:
+        if isinstance(job, RenderJob):
+            return job
+        return RenderJob(*job)
+
+    def _render_template(self, template_name: str, data: dict[str, Any]) -> str:
+        """Jinja2 → HTML final (com file:// convertido)."""
         logger.info("📝 Processando template: %s", template_name)
         try:
             template = self.env.get_template(template_name)
@@ -110,29 +603,51 @@ class HtmlRenderer:
             logger.error(f"❌ Erro ao processar Jinja2 template: {e}")
             raise
 
-        # 2) Converter file:// para base64 (Fix para Playwright)
-        html_content = _inline_file_src(html_content)
+        # Converter file:// (Fix para Playwright)
+        if self.inline_assets:
+            return _inline_file_src(html_content)
+        return self._route_file_src(html_content)
 
-        # 3) Renderizar no Navegador (Playwright)
-        logger.info("🎨 Renderizando pixels...")
-        async with async_playwright() as p:
-            # Lança browser
-            browser = await p.chromium.launch(headless=True)
-            
-            # Configura página com Scale Factor alto para nitidez (Retina like)
-            page = await browser.new_page(
-                viewport={"width": width, "height": height},
-                device_scale_factor=2, # 2 ou 3 melhora muito a qualidade do texto
-            )
+    def _route_file_src(self, html: str) -> str:
+        """Substitui src="file://..." por URLs de _ASSET_ORIGIN servidas pelo route handler."""
+
+        def repl(match: re.Match) -> str:
+            p = Path(match.group(1).replace("file://", ""))
+            if not p.exists():
+                logger.warning("⚠️ Arquivo local não encontrado: %s", p)
+                return match.group(0)
+            return f'src="{self._register_file(p)}"'
 
-            # Carrega HTML
-            await page.set_content(html_content, wait_until="networkidle")
+        return _FILE_SRC_RE.sub(repl, html)
+
+    def _register_file(self, path: Path) -> str:
+        """
+        Registra o arquivo e devolve a URL interceptada.
+        A chave depende de (caminho, mtime, tamanho): o mesmo background gera a
+        mesma URL entre renders (cache do browser), e um arquivo alterado gera outra.
+        """
+        path = path.resolve()
+        st = path.stat()
+        digest = hashlib.sha1(f"{path}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")).hexdigest()[:20]
+        key = f"{digest}{path.suffix.lower()}"
+        self._files[key] = path
+        self._files.move_to_end(key)
+        # Scheduler 24/7: sem limite o mapa guardaria todo background já renderizado.
+        # Descartar é seguro: o próximo render do mesmo arquivo registra a mesma chave.
+        while len(self._files) > _MAX_ROUTED_FILES:
+            self._files.popitem(last=False)
+        return f"{_ASSET_ORIGIN}/files/{key}"
+
+    async def _screenshot_html(self, html_content: str, output_path: Path, width: int, height: int, quality: int) -> None:
+        async with self._acquire_page(width, height) as page:
+            # Carrega HTML ("load" basta - sem esperar rede ociosa; fontes remotas são aguardadas abaixo)
+            await page.set_content(html_content, wait_until="load")
 
             # Garante que fontes carregaram
             try:
-                await page.evaluate("document.fonts.ready")
-            except Exception:
-                pass
+                await page.evaluate(_FONTS_READY_JS)
+            except Exception as e:
+                logger.warning(f"⚠️ Não foi possível aguardar fontes: {e}")
 
             # Screenshot
             await page.screenshot(
@@ -141,10 +656,3 @@ class HtmlRenderer:
                 quality=quality,
                 full_page=False,
             )
-
-            await browser.close()
-
-        size_kb = output_path.stat().st_size / 1024
-        logger.info(f"✅ Imagem salva: {output_path.name} ({size_kb:.1f} KB)")
-        
-        return output_path
\ No newline at end of file
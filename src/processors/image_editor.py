@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import logging
-import random
+import math
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -12,10 +12,41 @@ from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
 from config import settings
 from src.generators.pexels_client import PexelsClient
+from src.processors.text_layout import text_layout
 
 logger = logging.getLogger("eduflow.image_editor")
 
 
+# Camadas constantes do background (dependem só do tamanho e das cores da marca).
+# Montadas uma vez por processo: chave = (nome, w, h, GRADIENT_A, GRADIENT_B)
+_LAYER_CACHE: dict[tuple[str, int, int, str, str], Image.Image] = {}
+
+
+# Palavras-chave do título → query do Pexels (primeira regra que casar vence).
+# Também usadas pelo BackgroundWarmer para pré-baixar fotos de cada bucket.
+SMART_QUERY_RULES: list[tuple[tuple[str, ...], str]] = [
+    # Atendimento/Suporte/Chat
+    (("atendimento", "suporte", "chat", "chatbot", "whatsapp"),
+     "smiling customer service woman headset modern office professional"),
+    # Estudantes/Alunos/Matrícula
+    (("aluno", "estudante", "matrícula", "captação", "leads"),
+     "happy college students laptop modern campus smiling group"),
+    # Professores/Docentes
+    (("professor", "docente", "ensino", "aula"),
+     "professional teacher classroom technology smiling confident"),
+    # Gestão/Administração
+    (("gestão", "administração", "coordenação", "diretor"),
+     "professional business meeting office teamwork collaboration happy"),
+    # Tecnologia/IA/Digital
+    (("tecnologia", "ia", "inteligência artificial", "digital", "automação", "agente"),
+     "professional young person laptop technology smiling modern bright office"),
+    # EAD/Online/Remoto
+    (("ead", "online", "distância", "remoto", "home"),
+     "young professional studying laptop home modern bright smiling"),
+]
+SMART_QUERY_FALLBACK = "happy university students group laptop modern campus smiling diverse"
+
+
 @dataclass(frozen=True)
 class PostCopy:
     kicker: str
@@ -227,11 +258,16 @@ class ImageEditor:
     # Background / Pexels
     # -----------------------
     def pick_random_background(self) -> Optional[Path]:
-        files: list[Path] = []
-        if settings.BACKGROUNDS_DIR.exists():
-            for ext in ("*.jpg", "*.jpeg", "*.png", "*.webp"):
-                files.extend(list(settings.BACKGROUNDS_DIR.glob(ext)))
-        return random.choice(files) if files else None
+        """
+        Background já em cache, pelo índice (sem varrer a pasta): sorteia entre as
+        fotos usadas há mais tempo e registra o uso.
+        Índice vazio (primeira execução / pasta povoada à mão) → sincroniza com o disco uma vez.
+        """
+        index = self.pexels.background_index
+        chosen = index.pick()
+        if chosen is None and index.sync()[0]:
+            chosen = index.pick()
+        return chosen
 
     def create_carousel(
         self,
@@ -288,33 +324,13 @@ class ImageEditor:
         Inspirado em contas premium (Estácio, Uninter, Kroton).
         """
         title_lower = title.lower()
-        
-        # Atendimento/Suporte/Chat
-        if any(word in title_lower for word in ["atendimento", "suporte", "chat", "chatbot", "whatsapp"]):
-            return "smiling customer service woman headset modern office professional"
-        
-        # Estudantes/Alunos/Matrícula
-        if any(word in title_lower for word in ["aluno", "estudante", "matrícula", "captação", "leads"]):
-            return "happy college students laptop modern campus smiling group"
-        
-        # Professores/Docentes
-        if any(word in title_lower for word in ["professor", "docente", "ensino", "aula"]):
-            return "professional teacher classroom technology smiling confident"
-        
-        # Gestão/Administração
-        if any(word in title_lower for word in ["gestão", "administração", "coordenação", "diretor"]):
-            return "professional business meeting office teamwork collaboration happy"
-        
-        # Tecnologia/IA/Digital
-        if any(word in title_lower for word in ["tecnologia", "ia", "inteligência artificial", "digital", "automação", "agente"]):
-            return "professional young person laptop technology smiling modern bright office"
-        
-        # EAD/Online/Remoto
-        if any(word in title_lower for word in ["ead", "online", "distância", "remoto", "home"]):
-            return "young professional studying laptop home modern bright smiling"
-        
+
+        for keywords, query in SMART_QUERY_RULES:
+            if any(word in title_lower for word in keywords):
+                return query
+
         # Fallback: universitários felizes
-        return "happy university students group laptop modern campus smiling diverse"
+        return SMART_QUERY_FALLBACK
 
     def _build_background(self, background_path: Optional[str | Path], background_query: str, auto_fetch: bool) -> Image.Image:
         """
@@ -333,30 +349,60 @@ class ImageEditor:
             chosen = self.pick_random_background()
 
         if not chosen and auto_fetch:
-            chosen = self.pexels.get_background_for_query(background_query)
+            chosen = self.pexels.get_background_for_query(background_query, target_size=(w, h))
 
         if chosen and chosen.exists():
-            img = Image.open(chosen).convert("RGB")
-            img = self._cover_resize(img, w, h)
+            img = self._load_background(chosen, w, h)
 
             # Blur SUAVE (mantém rostos reconhecíveis)
             img_blur = img.filter(ImageFilter.GaussianBlur(radius=3))
             base = img_blur.convert("RGBA")
 
-            # Overlay escuro suave (deixa foto visível)
-            base = Image.alpha_composite(base, Image.new("RGBA", (w, h), (0, 0, 0, 85)))
-            
-            # Gradiente SUTIL (não mata a foto)
-            base = Image.alpha_composite(base, self._gradient_rgba(w, h, settings.GRADIENT_A, settings.GRADIENT_B, alpha=70))
-            
-            # Highlight blob discreto
-            base = Image.alpha_composite(base, self._highlight_blob(w, h))
-            return base
+            # Overlay escuro + gradiente sutil + highlight, pré-compostos numa camada só
+            return Image.alpha_composite(base, self._photo_overlay(w, h))
 
-        # Fallback: gradiente puro
-        base = self._gradient_rgba(w, h, settings.GRADIENT_A, settings.GRADIENT_B, alpha=255)
-        base = Image.alpha_composite(base, self._highlight_blob(w, h))
-        base = Image.alpha_composite(base, Image.new("RGBA", (w, h), (0, 0, 0, 35)))
+        # Fallback: gradiente puro (constante, vem do cache)
+        return self._fallback_background(w, h).copy()
+
+    def _load_background(self, path: Path, w: int, h: int) -> Image.Image:
+        """
+        Abre a foto já no tamanho final (cover w x h).
+        JPEGs grandes (Pexels original: 4000-6000px) são decodificados em escala reduzida
+        via draft mode (DCT 1/2, 1/4, 1/8), na menor escala que ainda cobre o alvo;
+        o LANCZOS do _cover_resize faz o acabamento.
+        """
+        img = Image.open(path)
+        if img.format == "JPEG":
+            src_w, src_h = img.size
+            scale = max(w / src_w, h / src_h)
+            if scale < 1:
+                img.draft("RGB", (math.ceil(src_w * scale), math.ceil(src_h * scale)))
+        return self._cover_resize(img.convert("RGB"), w, h)
+
+    def _photo_overlay(self, w: int, h: int) -> Image.Image:
+        """
+        Overlay aplicado sobre a foto, fundido numa única camada RGBA:
+        escuro suave (deixa foto visível) → gradiente SUTIL → highlight blob discreto.
+        "Over" é associativo, então compor a camada fundida equivale a compor as três em sequência.
+        """
+        key = ("photo_overlay", w, h, settings.GRADIENT_A, settings.GRADIENT_B)
+        overlay = _LAYER_CACHE.get(key)
+        if overlay is None:
+            overlay = Image.new("RGBA", (w, h), (0, 0, 0, 85))
+            overlay = Image.alpha_composite(overlay, self._gradient_rgba(w, h, settings.GRADIENT_A, settings.GRADIENT_B, alpha=70))
+            overlay = Image.alpha_composite(overlay, self._highlight_blob(w, h))
+            _LAYER_CACHE[key] = overlay
+        return overlay
+
+    def _fallback_background(self, w: int, h: int) -> Image.Image:
+        """Background sem foto: gradiente puro + highlight + escurecimento leve."""
+        key = ("fallback", w, h, settings.GRADIENT_A, settings.GRADIENT_B)
+        base = _LAYER_CACHE.get(key)
+        if base is None:
+            base = self._gradient_rgba(w, h, settings.GRADIENT_A, settings.GRADIENT_B, alpha=255)
+            base = Image.alpha_composite(base, self._highlight_blob(w, h))
+            base = Image.alpha_composite(base, Image.new("RGBA", (w, h), (0, 0, 0, 35)))
+            _LAYER_CACHE[key] = base
         return base
 
     # -----------------------
@@ -454,12 +500,7 @@ class ImageEditor:
     # Typography helpers
     # -----------------------
     def _load_font(self, path: Path, size: int) -> ImageFont.FreeTypeFont:
-        try:
-            if path.exists():
-                return ImageFont.truetype(str(path), size=size)
-        except Exception:
-            pass
-        return ImageFont.load_default()
+        return text_layout.load_font(path, size)
 
     def _fit_font(
         self,
@@ -470,32 +511,17 @@ class ImageEditor:
         min_size: int,
         max_lines: int = 3,
     ) -> ImageFont.FreeTypeFont:
-        size = start_size
-        while size >= min_size:
-            font = self._load_font(font_path, size)
-            lines = self._wrap_text(text, font, max_width)
-            if len(lines) <= max_lines and all(self._text_width(line, font) <= max_width for line in lines):
-                return font
-            size -= 2
-        return self._load_font(font_path, min_size)
+        return text_layout.fit_font(
+            font_path=font_path,
+            text=text,
+            max_width=max_width,
+            start_size=start_size,
+            min_size=min_size,
+            max_lines=max_lines,
+        )
 
     def _wrap_text(self, text: str, font: ImageFont.ImageFont, max_width: int) -> list[str]:
-        words = text.split()
-        lines: list[str] = []
-        current = ""
-
-        for w in words:
-            test = (current + " " + w).strip()
-            if self._text_width(test, font) <= max_width:
-                current = test
-            else:
-                if current:
-                    lines.append(current)
-                current = w
-
-        if current:
-            lines.append(current)
-        return lines
+        return text_layout.wrap(text, font, max_width)
 
     def _measure_multiline_height(self, lines: list[str], font: ImageFont.ImageFont, line_spacing: int) -> int:
         if not lines:
@@ -547,8 +573,7 @@ class ImageEditor:
         draw.text((sx, sy), text, font=font, fill=fill)
 
     def _text_width(self, text: str, font: ImageFont.ImageFont) -> int:
-        bbox = font.getbbox(text)
-        return bbox[2] - bbox[0]
+        return text_layout.text_width(text, font)
 
     # -----------------------
     # Image helpers
@@ -572,19 +597,19 @@ class ImageEditor:
         a = self._hex_to_rgb(hex_a)
         b = self._hex_to_rgb(hex_b)
 
-        base = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-        px = base.load()
-        if px is None:
-            return base
-
+        # Gradiente vertical: calcula só uma coluna (h pixels) e replica na largura.
+        # NEAREST apenas copia a coluna, então o resultado é idêntico ao loop pixel a pixel.
+        column = []
         for y in range(h):
             t = y / max(1, h - 1)
             r = int(a[0] * (1 - t) + b[0] * t)
             g = int(a[1] * (1 - t) + b[1] * t)
             bl = int(a[2] * (1 - t) + b[2] * t)
-            for x in range(w):
-                px[x, y] = (r, g, bl, alpha)
-        return base
+            column.append((r, g, bl, alpha))
+
+        strip = Image.new("RGBA", (1, h))
+        strip.putdata(column)
+        return strip.resize((w, h), Image.Resampling.NEAREST)
 
     def _highlight_blob(self, w: int, h: int) -> Image.Image:
         blob = Image.new("RGBA", (w, h), (0, 0, 0, 0))
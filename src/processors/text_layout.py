@@ -0,0 +1,168 @@
+# src/processors/text_layout.py
+"""
+Motor de layout de texto reutilizável (Pillow).
+- Cache LRU de FreeTypeFont por (caminho, tamanho, variação) → o TTF é lido uma vez por tamanho.
+- Medidas de largura memoizadas por (fonte, texto).
+- Ajuste de tamanho por busca binária (em vez de descer de 2 em 2).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from PIL import ImageFont
+
+logger = logging.getLogger("eduflow.text_layout")
+
+
+FontKey = tuple[str, int, Optional[str]]
+
+
+class TextLayoutEngine:
+    def __init__(self, max_fonts: int = 128, max_widths: int = 16384) -> None:
+        self.max_fonts = max_fonts
+        self.max_widths = max_widths
+        self._fonts: OrderedDict[FontKey, ImageFont.ImageFont] = OrderedDict()
+        self._widths: OrderedDict[tuple[ImageFont.ImageFont, str], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.font_loads = 0
+        self.font_hits = 0
+
+    # -----------------------
+    # Fontes
+    # -----------------------
+    def load_font(self, path: Path, size: int, variation: Optional[str] = None) -> ImageFont.ImageFont:
+        """
+        Retorna a fonte (do cache quando possível).
+        `variation` seleciona uma instância nomeada de variable font (ex: "ExtraBold").
+        Sem arquivo, cai na fonte padrão do Pillow (mesmo comportamento de antes).
+        """
+        key: FontKey = (str(path), size, variation)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.font_hits += 1
+                return font
+
+        font = self._open_font(Path(path), size, variation)
+
+        with self._lock:
+            self.font_loads += 1
+            self._fonts[key] = font
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+        return font
+
+    def _open_font(self, path: Path, size: int, variation: Optional[str]) -> ImageFont.ImageFont:
+        try:
+            if path.exists():
+                font = ImageFont.truetype(str(path), size=size)
+                if variation:
+                    try:
+                        font.set_variation_by_name(variation)
+                    except Exception as exc:
+                        logger.warning("Variação '%s' indisponível em %s: %s", variation, path.name, exc)
+                return font
+        except Exception:
+            pass
+        return ImageFont.load_default()
+
+    # -----------------------
+    # Medidas
+    # -----------------------
+    def text_width(self, text: str, font: ImageFont.ImageFont) -> int:
+        # A chave guarda a própria fonte (hash por identidade), então a medida
+        # nunca é confundida com a de outra fonte criada depois
+        key = (font, text)
+        with self._lock:
+            width = self._widths.get(key)
+            if width is not None:
+                self._widths.move_to_end(key)
+                return width
+
+        bbox = font.getbbox(text)
+        width = bbox[2] - bbox[0]
+
+        with self._lock:
+            self._widths[key] = width
+            while len(self._widths) > self.max_widths:
+                self._widths.popitem(last=False)
+        return width
+
+    def wrap(self, text: str, font: ImageFont.ImageFont, max_width: int) -> list[str]:
+        """Quebra gulosa por palavras, respeitando max_width."""
+        words = text.split()
+        lines: list[str] = []
+        current = ""
+
+        for w in words:
+            test = (current + " " + w).strip()
+            if self.text_width(test, font) <= max_width:
+                current = test
+            else:
+                if current:
+                    lines.append(current)
+                current = w
+
+        if current:
+            lines.append(current)
+        return lines
+
+    def fits(self, text: str, font: ImageFont.ImageFont, max_width: int, max_lines: int) -> bool:
+        lines = self.wrap(text, font, max_width)
+        return len(lines) <= max_lines and all(self.text_width(line, font) <= max_width for line in lines)
+
+    # -----------------------
+    # Ajuste de tamanho
+    # -----------------------
+    def fit_font(
+        self,
+        font_path: Path,
+        text: str,
+        max_width: int,
+        start_size: int,
+        min_size: int,
+        max_lines: int = 3,
+        step: int = 2,
+        variation: Optional[str] = None,
+    ) -> ImageFont.ImageFont:
+        """
+        Maior tamanho em start_size, start_size-step, ... (>= min_size) em que o texto cabe.
+        "Cabe" é monotônico no tamanho (fonte menor nunca ocupa mais linhas), então a
+        busca binária encontra o mesmo tamanho que a descida linear, com O(log n) tentativas.
+        """
+        sizes = list(range(start_size, min_size - 1, -step))
+
+        lo, hi = 0, len(sizes) - 1
+        best: Optional[int] = None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            font = self.load_font(font_path, sizes[mid], variation)
+            if self.fits(text, font, max_width, max_lines):
+                best = mid
+                hi = mid - 1  # cabe: tenta um tamanho maior
+            else:
+                lo = mid + 1
+
+        if best is None:
+            return self.load_font(font_path, min_size, variation)
+        return self.load_font(font_path, sizes[best], variation)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "fonts_cached": len(self._fonts),
+                "font_loads": self.font_loads,
+                "font_hits": self.font_hits,
+                "widths_cached": len(self._widths),
+            }
+
+
+# Instância compartilhada pelo processo
+text_layout = TextLayoutEngine()
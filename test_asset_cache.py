@@ -0,0 +1,105 @@
+# test_asset_cache.py
+"""Teste do cache de data URIs (sem APIs externas)"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+def test_hit_miss_counters():
+    print("🔍 Testando hits/misses do cache...")
+    from src.processors.asset_cache import DataUriCache
+
+    cache = DataUriCache(max_bytes=10 * 1024 * 1024)
+    logo = Path("assets/brand/logo.png")
+
+    first = cache.get(logo)
+    second = cache.get(logo)
+
+    assert first == second, "❌ Data URI diferente para o mesmo arquivo"
+    assert first.startswith("data:image/png;base64,"), "❌ MIME incorreto"
+    assert cache.hits == 1 and cache.misses == 1, f"❌ Contadores errados: {cache.stats()}"
+    print(f"  ✅ {cache.stats()}")
+
+
+def test_invalidation_by_mtime():
+    print("\n🔍 Testando invalidação por mtime/tamanho...")
+    from src.processors.asset_cache import DataUriCache
+
+    cache = DataUriCache(max_bytes=1024 * 1024)
+    with tempfile.TemporaryDirectory() as tmp:
+        f = Path(tmp) / "a.png"
+        f.write_bytes(b"v1")
+        old = cache.get(f)
+
+        f.write_bytes(b"v2-maior")
+        os.utime(f, ns=(f.stat().st_atime_ns, f.stat().st_mtime_ns + 1_000_000))
+        new = cache.get(f)
+
+        assert old != new, "❌ Cache não invalidou arquivo alterado"
+        assert cache.stats()["entries"] == 1, "❌ Versão antiga não foi descartada"
+    print("  ✅ Arquivo alterado gera nova entrada")
+
+
+def test_lru_budget():
+    print("\n🔍 Testando orçamento em bytes (LRU)...")
+    from src.processors.asset_cache import DataUriCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(3):
+            f = Path(tmp) / f"{i}.jpg"
+            f.write_bytes(os.urandom(300))
+            files.append(f)
+
+        one = len(DataUriCache(max_bytes=10_000).get(files[0]))
+        cache = DataUriCache(max_bytes=one * 2)
+
+        cache.get(files[0])
+        cache.get(files[1])
+        cache.get(files[0])  # 0 vira o mais recente
+        cache.get(files[2])  # expulsa 1
+
+        assert cache.evictions == 1, f"❌ Esperava 1 evicção: {cache.stats()}"
+        assert cache.stats()["bytes"] <= cache.max_bytes, "❌ Orçamento estourado"
+        cache.get(files[0])
+        assert cache.hits == 2, "❌ Item recente foi expulso no lugar do LRU"
+    print("  ✅ LRU respeita orçamento")
+
+
+def test_routed_files_bounded():
+    print("\n🔍 Testando limite dos arquivos servidos pela rota do renderer...")
+    from src.processors import html_renderer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = html_renderer.HtmlRenderer(templates_dir=tmp)
+        limit = html_renderer._MAX_ROUTED_FILES
+        urls = []
+        for i in range(limit + 50):
+            f = Path(tmp) / f"bg_{i}.jpg"
+            f.write_bytes(b"x")
+            urls.append(renderer._register_file(f))
+        first = renderer._register_file(Path(tmp) / "bg_0.jpg")
+
+        assert len(renderer._files) == limit, f"❌ Mapa cresceu para {len(renderer._files)}"
+        assert first == urls[0], "❌ Mesmo arquivo deveria gerar a mesma URL"
+        assert urls[-1].rsplit("/", 1)[1] in renderer._files, "❌ O mais recente foi descartado"
+        assert urls[1].rsplit("/", 1)[1] not in renderer._files, "❌ O mais antigo deveria sair"
+    print(f"  ✅ {limit} arquivos no máximo (LRU)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - CACHE DE DATA URIs")
+    print("=" * 60)
+
+    try:
+        test_hit_miss_counters()
+        test_invalidation_by_mtime()
+        test_lru_budget()
+        test_routed_files_bounded()
+        print("\n✅ Cache de data URIs OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
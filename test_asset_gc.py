@@ -0,0 +1,80 @@
+# test_asset_gc.py
+"""Teste da limpeza por orçamento em bytes (backgrounds + artes publicadas)"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+
+def test_gc_budget():
+    print("🔍 Testando GC de backgrounds (LRU) e artes publicadas...")
+    from database.init_db import SCHEMA
+    from src.generators.background_index import BackgroundIndex
+    from src.processors.asset_gc import AssetGC
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        bg_dir, processed = root / "backgrounds", root / "processed"
+        bg_dir.mkdir()
+        processed.mkdir()
+
+        index = BackgroundIndex(bg_dir)
+        for i in range(6):
+            path = bg_dir / f"pexels_{i}.jpg"
+            Image.new("RGB", (64, 64), (i * 40, 0, 0)).save(path)
+            index.record(path, used=True)
+            time.sleep(0.01)
+        index.mark_used(bg_dir / "pexels_0.jpg")  # a mais antiga volta a ser a mais recente
+        per_file = max(p.stat().st_size for p in bg_dir.glob("*.jpg"))
+
+        content_db = root / "content.db"
+        with sqlite3.connect(content_db) as conn:
+            conn.executescript(SCHEMA)
+            for i in range(5):
+                post = processed / f"post_{i}.jpg"
+                post.write_bytes(b"x" * 1000)
+                conn.execute(
+                    """
+                    INSERT INTO content_history (content_type, platform, topic, asset_path, content_hash, status, created_at)
+                    VALUES ('post', 'instagram', 't', ?, ?, ?, ?)
+                    """,
+                    (str(post), f"h{i}", "rendered" if i == 0 else "published", f"2026-01-0{i + 1}"),
+                )
+
+        gc = AssetGC(
+            backgrounds_max_bytes=per_file * 3,
+            processed_max_bytes=2500,
+            index=index,
+            processed_dir=processed,
+            content_db=content_db,
+            db_path=root / "gc.db",
+        )
+        report = gc.run()
+
+        left_bg = sorted(p.name for p in bg_dir.glob("*.jpg"))
+        left_posts = sorted(p.name for p in processed.iterdir())
+        assert report.backgrounds_bytes <= per_file * 3, "❌ Backgrounds acima do orçamento"
+        assert "pexels_0.jpg" in left_bg and "pexels_1.jpg" not in left_bg, f"❌ Ordem LRU errada: {left_bg}"
+        assert "post_0.jpg" in left_posts, "❌ Arte não publicada não pode ser apagada"
+        assert report.processed_bytes <= 2500, "❌ Processed acima do orçamento"
+
+        again = gc.run()
+        assert again.backgrounds_deleted == 0 and again.processed_deleted == 0, "❌ Segunda passada deveria ser vazia"
+    print(f"  ✅ Backgrounds: {left_bg} | Artes: {left_posts}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - GC DE ASSETS")
+    print("=" * 60)
+
+    try:
+        test_gc_budget()
+        print("\n✅ GC OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
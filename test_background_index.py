@@ -0,0 +1,78 @@
+# test_background_index.py
+"""Teste do índice de backgrounds (LRU + hash perceptual), sem Pexels"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+
+def _scene(seed: int) -> Image.Image:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (1200, 1600))
+    draw = ImageDraw.Draw(img)
+    for _ in range(30):
+        x, y = rng.randint(0, 1100), rng.randint(0, 1500)
+        color = tuple(rng.randint(0, 255) for _ in range(3))
+        draw.ellipse([x, y, x + rng.randint(50, 500), y + rng.randint(50, 500)], fill=color)
+    return img
+
+
+def test_near_duplicates():
+    print("🔍 Testando hash perceptual (quase-duplicatas)...")
+    from src.generators.background_index import BackgroundIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        scene = _scene(1)
+        scene.save(root / "pexels_1.jpg", quality=95)
+        scene.resize((600, 800)).save(root / "pexels_2.jpg", quality=70)  # mesma foto, outra rendition
+        _scene(2).save(root / "pexels_3.jpg")
+        _scene(3).save(root / "pexels_4.jpg")
+
+        index = BackgroundIndex(root)
+        assert index.sync() == (4, 0)
+        assert index.find_duplicate(root / "pexels_2.jpg") == root / "pexels_1.jpg", "❌ Duplicata não detectada"
+        assert index.find_duplicate(root / "pexels_3.jpg") is None, "❌ Fotos diferentes marcadas como iguais"
+
+        index.mark_used(root / "pexels_1.jpg")
+        picks = {index.pick().name for _ in range(2)}  # as duas fotos realmente novas
+        assert "pexels_2.jpg" not in picks, "❌ Escolheu a quase-duplicata da última foto usada"
+
+        removed = index.dedupe()
+        assert [p.name for p in removed] == ["pexels_2.jpg"], f"❌ Dedupe removeu {removed}"
+        assert index.count() == 3
+        assert index.alias_for(2) == root / "pexels_1.jpg", "❌ Foto removida deveria apontar para a mantida"
+    print("  ✅ Duplicata detectada, pulada na escolha e removida no dedupe")
+
+
+def test_lru_rotation():
+    print("\n🔍 Testando rotação LRU...")
+    from src.generators.background_index import BackgroundIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(4):
+            _scene(10 + i).save(root / f"pexels_{i}.jpg")
+
+        index = BackgroundIndex(root)
+        index.sync()
+        picks = [index.pick(window=1).name for _ in range(4)]
+        assert len(set(picks)) == 4, f"❌ Repetiu foto antes de usar todas: {picks}"
+    print(f"  ✅ {picks}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - ÍNDICE DE BACKGROUNDS")
+    print("=" * 60)
+
+    try:
+        test_near_duplicates()
+        test_lru_rotation()
+        print("\n✅ Índice OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
@@ -0,0 +1,52 @@
+# test_clean_assets.py
+"""Teste da limpeza completa (python clean_assets.py), numa pasta temporária"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+def test_wipe_mode():
+    print("🔍 Testando limpeza completa (processed, backgrounds, temp)...")
+    import clean_assets
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        files = [
+            "assets/processed/post_1.jpg",
+            "assets/raw/backgrounds/pexels_1.jpg",
+            "assets/temp/pexels_cache.db",
+            "assets/temp/render_cache/ab/abcdef.jpg",
+            "assets/temp/instagram_session.json",
+        ]
+        for name in files:
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            (root / name).write_bytes(b"x")
+
+        cwd, argv = os.getcwd(), sys.argv
+        try:
+            os.chdir(root)
+            sys.argv = ["clean_assets.py"]
+            clean_assets.main()
+        finally:
+            os.chdir(cwd)
+            sys.argv = argv
+
+        left = sorted(str(p.relative_to(root)) for p in (root / "assets").rglob("*") if p.is_file())
+        assert left == ["assets/temp/instagram_session.json"], f"❌ Sobrou: {left}"
+        assert (root / "assets/processed").is_dir() and (root / "assets/raw/backgrounds").is_dir()
+    print("  ✅ Tudo removido (inclusive render_cache/), sessão do Instagram preservada")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - LIMPEZA DE ASSETS")
+    print("=" * 60)
+
+    try:
+        test_wipe_mode()
+        print("\n✅ Limpeza OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
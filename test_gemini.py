@@ -3,3 +3,6 @@ from src.generators.gemini_client import GeminiClient
 client = GeminiClient()
 ideas = client.generate_topic_ideas("captação de matrículas para faculdades EAD", count=2)
 print(ideas)
+
+bundle = client.generate_post_bundle("captação de matrículas para faculdades EAD")
+print(bundle)
@@ -0,0 +1,71 @@
+# test_gemini_cache.py
+"""Teste do cache de respostas do Gemini (sem chamar a API)"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+
+def _client(tmp: str, **cache_kwargs):
+    from src.generators.gemini_cache import GeminiResponseCache
+    from src.generators.gemini_client import GeminiClient, GeminiConfig
+
+    cache = GeminiResponseCache(db_path=Path(tmp) / "gemini.db", **cache_kwargs)
+    client = GeminiClient(GeminiConfig(api_key="teste"), response_cache=cache, use_cache=True)
+    calls = []
+
+    def fake_call(prompt, temperature, schema=None):
+        calls.append(prompt)
+        return json.dumps(["Ponto 1", "Ponto 2"])
+
+    client._call_model = fake_call
+    return client, cache, calls
+
+
+def test_deterministic_hit():
+    print("🔍 Testando hit para prompt idêntico...")
+    with tempfile.TemporaryDirectory() as tmp:
+        client, cache, calls = _client(tmp)
+        assert client.generate_bullets("matrículas", count=2) == ["Ponto 1", "Ponto 2"]
+        assert client.generate_bullets("matrículas", count=2) == ["Ponto 1", "Ponto 2"]
+        assert len(calls) == 1, "❌ Segunda chamada não deveria ir à API"
+        assert cache.stats()["hit_rate"] == 0.5
+    print("  ✅ Uma chamada à API, hit_rate 50%")
+
+
+def test_creative_bypass():
+    print("\n🔍 Testando bypass das chamadas criativas...")
+    with tempfile.TemporaryDirectory() as tmp:
+        client, cache, calls = _client(tmp)
+        client.write_carousel_caption("matrículas")
+        client.write_carousel_caption("matrículas")
+        assert len(calls) == 2, "❌ Chamada criativa não pode vir do cache"
+        assert cache.stats()["bypassed"] == 2
+    print("  ✅ Legendas sempre vão à API")
+
+
+def test_size_cap():
+    print("\n🔍 Testando limite de tamanho (LRU)...")
+    with tempfile.TemporaryDirectory() as tmp:
+        client, cache, calls = _client(tmp, max_bytes=30)
+        client.generate_bullets("tema A", count=2)
+        client.generate_bullets("tema B", count=2)  # estoura o orçamento → sai o tema A
+        client.generate_bullets("tema A", count=2)
+        assert len(calls) == 3, "❌ Entrada antiga deveria ter sido removida"
+    print("  ✅ Entradas antigas removidas ao passar do orçamento")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - CACHE DE RESPOSTAS GEMINI")
+    print("=" * 60)
+
+    try:
+        test_deterministic_hit()
+        test_creative_bypass()
+        test_size_cap()
+        print("\n✅ Cache do Gemini OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
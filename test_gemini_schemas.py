@@ -0,0 +1,85 @@
+# test_gemini_schemas.py
+"""Teste da saída estruturada do Gemini (schema + reparo só dos campos inválidos), sem chamar a API"""
+
+import json
+import sys
+
+
+def _client(responses):
+    from src.generators.gemini_client import GeminiClient, GeminiConfig
+
+    client = GeminiClient(GeminiConfig(api_key="teste"), use_cache=False)
+    calls = []
+
+    def fake_call(prompt, temperature, schema=None):
+        calls.append((prompt, schema))
+        return json.dumps(responses[len(calls) - 1], ensure_ascii=False)
+
+    client._call_model = fake_call
+    return client, calls
+
+
+def test_schema_sent():
+    print("🔍 Testando envio do response_schema...")
+    client, calls = _client([{"headline": "Matrículas abertas", "subheadline": "Garanta sua vaga", "extra": 1}])
+    visual = client.generate_visual_copy("matrículas")
+    schema = calls[0][1]
+    assert schema["type"] == "OBJECT" and {"headline", "subheadline"} <= set(schema["required"])
+    assert visual["headline"] == "Matrículas abertas" and visual["pexels_query"] == ""
+    print(f"  ✅ Schema com {len(schema['properties'])} campos")
+
+
+def test_repair_only_invalid():
+    print("\n🔍 Testando reparo só dos campos inválidos...")
+    client, calls = _client([
+        {"caption": "Legenda completa", "hashtags": [], "title": "Título"},
+        {"hashtags": ["#educacao", " "]},
+    ])
+    caption = client.write_post_caption("matrículas")
+    assert len(calls) == 2, "❌ Deveria reperguntar uma única vez"
+    assert list(calls[1][1]["properties"]) == ["hashtags"], "❌ Reparo deveria pedir só hashtags"
+    assert "## CORREÇÃO" in calls[1][0]
+    assert caption["caption"] == "Legenda completa" and caption["hashtags"] == ["#educacao"]
+    print("  ✅ Campo vazio corrigido sem refazer a legenda")
+
+
+def test_repair_gives_up():
+    print("\n🔍 Testando falha após reparo...")
+    client, calls = _client([{"hook": "Gancho"}, {"beats": "não é lista"}])
+    try:
+        client.write_video_script("matrículas")
+    except RuntimeError as e:
+        assert "beats" in str(e) and "cta" in str(e)
+    else:
+        raise AssertionError("❌ Roteiro inválido deveria levantar erro")
+    print("  ✅ RuntimeError com os campos que continuaram inválidos")
+
+
+def test_bundle_prompt_escapes_newlines():
+    print("\n🔍 Testando escape de \\n no prompt do post bundle...")
+    bundle = {
+        "topic": "Tópico", "hook": "Gancho", "headline": "LEAD\nÀS 23H?", "subheadline": "Sub",
+        "pexels_query": "office", "caption": "Legenda", "hashtags": ["educacao"],
+    }
+    client, calls = _client([bundle])
+    client.generate_post_bundle("matrículas")
+    prompt = calls[0][0]
+    assert '"headline": "TEXTO\\nEM\\nLINHAS"' in prompt, "❌ Exemplo de headline deveria usar o escape \\n"
+    assert "use \\n para quebrar" in prompt
+    print("  ✅ Modelo recebe o escape \\n (não quebras de linha reais)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - SAÍDA ESTRUTURADA GEMINI")
+    print("=" * 60)
+
+    try:
+        test_schema_sent()
+        test_repair_only_invalid()
+        test_repair_gives_up()
+        test_bundle_prompt_escapes_newlines()
+        print("\n✅ Saída estruturada OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
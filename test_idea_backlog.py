@@ -0,0 +1,115 @@
+# test_idea_backlog.py
+"""Teste do backlog de ideias (refill em lote, dedupe, FIFO), sem chamar a API"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+
+class FakeLLM:
+    def __init__(self, topics):
+        self.topics = topics
+        self.calls = []
+
+    def generate_topic_ideas(self, niche, count=6, avoid=None):
+        self.calls.append((niche, count, avoid))
+        return [{"topic": t, "hook": f"Gancho {i}"} for i, t in enumerate(self.topics[:count])]
+
+
+def test_refill_dedupe_fifo():
+    print("🔍 Testando refill em lote, dedupe e ordem FIFO...")
+    from database.init_db import SCHEMA
+    from src.generators.idea_backlog import IdeaBacklog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "content.db"
+        with sqlite3.connect(db) as conn:
+            conn.executescript(SCHEMA)
+            conn.execute(
+                "INSERT INTO content_history (content_type, platform, topic, content_hash) VALUES ('post', 'instagram', ?, 'h1')",
+                ("IA na Matrícula",),
+            )
+
+        llm = FakeLLM(["Lead às 23h", "IA na matrícula!", "Mito: IA substitui pessoas", "lead as 23h", "Follow-up"])
+        backlog = IdeaBacklog(db_path=db, llm=llm, refill_size=5)
+
+        assert backlog.refill("nicho") == 3, "❌ Deveria descartar o tópico já publicado e a repetição"
+        assert llm.calls == [("nicho", 5, [])]
+
+        # Tópico enfileirado que vira post por outro caminho é pulado na saída
+        with sqlite3.connect(db) as conn:
+            conn.execute(
+                "INSERT INTO content_history (content_type, platform, topic, content_hash) VALUES ('post', 'instagram', ?, 'h2')",
+                ("Mito: IA substitui pessoas?",),
+            )
+
+        assert backlog.take("nicho")["topic"] == "Lead às 23h"
+        assert backlog.take("nicho")["topic"] == "Follow-up"
+        assert backlog.stats() == {"pending": 0, "used": 2, "skipped": 1}
+        assert len(llm.calls) == 1, "❌ Consumo com fila cheia não deveria chamar o LLM"
+    print("  ✅ 3 ideias inéditas, consumidas em ordem, uma pulada")
+
+
+def test_refill_low():
+    print("\n🔍 Testando reabastecimento só de nichos com fila baixa...")
+    from src.generators.idea_backlog import IdeaBacklog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        llm = FakeLLM([f"Tópico {i}" for i in range(4)])
+        backlog = IdeaBacklog(db_path=Path(tmp) / "content.db", llm=llm, refill_size=4, min_pending=2)
+        backlog.add("cheio", [{"topic": "A"}, {"topic": "B"}])
+
+        assert backlog.refill_low(["cheio", "vazio"]) == {"vazio": 4}
+        assert llm.calls[0][2] == [], "❌ Nicho novo não tem tópicos a evitar"
+    print("  ✅ Só o nicho vazio foi ao LLM")
+
+
+def test_failed_post_releases_idea():
+    print("\n🔍 Testando ideia devolvida à fila quando o post falha...")
+    import asyncio
+    from unittest import mock
+
+    import main_html
+    from src.generators.idea_backlog import IdeaBacklog
+
+    async def failing_copy(llm, niche, idea):
+        raise RuntimeError("Gemini fora do ar")
+
+    pexels = mock.Mock()
+    pexels.return_value.get_background_for_query_async = mock.AsyncMock(return_value=None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backlog = IdeaBacklog(db_path=Path(tmp) / "content.db", llm=FakeLLM([]))
+        backlog.add("nicho", [{"topic": "Lead às 23h"}, {"topic": "Follow-up"}])
+
+        with mock.patch.object(main_html, "generate_copy", failing_copy), mock.patch.object(
+            main_html.settings, "NEAR_DUP_ENABLED", False
+        ), mock.patch.object(main_html, "GeminiClient"), mock.patch.object(
+            main_html, "ContentRepository"
+        ), mock.patch.object(main_html, "PexelsClient", pexels):
+            try:
+                asyncio.run(main_html.generate_post("nicho", renderer=mock.Mock(device_scale_factor=1), backlog=backlog))
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("❌ Falha do Gemini deveria propagar")
+
+        assert backlog.stats() == {"pending": 2, "used": 0, "skipped": 0}, f"❌ {backlog.stats()}"
+        assert backlog.take("nicho")["topic"] == "Lead às 23h", "❌ Ideia devolvida deveria manter a vez na fila"
+    print("  ✅ Ideia voltou para pending e sai de novo na próxima vez")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - BACKLOG DE IDEIAS")
+    print("=" * 60)
+
+    try:
+        test_refill_dedupe_fifo()
+        test_refill_low()
+        test_failed_post_releases_idea()
+        print("\n✅ Backlog OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
@@ -0,0 +1,81 @@
+# test_pexels_cache.py
+"""Teste do cache de buscas do Pexels (sem chamar a API)"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _cache(tmp: str, ttl: float, stale: float):
+    from src.generators.pexels_cache import PexelsSearchCache
+    return PexelsSearchCache(db_path=Path(tmp) / "cache.db", ttl_seconds=ttl, stale_seconds=stale)
+
+
+def test_fresh_hit():
+    print("🔍 Testando hit dentro do TTL...")
+    from src.generators.pexels_cache import PexelsSearchCache
+
+    calls = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, ttl=60, stale=60)
+        key = PexelsSearchCache.make_key("Office Woman", "portrait", 20, 1)
+
+        def fetch():
+            calls.append(1)
+            return [{"id": 1}]
+
+        assert cache.get_or_fetch(key, fetch) == [{"id": 1}]
+        assert cache.get_or_fetch(key, fetch) == [{"id": 1}]
+        assert len(calls) == 1, "❌ Segunda busca não deveria chamar a API"
+    print("  ✅ Zero chamadas à API no segundo acesso")
+
+
+def test_stale_while_revalidate():
+    print("\n🔍 Testando stale-while-revalidate...")
+    from src.generators.pexels_cache import PexelsSearchCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, ttl=0, stale=60)
+        key = PexelsSearchCache.make_key("team", "portrait", 20, 1)
+        cache.put(key, [{"id": "velho"}])
+
+        served = cache.get_or_fetch(key, lambda: [{"id": "novo"}])
+        assert served == [{"id": "velho"}], "❌ Deveria servir a cópia vencida na hora"
+
+        deadline = time.time() + 5
+        while time.time() < deadline and cache.get(key)[0] != [{"id": "novo"}]:
+            time.sleep(0.05)
+        assert cache.get(key)[0] == [{"id": "novo"}], "❌ Revalidação em background não gravou"
+    print("  ✅ Cópia vencida servida e revalidada em background")
+
+
+def test_expired_fallback_on_error():
+    print("\n🔍 Testando fallback para cópia velha quando a API falha...")
+    from src.generators.pexels_cache import PexelsSearchCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, ttl=0, stale=0)
+        key = PexelsSearchCache.make_key("campus", "portrait", 20, 1)
+        cache.put(key, [{"id": 7}])
+
+        def broken():
+            raise RuntimeError("Pexels fora do ar")
+
+        assert cache.get_or_fetch(key, broken) == [{"id": 7}], "❌ Deveria usar a cópia velha"
+    print("  ✅ Cópia velha usada quando a API falha")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - CACHE DE BUSCAS PEXELS")
+    print("=" * 60)
+
+    try:
+        test_fresh_hit()
+        test_stale_while_revalidate()
+        test_expired_fallback_on_error()
+        print("\n✅ Cache de buscas OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
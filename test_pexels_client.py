@@ -0,0 +1,197 @@
+# test_pexels_client.py
+"""Teste do PexelsClient com busca e download falsos (sem chamar a API)"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+
+def _scene(seed: int, size: tuple[int, int]) -> Image.Image:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (600, 800))
+    draw = ImageDraw.Draw(img)
+    for _ in range(30):
+        x, y = rng.randint(0, 550), rng.randint(0, 750)
+        color = tuple(rng.randint(0, 255) for _ in range(3))
+        draw.ellipse([x, y, x + rng.randint(25, 250), y + rng.randint(25, 250)], fill=color)
+    return img.resize(size)
+
+
+def _photo(photo_id: int, width: int, height: int):
+    from src.generators.pexels_client import PexelsPhoto
+
+    src = {"original": f"https://images.pexels.com/{photo_id}.jpeg?{width}x{height}"}
+    return PexelsPhoto(id=photo_id, width=width, height=height, photographer="Teste", url="", src=src)
+
+
+def _client(tmp: str, photos, scenes=None):
+    from src.generators.background_index import BackgroundIndex
+    from src.generators.pexels_client import PexelsClient
+    from src.generators.pexels_ratelimit import PexelsRateLimiter
+
+    root = Path(tmp)
+    client = PexelsClient(
+        api_key="teste",
+        download_dir=root / "backgrounds",
+        use_search_cache=False,
+        rate_limiter=PexelsRateLimiter(rate_per_hour=36000, burst=100),
+        background_index=BackgroundIndex(root / "backgrounds"),
+    )
+    client.download_dir.mkdir(parents=True, exist_ok=True)
+    client.warm_dir = root / "warm"
+    downloads = []
+
+    def fake_search(query, per_page=15, orientation="portrait", page=1):
+        return list(photos)
+
+    def fake_download(url, dest):
+        downloads.append(url)
+        # URL falsa: ...?{w}x{h}[&...&w={largura pedida ao CDN}]
+        size, _, params = url.split("?", 1)[1].partition("&")
+        w, h = (int(v) for v in size.split("x"))
+        if "w=" in params:
+            new_w = int(params.rsplit("w=", 1)[1])
+            w, h = new_w, round(h * new_w / w)
+        photo_id = int(url.split("/")[-1].split(".")[0])
+        Path(dest).parent.mkdir(parents=True, exist_ok=True)
+        _scene((scenes or {}).get(photo_id, photo_id), (w, h)).save(dest)
+
+    client.search_photos = fake_search
+    client._download_file = fake_download
+    return client, downloads
+
+
+def test_small_original_is_cached():
+    print("🔍 Testando cache de foto menor que o alvo...")
+    with tempfile.TemporaryDirectory() as tmp:
+        client, downloads = _client(tmp, [_photo(1, 1200, 1600)])
+        paths = {client.get_background_for_query("office", target_size=(2160, 2160)) for _ in range(3)}
+        assert len(downloads) == 1, f"❌ Baixou {len(downloads)} vezes a mesma foto"
+        assert len(paths) == 1
+    print("  ✅ 3 chamadas → 1 download (original 1200x1600 conta como completo)")
+
+
+def test_warm_pool_only_counts_usable():
+    print("\n🔍 Testando pool quente com foto menor que o alvo...")
+    from src.generators.background_warmer import BackgroundWarmer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, downloads = _client(tmp, [_photo(1, 1200, 1600), _photo(2, 3000, 4000)])
+        pool = client.warm_pool_dir("office")
+        pool.mkdir(parents=True)
+        Image.new("RGB", (1200, 1600)).save(pool / "pexels_9.jpg")  # sobra de um refill antigo
+
+        warmer = BackgroundWarmer(client=client, per_query=1, workers=2, target_size=(2160, 2160))
+        assert warmer.missing("office") == 1, "❌ Foto pequena não pode contar como pool cheio"
+        assert warmer.refill_all(["office"]) == {"office": 1}
+        assert len(downloads) == 1 and "/2.jpeg" in downloads[0], f"❌ Só a foto grande deveria ser baixada: {downloads}"
+
+        taken = client.take_warm_background("office", (2160, 2160))
+        assert taken is not None and taken.name == "pexels_2.jpg", f"❌ Pool travado: {taken}"
+        assert not (pool / "pexels_9.jpg").exists()
+    print("  ✅ Foto pequena removida, grande baixada e retirada")
+
+
+def test_warm_target_follows_scale_factor():
+    print("\n🔍 Testando alvo do pool quente com RENDER_DEVICE_SCALE_FACTOR...")
+    import os
+    import subprocess
+
+    for scale, expected in (("1", "(1080, 1350)"), ("2", "(2160, 2160)"), ("3", "(3240, 3240)")):
+        out = subprocess.run(
+            [sys.executable, "-c", "from config import settings; print(settings.PEXELS_WARM_TARGET)"],
+            env={**os.environ, "RENDER_DEVICE_SCALE_FACTOR": scale},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        assert out == expected, f"❌ scale={scale}: {out} (esperado {expected})"
+    print("  ✅ Alvo cobre 1080 x scale e o POST_SIZE")
+
+
+def test_download_many_async():
+    print("\n🔍 Testando downloads paralelos (ordem, limite, falhas)...")
+    with tempfile.TemporaryDirectory() as tmp:
+        client, _ = _client(tmp, [])
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def slow_download(url, dest):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                # Os primeiros terminam por último: a ordem do resultado não pode depender disso
+                time.sleep(0.02 * (10 - int(url.rsplit("/", 1)[1])))
+                if url.endswith("/3"):
+                    raise RuntimeError("HTTP 500")
+                Path(dest).write_bytes(b"x")
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        client._download_file = slow_download
+        items = [(f"https://cdn/{i}", Path(tmp) / f"f{i}.jpg") for i in range(8)]
+        results = asyncio.run(client.download_many_async(items, concurrency=3))
+
+        assert results[3] is None, "❌ Falha deveria virar None"
+        assert [r for i, r in enumerate(results) if i != 3] == [d for i, (_, d) in enumerate(items) if i != 3]
+        assert peak[0] <= 3, f"❌ {peak[0]} downloads simultâneos (limite 3)"
+    print(f"  ✅ Ordem preservada, pico de {peak[0]} simultâneos, falha → None")
+
+
+def test_duplicate_download_is_remembered():
+    print("\n🔍 Testando foto quase igual a um arquivo em cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        client, downloads = _client(tmp, [_photo(7, 1600, 2000)], scenes={7: 50})
+        existing = client.download_dir / "pexels_50.jpg"
+        _scene(50, (1600, 2000)).save(existing)
+        client.background_index.record(existing, query="outra query")
+
+        paths = [client.get_background_for_query("office", target_size=(1080, 1350)) for _ in range(4)]
+        assert paths == [existing] * 4, f"❌ Deveria usar o arquivo existente: {paths}"
+        assert len(downloads) == 1, f"❌ Baixou {len(downloads)} vezes a foto duplicada"
+        assert not (client.download_dir / "pexels_7.jpg").exists()
+    print("  ✅ 4 chamadas → 1 download (alias id=7 → pexels_50.jpg)")
+
+
+def test_recent_duplicate_is_skipped():
+    print("\n🔍 Testando candidata quase igual a uma foto usada há pouco...")
+    with tempfile.TemporaryDirectory() as tmp:
+        client, downloads = _client(tmp, [_photo(7, 1600, 2000), _photo(8, 1600, 2000)], scenes={7: 50, 8: 90})
+        recent = client.download_dir / "pexels_50.jpg"
+        _scene(50, (1600, 2000)).save(recent)
+        client.background_index.record(recent, query="outra query", used=True)
+
+        first = client.get_background_for_query("office", target_size=(1080, 1350))
+        assert first == client.download_dir / "pexels_8.jpg", f"❌ Deveria pular a cena repetida: {first}"
+        assert len(downloads) == 2 and not (client.download_dir / "pexels_7.jpg").exists()
+
+        # id=7 já é alias de uma foto recente: pulado sem novo download
+        client.get_background_for_query("office", target_size=(1080, 1350))
+        assert len(downloads) == 2, f"❌ Baixou de novo a foto duplicada: {downloads}"
+    print("  ✅ Cena usada há pouco pulada → próxima candidata (alias evita novo download)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - PEXELS CLIENT")
+    print("=" * 60)
+
+    try:
+        test_small_original_is_cached()
+        test_warm_pool_only_counts_usable()
+        test_warm_target_follows_scale_factor()
+        test_download_many_async()
+        test_duplicate_download_is_remembered()
+        test_recent_duplicate_is_skipped()
+        print("\n✅ PexelsClient OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
@@ -0,0 +1,83 @@
+# test_pexels_ratelimit.py
+"""Teste do limitador de requisições do Pexels (sem chamar a API)"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def test_burst_then_pacing():
+    print("🔍 Testando rajada + ritmo do token bucket...")
+    from src.generators.pexels_ratelimit import PexelsRateLimiter
+
+    # 36000/h = 10 por segundo, rajada de 3
+    limiter = PexelsRateLimiter(rate_per_hour=36000, burst=3, max_wait=5)
+    waits = [limiter.acquire() for _ in range(5)]
+    assert waits[:3] == [0, 0, 0], "❌ Rajada deveria passar sem espera"
+    assert all(w > 0 for w in waits[3:]), "❌ Depois da rajada deveria esperar"
+    assert limiter.stats()["waits"] == 2
+    print(f"  ✅ Esperas: {[round(w, 2) for w in waits]}")
+
+
+def test_headers_and_exhausted_quota():
+    print("\n🔍 Testando leitura de X-Ratelimit-* e cota zerada...")
+    from src.generators.pexels_ratelimit import PexelsRateLimiter, RateLimitExceeded
+
+    limiter = PexelsRateLimiter(rate_per_hour=36000, burst=5, max_wait=1)
+    reset = int(time.time()) + 3600
+    limiter.update({"X-Ratelimit-Limit": "20000", "X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": str(reset)})
+
+    stats = limiter.stats()
+    assert stats["limit"] == 20000 and stats["remaining"] == 0, "❌ Headers não foram lidos"
+    try:
+        limiter.acquire()
+        raise AssertionError("❌ Cota zerada deveria bloquear até o reset")
+    except RateLimitExceeded:
+        pass
+    print("  ✅ Cota zerada bloqueia (sem esperar 1h)")
+
+
+def test_429_blocks_everyone():
+    print("\n🔍 Testando pausa após 429...")
+    from src.generators.pexels_ratelimit import PexelsRateLimiter
+
+    limiter = PexelsRateLimiter(rate_per_hour=36000, burst=5, max_wait=5)
+    limiter.penalize("0.3")
+    wait = limiter.acquire()
+    assert 0.2 < wait < 0.6, f"❌ Deveria respeitar Retry-After (esperou {wait:.2f}s)"
+    print(f"  ✅ Retry-After respeitado ({wait:.2f}s)")
+
+
+def test_shared_state_file():
+    print("\n🔍 Testando estado compartilhado entre instâncias (arquivo)...")
+    from src.generators.pexels_ratelimit import PexelsRateLimiter, fcntl
+
+    if fcntl is None:
+        print("  ⏭️ fcntl indisponível, pulando")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = Path(tmp) / "ratelimit.json"
+        a = PexelsRateLimiter(rate_per_hour=36000, burst=2, state_file=state, max_wait=5)
+        b = PexelsRateLimiter(rate_per_hour=36000, burst=2, state_file=state, max_wait=5)
+        assert a.acquire() == 0
+        assert b.acquire() == 0
+        assert a.acquire() > 0, "❌ A rajada deveria ser dividida entre as instâncias"
+    print("  ✅ Rajada dividida entre instâncias")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - LIMITE DE REQUISIÇÕES PEXELS")
+    print("=" * 60)
+
+    try:
+        test_burst_then_pacing()
+        test_headers_and_exhausted_quota()
+        test_429_blocks_everyone()
+        test_shared_state_file()
+        print("\n✅ Limitador OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
@@ -0,0 +1,98 @@
+# test_render_cache.py
+"""Teste do cache de renders do HtmlRenderer (chave, hit, LRU), sem abrir o Chromium"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+def _renderer(tmp: str, max_bytes: int = 10 * 1024 * 1024):
+    from src.processors.html_renderer import HtmlRenderer
+
+    root = Path(tmp)
+    (root / "templates").mkdir(exist_ok=True)
+    (root / "templates" / "post.html").write_text("<h1>{{ headline }}</h1>", encoding="utf-8")
+    return HtmlRenderer(
+        templates_dir=root / "templates",
+        device_scale_factor=2,
+        cache_dir=root / "cache",
+        cache_max_bytes=max_bytes,
+        use_cache=True,
+    )
+
+
+def test_cache_key():
+    print("🔍 Testando chave do cache (template, viewport, qualidade)...")
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = _renderer(tmp)
+        html = "<h1>LEADS</h1>"
+        key = renderer._cache_key("post.html", html, 1080, 1080, 95)
+
+        assert key == renderer._cache_key("post.html", html, 1080, 1080, 95), "❌ Chave deveria ser estável"
+        assert key != renderer._cache_key("post.html", "<h1>VENDAS</h1>", 1080, 1080, 95)
+        assert key != renderer._cache_key("post.html", html, 1080, 1350, 95), "❌ Viewport não entrou na chave"
+        assert key != renderer._cache_key("post.html", html, 1080, 1080, 90), "❌ Qualidade não entrou na chave"
+
+        # CSS mudou no template, mas o HTML renderizado de teste é o mesmo
+        (Path(tmp) / "templates" / "post.html").write_text("<h1 class='x'>{{ headline }}</h1>", encoding="utf-8")
+        assert key != renderer._cache_key("post.html", html, 1080, 1080, 95), "❌ Fonte do template não entrou na chave"
+    print("  ✅ Chave muda com template, HTML, viewport e qualidade")
+
+
+def test_hit_copies_and_touches():
+    print("\n🔍 Testando hit do cache (cópia + mtime)...")
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = _renderer(tmp)
+        out = Path(tmp) / "render.jpg"
+        out.write_bytes(b"jpeg" * 10)
+        renderer._store_in_cache("abc", out)
+
+        cached = renderer.cache_dir / "abc.jpg"
+        os.utime(cached, (1_000, 1_000))
+
+        restored = Path(tmp) / "post_novo.jpg"
+        assert renderer._restore_from_cache("abc", restored), "❌ Deveria ser hit"
+        assert restored.read_bytes() == out.read_bytes(), "❌ Cópia diferente do render original"
+        assert cached.stat().st_mtime > 1_000, "❌ Hit deveria atualizar o mtime (LRU)"
+
+        assert not renderer._restore_from_cache("outra", Path(tmp) / "x.jpg"), "❌ Chave desconhecida deveria ser miss"
+        assert (renderer.cache_hits, renderer.cache_misses) == (1, 1)
+    print("  ✅ Hit copia o arquivo e atualiza o mtime")
+
+
+def test_eviction_lru():
+    print("\n🔍 Testando limite de bytes (LRU)...")
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = _renderer(tmp, max_bytes=250)
+        out = Path(tmp) / "render.jpg"
+        out.write_bytes(b"x" * 100)
+
+        renderer._store_in_cache("a", out)
+        renderer._store_in_cache("b", out)
+        os.utime(renderer.cache_dir / "a.jpg", (1_000, 1_000))
+        os.utime(renderer.cache_dir / "b.jpg", (2_000, 2_000))
+
+        # "a" é o mais antigo, mas um hit o torna o mais recente
+        assert renderer._restore_from_cache("a", Path(tmp) / "hit.jpg")
+        renderer._store_in_cache("c", out)
+
+        left = sorted(p.stem for p in renderer.cache_dir.glob("*.jpg"))
+        assert left == ["a", "c"], f"❌ Deveria descartar só o menos usado (b): {left}"
+        assert sum(p.stat().st_size for p in renderer.cache_dir.glob("*.jpg")) <= 250
+    print("  ✅ 300 bytes > limite de 250 → removido o menos usado")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - CACHE DE RENDER")
+    print("=" * 60)
+
+    try:
+        test_cache_key()
+        test_hit_copies_and_touches()
+        test_eviction_lru()
+        print("\n✅ Cache de render OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)
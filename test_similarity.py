@@ -0,0 +1,138 @@
+# test_similarity.py
+"""Teste do índice de quase-duplicatas (MinHash + LSH) sobre o content_history"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+CAPTION = (
+    "Sua secretaria perde leads depois das 18h? 70% dos interessados desistem se não recebem "
+    "resposta em 1 hora. Com um agente de IA, cada lead é atendido em segundos, 24/7. Link na bio."
+)
+
+
+def _db(tmp: str) -> Path:
+    from database.init_db import SCHEMA
+
+    db = Path(tmp) / "content.db"
+    with sqlite3.connect(db) as conn:
+        conn.executescript(SCHEMA)
+        conn.execute(
+            """
+            INSERT INTO content_history (content_type, platform, topic, caption, content_hash)
+            VALUES ('post', 'instagram', ?, ?, 'h1')
+            """,
+            ("Lead às 23h? Responda em 2 minutos", f"{CAPTION}\n\n#educacao #matriculas"),
+        )
+    return db
+
+
+def test_near_duplicate_topic():
+    print("🔍 Testando tópico quase duplicado...")
+    from database.similarity import SimilarityIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SimilarityIndex(db_path=_db(tmp))
+        match = index.find_similar("Lead às 23h: responda em até 2 minutos!")
+        assert match and match.content_id == 1, "❌ Reformulação do mesmo tópico não detectada"
+        assert index.find_similar("Como a IA reduz o tempo de resposta da secretaria") is None, "❌ Falso positivo"
+        assert index.sync() == 0, "❌ Post já indexado não deveria entrar de novo"
+    print(f"  ✅ Similaridade {match.similarity:.2f} com o post id={match.content_id}")
+
+
+def test_near_duplicate_caption():
+    print("\n🔍 Testando legenda quase duplicada...")
+    from database.similarity import SimilarityIndex
+    from src.exceptions import ContentDuplicateError
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SimilarityIndex(db_path=_db(tmp))
+        reworded = CAPTION.replace("cada lead", "todo lead").replace("Link na bio.", "Salva pra mostrar pro time.")
+        try:
+            index.ensure_unique(topic="Atendimento fora do horário comercial", caption=reworded)
+        except ContentDuplicateError as e:
+            assert "caption" in str(e)
+        else:
+            raise AssertionError("❌ Legenda quase igual deveria ser rejeitada")
+
+        other = "Quantos leads chegam depois do expediente? Um agente de IA qualifica e agenda a visita. Comenta QUERO."
+        index.ensure_unique(topic="Atendimento fora do horário comercial", caption=other)
+    print("  ✅ Legenda reescrita rejeitada, legenda diferente aceita")
+
+
+def test_rejected_idea_is_skipped():
+    print("\n🔍 Testando ideia do backlog rejeitada por similaridade...")
+    import asyncio
+
+    import main_html
+    from database.similarity import SimilarityIndex
+    from src.generators.idea_backlog import IdeaBacklog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _db(tmp)
+        backlog = IdeaBacklog(db_path=db, llm=object())
+        backlog.add("nicho", [{"topic": "Lead às 23h: responda em até 2 minutos"}, {"topic": "Mito vs realidade da IA"}])
+
+        idea = asyncio.run(main_html.next_unique_idea(backlog, SimilarityIndex(db_path=db), "nicho"))
+        assert idea["topic"] == "Mito vs realidade da IA"
+        assert backlog.stats() == {"pending": 0, "used": 1, "skipped": 1}, f"❌ {backlog.stats()}"
+    print("  ✅ Ideia quase duplicada contada como skipped, não como used")
+
+
+def test_rejected_caption_skips_idea():
+    print("\n🔍 Testando legenda rejeitada por similaridade...")
+    import asyncio
+    from unittest import mock
+
+    import main_html
+    from database.similarity import SimilarityIndex
+    from src.exceptions import ContentDuplicateError
+    from src.generators.idea_backlog import IdeaBacklog
+
+    async def fake_copy(llm, niche, idea):
+        return idea, {"headline": "LEADS"}, {"caption": f"{CAPTION} Vagas abertas."}
+
+    pexels = mock.Mock()
+    pexels.return_value.get_background_for_query_async = mock.AsyncMock(return_value=None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _db(tmp)
+        backlog = IdeaBacklog(db_path=db, llm=object())
+        backlog.add("nicho", [{"topic": "Mito vs realidade da IA"}])
+
+        with mock.patch.object(main_html, "generate_copy", fake_copy), mock.patch.object(
+            main_html, "GeminiClient"
+        ), mock.patch.object(main_html, "ContentRepository"), mock.patch.object(main_html, "PexelsClient", pexels):
+            try:
+                asyncio.run(
+                    main_html.generate_post(
+                        "nicho",
+                        renderer=mock.Mock(device_scale_factor=1),
+                        backlog=backlog,
+                        similarity=SimilarityIndex(db_path=db),
+                    )
+                )
+            except ContentDuplicateError:
+                pass
+            else:
+                raise AssertionError("❌ Legenda quase igual deveria ser rejeitada")
+
+        assert backlog.stats() == {"pending": 0, "used": 0, "skipped": 1}, f"❌ {backlog.stats()}"
+    print("  ✅ Ideia com legenda quase duplicada contada como skipped")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🧪 TESTE - QUASE-DUPLICATAS")
+    print("=" * 60)
+
+    try:
+        test_near_duplicate_topic()
+        test_near_duplicate_caption()
+        test_rejected_idea_is_skipped()
+        test_rejected_caption_skips_idea()
+        print("\n✅ Índice de similaridade OK")
+    except AssertionError as e:
+        print(f"\n❌ ERRO: {e}")
+        sys.exit(1)